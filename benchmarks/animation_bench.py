@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+RGB animation benchmark: per-frame rendering (old fixed 50 ms tick) vs.
+precompiled FrameTable with change-driven scheduling.
+
+Writes go to /dev/null through a cached fd, so the numbers cover the Python
+side only (no WMI). For each mode it reports:
+  - unpaced throughput in frames/sec for both paths
+  - paced run: CPU%, wakeups/sec and writes/sec over --seconds
+
+    python3 benchmarks/animation_bench.py [--seconds 3] [--speed 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "daemon"))
+from rgb_frames import FrameTable, render
+
+OLD_FRAME_TIME = 0.05
+COLORS = ["FF0000", "FF7F00", "FFFF00", "00FF00", "0000FF", "4B0082", "9400D3", "FFFFFF"]
+
+
+class NullSink:
+    def __init__(self):
+        self.fd = os.open(os.devnull, os.O_WRONLY)
+        self.last = None
+        self.writes = 0
+
+    def write(self, hexes, payload=None):
+        if hexes == self.last:
+            return
+        os.pwrite(self.fd, payload or " ".join(hexes).encode(), 0)
+        self.last = list(hexes)
+        self.writes += 1
+
+
+def throughput_old(mode, params, n):
+    sink = NullSink()
+    t = time.time()
+    t0 = time.perf_counter()
+    for k in range(n):
+        sink.write(render(mode, t + k * OLD_FRAME_TIME, params))
+    return n / (time.perf_counter() - t0)
+
+
+def throughput_new(mode, params, n):
+    sink = NullSink()
+    table = FrameTable.compile(mode, params)
+    t = time.time()
+    t0 = time.perf_counter()
+    for k in range(n):
+        hexes, payload = table.frames[table.index(t + k * OLD_FRAME_TIME)]
+        sink.write(hexes, payload)
+    return n / (time.perf_counter() - t0)
+
+
+def paced_old(mode, params, seconds):
+    sink = NullSink()
+    wakeups = 0
+    c0, w0 = time.process_time(), time.monotonic()
+    while time.monotonic() - w0 < seconds:
+        start = time.time()
+        wakeups += 1
+        sink.write(render(mode, start, params))
+        time.sleep(max(OLD_FRAME_TIME - (time.time() - start), 0.001))
+    wall = time.monotonic() - w0
+    return (time.process_time() - c0) / wall * 100, wakeups / wall, sink.writes / wall
+
+
+def paced_new(mode, params, seconds):
+    sink = NullSink()
+    table = FrameTable.compile(mode, params)
+    wakeups = 0
+    c0, w0 = time.process_time(), time.monotonic()
+    while time.monotonic() - w0 < seconds:
+        wakeups += 1
+        t = time.time()
+        i = table.index(t)
+        hexes, payload = table.frames[i]
+        sink.write(hexes, payload)
+        nxt = table.next_time(t, i)
+        if nxt is None:
+            time.sleep(seconds)
+        else:
+            time.sleep(max(nxt - time.time(), 0))
+    wall = time.monotonic() - w0
+    return (time.process_time() - c0) / wall * 100, wakeups / wall, sink.writes / wall
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=3.0, help="paced run length per mode and path")
+    ap.add_argument("--speed", type=float, default=50.0)
+    ap.add_argument("--brightness", type=float, default=100.0)
+    ap.add_argument("--n", type=int, default=20000, help="frames for the unpaced run")
+    args = ap.parse_args()
+
+    params = (args.brightness / 100.0, args.speed, COLORS, "ltr")
+    print(f"speed={args.speed:g} brightness={args.brightness:g}%")
+    print(f"{'mode':<10} {'path':<6} {'frames/s':>10} {'CPU%':>6} {'wakeups/s':>10} {'writes/s':>9}")
+    for mode in ("breathing", "cycle", "wave"):
+        for name, tput, paced in (("old", throughput_old, paced_old), ("table", throughput_new, paced_new)):
+            fps = tput(mode, params, args.n)
+            cpu, wps, writes = paced(mode, params, args.seconds)
+            print(f"{mode:<10} {name:<6} {fps:>10.0f} {cpu:>6.2f} {wps:>10.1f} {writes:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
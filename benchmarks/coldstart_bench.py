@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Daemon cold-start benchmark, headless.
+
+Each run starts hp_manager_service in a fresh interpreter against a fake
+sysfs tree (HP_MANAGER_SYSFS_ROOT) and a private dbus-daemon standing in
+for the system bus, then times spawn -> first GetState reply. The daemon's
+own phase timings come from the startup tracer (HP_MANAGER_TRACE).
+Also reported: spawn -> every controller probed (GetCapabilities lists
+nothing under "initializing").
+
+Needs dbus-daemon, PyGObject and pydbus; no root, no HP hardware.
+
+    python3 benchmarks/coldstart_bench.py [--runs 20] [--without-rgb]
+"""
+import argparse
+import collections
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+DAEMON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "daemon")
+BUS_NAME = "com.yyl.hpmanager"
+OBJECT_PATH = "/com/yyl/hpmanager"
+
+# Runs the real startup()/serve() with state files redirected into the scratch dir
+CHILD = r"""
+import sys
+sys.path.insert(0, sys.argv[1])
+import hp_manager_service as d
+d.CONFIG_FILE = d.state_writer.path = sys.argv[2] + "/state.json"
+d.PROFILES_FILE = d.profiles.path = sys.argv[2] + "/profiles.json"
+d.TELEMETRY_LOG_DIR = sys.argv[2] + "/telemetry"
+d.serve(d.startup())
+"""
+
+
+def _write(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"{value}\n")
+
+
+def make_fake_sysfs(root, with_rgb=True):
+    """HP hwmon with two fans, a coretemp package sensor, DMI and (optionally) the RGB module."""
+    hp = os.path.join(root, "devices/platform/hp-wmi/hwmon/hwmon0")
+    for name, value in {"name": "hp", "fan1_input": 2300, "fan2_input": 2500,
+                        "fan1_max": 5800, "fan2_max": 6100, "fan1_target": 0,
+                        "fan2_target": 0, "pwm1_enable": 2}.items():
+        _write(os.path.join(hp, name), value)
+    core = os.path.join(root, "devices/platform/coretemp.0/hwmon/hwmon1")
+    _write(os.path.join(core, "name"), "coretemp")
+    _write(os.path.join(core, "temp1_input"), 52000)
+    _write(os.path.join(core, "temp1_label"), "Package id 0")
+
+    cls = os.path.join(root, "class/hwmon")
+    os.makedirs(cls, exist_ok=True)
+    for target in (hp, core):
+        os.symlink(os.path.relpath(target, cls), os.path.join(cls, os.path.basename(target)))
+
+    _write(os.path.join(root, "devices/virtual/dmi/id/product_name"), "OMEN by HP Laptop 16")
+    if with_rgb:
+        rgb = os.path.join(root, "devices/platform/hp-rgb-lighting")
+        for z in range(8):
+            _write(os.path.join(rgb, f"zone{z}"), "FF0000")
+        _write(os.path.join(rgb, "frame"), " ".join(["FF0000"] * 8))
+        _write(os.path.join(rgb, "brightness"), 1)
+        _write(os.path.join(rgb, "win_lock"), 0)
+
+
+def start_bus():
+    proc = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address"],
+                            stdout=subprocess.PIPE, text=True)
+    return proc, proc.stdout.readline().strip()
+
+
+def wait_for_reply(con, timeout):
+    """Poll GetState until the daemon answers; returns False on timeout."""
+    from gi.repository import GLib
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            con.call_sync(BUS_NAME, OBJECT_PATH, BUS_NAME, "GetState",
+                          None, None, 0, 1000, None)
+            return True
+        except GLib.Error:
+            time.sleep(0.002)
+    return False
+
+
+def wait_for_controllers(con, timeout):
+    """Poll GetCapabilities until no controller is still probing."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reply = con.call_sync(BUS_NAME, OBJECT_PATH, BUS_NAME, "GetCapabilities",
+                              None, None, 0, 1000, None)
+        if not json.loads(reply.unpack()[0]).get("initializing"):
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q / 100 * (len(xs) - 1))))]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for the first reply")
+    ap.add_argument("--without-rgb", action="store_true",
+                    help="leave out hp-rgb-lighting (exercises the lsmod probe)")
+    args = ap.parse_args()
+
+    if not shutil.which("dbus-daemon"):
+        sys.exit("dbus-daemon not found")
+    from gi.repository import Gio
+
+    scratch = tempfile.mkdtemp(prefix="hpm-coldstart-")
+    sysfs_root = os.path.join(scratch, "sys")
+    trace_file = os.path.join(scratch, "trace.jsonl")
+    make_fake_sysfs(sysfs_root, with_rgb=not args.without_rgb)
+
+    bus_proc, address = start_bus()
+    con = Gio.DBusConnection.new_for_address_sync(
+        address, Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+        | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION, None, None)
+    env = dict(os.environ, HP_MANAGER_SYSFS_ROOT=sysfs_root, HP_MANAGER_TRACE=trace_file,
+               DBUS_SYSTEM_BUS_ADDRESS=address)
+
+    wall_ms, ready_ms = [], []
+    try:
+        for run in range(args.runs):
+            state_dir = os.path.join(scratch, f"etc{run}")
+            os.makedirs(state_dir)
+            t0 = time.perf_counter()
+            child = subprocess.Popen([sys.executable, "-c", CHILD, DAEMON_DIR, state_dir],
+                                     env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            ok = wait_for_reply(con, args.timeout)
+            elapsed = (time.perf_counter() - t0) * 1e3
+            ok = ok and wait_for_controllers(con, args.timeout)
+            ready = (time.perf_counter() - t0) * 1e3
+            child.send_signal(signal.SIGTERM)
+            try:
+                child.wait(5)
+            except subprocess.TimeoutExpired:
+                child.kill()
+                child.wait()
+            if not ok:
+                sys.exit(f"run {run}: no reply within {args.timeout}s (exit code {child.returncode})")
+            wall_ms.append(elapsed)
+            ready_ms.append(ready)
+    finally:
+        bus_proc.terminate()
+        bus_proc.wait()
+
+    phases = collections.defaultdict(list)
+    with open(trace_file) as f:
+        for line in f:
+            for ev in json.loads(line)["events"]:
+                phases[ev["name"]].append(ev["ms"] if ev["ms"] is not None else ev["at"])
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"cold start, {len(wall_ms)} runs")
+    for label, xs in (("first GetState reply", wall_ms), ("controllers ready", ready_ms)):
+        print(f"  {label:<22} p50 {pct(xs, 50):8.1f} ms   p90 {pct(xs, 90):8.1f} ms   "
+              f"p99 {pct(xs, 99):8.1f} ms   max {max(xs):8.1f} ms")
+    print(f"\n{'daemon phase':<16} {'p50 ms':>9} {'p90 ms':>9}   (marks: ms since exec)")
+    for name, xs in phases.items():
+        print(f"{name:<16} {pct(xs, 50):9.1f} {pct(xs, 90):9.1f}")
+
+
+if __name__ == "__main__":
+    main()
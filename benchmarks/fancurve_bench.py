@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Fan curve lookup micro-benchmark: dense LUT vs. linear interpolation.
+
+    python3 benchmarks/fancurve_bench.py [--n 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "common"))
+from fancurve import FanCurveLUT, interpolate
+
+
+def make_curve(n):
+    temps = sorted(random.sample(range(30, 101), n))
+    pcts = sorted(random.randint(0, 100) for _ in range(n))
+    return list(zip(temps, pcts))
+
+
+def bench(fn, temps):
+    t0 = time.perf_counter()
+    for t in temps:
+        fn(t)
+    return (time.perf_counter() - t0) / len(temps) * 1e9
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200000, help="lookups per curve size")
+    args = ap.parse_args()
+
+    random.seed(1)
+    temps = [random.uniform(25.0, 105.0) for _ in range(args.n)]
+
+    print(f"{'points':>6} {'interp ns':>10} {'lut ns':>8} {'speedup':>8} {'build us':>9} {'max err':>8}")
+    for n in (4, 6, 8, 12, 16):
+        pts = make_curve(n)
+        t0 = time.perf_counter()
+        lut = FanCurveLUT(pts)
+        build = (time.perf_counter() - t0) * 1e6
+
+        interp_ns = bench(lambda t: interpolate(pts, t), temps)
+        lut_ns = bench(lut.lookup, temps)
+        # Quantisation error from rounding to the nearest 0.1 °C
+        err = max(abs(lut.lookup(t) - interpolate(pts, t)) for t in temps[:5000])
+        print(f"{n:>6} {interp_ns:>10.0f} {lut_ns:>8.0f} {interp_ns / lut_ns:>7.1f}x {build:>9.0f} {err:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
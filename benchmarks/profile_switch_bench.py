@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Lighting profile switch benchmark: activate-to-first-frame latency.
+
+Offline (default) compares, per mode, what the engine does on a switch:
+  compile   - settings change -> FrameTable.compile -> first frame payload
+  profile   - precompiled profile table -> first frame payload
+--live alternates ActivateProfile between two existing profiles on the
+running daemon and reads the engine-measured latency (activate_to_frame_ms
+in GetAnimationStats) plus the D-Bus round trip.
+
+    python3 benchmarks/profile_switch_bench.py [--n 50]
+    python3 benchmarks/profile_switch_bench.py --live PROFILE_A PROFILE_B
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "daemon"))
+from rgb_frames import FrameTable, lighting_params
+
+COLORS = ["FF0000", "FF7F00", "FFFF00", "00FF00", "0000FF", "4B0082", "9400D3", "FFFFFF"]
+
+
+def first_frame(table):
+    t = time.time()
+    return table.frames[table.index(t)][1]
+
+
+def offline(n):
+    print(f"{'mode':<10} {'speed':>5} {'compile ms (p50/max)':>22} {'profile us (p50/max)':>22}")
+    for mode in ("static", "breathing", "cycle", "wave"):
+        for speed in (5, 50, 100):
+            settings = {"mode": mode, "colors": COLORS, "speed": speed,
+                        "brightness": 80, "direction": "ltr", "power": True}
+            params = lighting_params(settings)
+            compile_ms, profile_us = [], []
+            for _ in range(n):
+                t0 = time.perf_counter()
+                first_frame(FrameTable.compile(mode, params))
+                compile_ms.append((time.perf_counter() - t0) * 1e3)
+            table = FrameTable.compile(mode, params)
+            for _ in range(n):
+                t0 = time.perf_counter()
+                first_frame(table)
+                profile_us.append((time.perf_counter() - t0) * 1e6)
+            print(f"{mode:<10} {speed:>5} "
+                  f"{statistics.median(compile_ms):>12.2f} / {max(compile_ms):<7.2f} "
+                  f"{statistics.median(profile_us):>12.1f} / {max(profile_us):<7.1f}")
+
+
+def live(names, n):
+    from pydbus import SystemBus
+    svc = SystemBus().get("com.yyl.hpmanager")
+    engine_ms, rtt_ms = [], []
+    for i in range(n):
+        t0 = time.perf_counter()
+        if svc.ActivateProfile(names[i % 2]) != "OK":
+            sys.exit(f"ActivateProfile('{names[i % 2]}') failed; save both profiles first")
+        rtt_ms.append((time.perf_counter() - t0) * 1e3)
+        time.sleep(0.2)  # let the engine write the frame
+        ms = json.loads(svc.GetAnimationStats()).get("activate_to_frame_ms")
+        if ms is not None:
+            engine_ms.append(ms)
+    print(f"ActivateProfile round trip ms: p50 {statistics.median(rtt_ms):.2f}  max {max(rtt_ms):.2f}")
+    if engine_ms:
+        print(f"activate -> first frame ms:    p50 {statistics.median(engine_ms):.2f}  max {max(engine_ms):.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50)
+    ap.add_argument("--live", nargs=2, metavar="PROFILE", help="two saved profile names")
+    args = ap.parse_args()
+    if args.live:
+        live(args.live, args.n)
+    else:
+        offline(args.n)
+
+
+if __name__ == "__main__":
+    main()
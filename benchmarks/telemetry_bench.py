@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Telemetry payload benchmark: JSON string vs. a{sv} full snapshot vs. a{sv} delta.
+
+Offline (default) uses a representative snapshot and reports the serialized
+message body size and the client-side decode CPU time per call.
+--live talks to the running daemon on the system bus and times real calls.
+
+    python3 benchmarks/telemetry_bench.py [--n 20000] [--live]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "common"))
+from telemetry_codec import TELEMETRY_VERSION, TelemetryMirror, flatten, to_variant
+
+try:
+    from gi.repository import GLib
+except ImportError:
+    sys.exit("PyGObject (gi) is required")
+
+REPLY_SIG = "(utda{sv}as)"
+
+SAMPLE = {
+    "interval": 2.0,
+    "sys": {"hostname": "omen", "kernel": "6.9.7-arch1-1", "os_name": "Linux",
+            "product_name": "OMEN by HP Laptop 16-xf0xxx", "cpu_temp": 61.0, "gpu_temp": 48.0},
+    "fan": {"available": True, "fan_count": 2, "mode": "auto",
+            "fans": {"1": {"current": 2900, "max": 5800, "target": 2900},
+                     "2": {"current": 3100, "max": 6100, "target": 3100}}},
+    "pp": {"available": True, "active": "balanced",
+           "profiles": ["power-saver", "balanced", "performance"]},
+    "gpu": {"available": True, "backend": "envycontrol", "mode": "hybrid"},
+    "seq": 42,
+    "timestamp": 1718000000.0,
+}
+# Fields that typically move between two samples
+TICK = {"sys.cpu_temp": 62.0, "sys.gpu_temp": 49.0,
+        "fan.fans.1.current": 2950, "fan.fans.2.current": 3150}
+
+
+def per_call_us(fn, n):
+    t0 = time.process_time()
+    for _ in range(n):
+        fn()
+    return (time.process_time() - t0) / n * 1e6
+
+
+def offline(n):
+    snap = dict(SAMPLE)
+    seq, ts = snap.pop("seq"), snap.pop("timestamp")
+
+    js = json.dumps(SAMPLE)
+    full = GLib.Variant(REPLY_SIG, (TELEMETRY_VERSION, seq, ts,
+                                    {k: to_variant(v) for k, v in flatten(snap).items()}, []))
+    delta = GLib.Variant(REPLY_SIG, (TELEMETRY_VERSION, seq + 1, ts + 2,
+                                     {k: to_variant(v) for k, v in TICK.items()}, []))
+
+    mirror = TelemetryMirror()
+    mirror.apply(*full.unpack())
+
+    rows = [
+        ("json string (GetTelemetry)", len(js.encode()) + 4 + 1,  # 's': length + NUL
+         per_call_us(lambda: json.loads(GLib.Variant("(s)", (js,)).unpack()[0]), n)),
+        ("a{sv} full (since=0)", full.get_size(),
+         per_call_us(lambda: TelemetryMirror().apply(*full.unpack()), n)),
+        ("a{sv} delta (1 tick)", delta.get_size(),
+         per_call_us(lambda: mirror.apply(*delta.unpack()), n)),
+    ]
+    print(f"{'payload':<28} {'bytes':>6} {'client us/call':>15}")
+    for name, size, us in rows:
+        print(f"{name:<28} {size:>6} {us:>15.1f}")
+
+
+def live(n):
+    from pydbus import SystemBus
+    svc = SystemBus().get("com.yyl.hpmanager")
+    mirror = TelemetryMirror()
+    mirror.update(svc)
+    js_len = len(svc.GetTelemetry().encode())
+
+    rows = [
+        ("GetTelemetry + json.loads", js_len, per_call_us(lambda: json.loads(svc.GetTelemetry()), n)),
+        ("GetTelemetryDelta(0)", None, per_call_us(lambda: TelemetryMirror().update(svc), n)),
+        ("GetTelemetryDelta(seq)", None, per_call_us(lambda: mirror.update(svc), n)),
+    ]
+    print(f"{'call':<28} {'bytes':>6} {'client CPU us/call':>19}")
+    for name, size, us in rows:
+        print(f"{name:<28} {size if size is not None else '-':>6} {us:>19.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--live", action="store_true", help="call the running daemon")
+    args = ap.parse_args()
+    if args.live:
+        live(max(1, args.n // 20))
+    else:
+        offline(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Telemetry log benchmark: writer throughput and mmap read latency.
+
+Writes --days segments of 1 Hz records (86400 per day) into a scratch
+directory through TelemetryLogWriter, then times read_range() for the
+last hour and a full day, a few columns at a time. The same day stored
+as JSON lines is parsed for comparison.
+
+    python3 benchmarks/telemetry_log_bench.py [--days 2] [--runs 20]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "common"))
+import telemetry_log
+from telemetry_log import COLUMNS, TelemetryLogWriter, read_range
+
+DAY = 86400
+READ_COLUMNS = ("cpu_temp", "gpu_temp", "fan1", "cpu_usage")
+
+
+def make_flat(rng):
+    return {
+        "sys.cpu_temp": rng.uniform(45, 95), "sys.gpu_temp": rng.uniform(40, 85),
+        "fan.fans.1.current": rng.randint(0, 5800), "fan.fans.2.current": rng.randint(0, 6100),
+        "fan.fans.1.target": 3000, "fan.fans.2.target": 3200,
+        "cpu.usage": rng.uniform(0, 100), "mem.used_pct": 41.5, "mem.swap_pct": 0.0,
+        "dgpu.temp": rng.uniform(40, 85), "dgpu.util": rng.randint(0, 100),
+        "dgpu.power_w": rng.uniform(5, 120), "dgpu.clock_mhz": 1800,
+        "psi.cpu.some": 0.5, "psi.memory.some": 0.0, "psi.io.some": 0.1,
+        "sys.os_name": "Linux",  # ignored by the log
+    }
+
+
+def pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q / 100 * (len(xs) - 1))))]
+
+
+def timed(fn, runs):
+    out = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1e3)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=2)
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    flats = [make_flat(rng) for _ in range(1000)]
+    scratch = tempfile.mkdtemp(prefix="hpm-tlog-")
+    log_dir = os.path.join(scratch, "telemetry")
+    try:
+        # ── write ─────────────────────────────────────────────────────────
+        # Midnight-aligned so every day is exactly one segment
+        end = (int(time.time()) // DAY) * DAY - time.localtime().tm_gmtoff + DAY
+        start = end - args.days * DAY
+        writer = TelemetryLogWriter(log_dir, max_bytes=1 << 40)
+        n = args.days * DAY
+        t0 = time.perf_counter()
+        for i in range(n):
+            writer.append(start + i, flats[i % len(flats)])
+        writer.close()
+        wall = time.perf_counter() - t0
+        size = sum(os.path.getsize(p) for p in telemetry_log.segments(log_dir))
+        print(f"write   {n} records ({telemetry_log.RECORD.size} B each, {len(COLUMNS)} columns)")
+        print(f"        {n / wall:,.0f} records/s   {size / wall / 1e6:.1f} MB/s   "
+              f"{wall / n * 1e6:.2f} us/record   {writer.stats['flushes']} flushes   "
+              f"{size / args.days / 1e6:.1f} MB/day on disk")
+
+        # ── read ──────────────────────────────────────────────────────────
+        last = end - 1
+        cases = (("last hour", last - 3600), ("last day", last - DAY))
+        print(f"\nread    {len(READ_COLUMNS)} columns, {args.runs} runs{'':10} p50 ms    p90 ms   records")
+        for label, since in cases:
+            rows = len(read_range(since, last, READ_COLUMNS, log_dir)["t"])
+            xs = timed(lambda: read_range(since, last, READ_COLUMNS, log_dir), args.runs)
+            print(f"  mmap  {label:<28} {pct(xs, 50):8.2f}  {pct(xs, 90):8.2f}   {rows}")
+
+        # ── baseline: the same day as JSON lines ──────────────────────────
+        jpath = os.path.join(scratch, "day.jsonl")
+        with open(jpath, "w") as f:
+            for i in range(DAY):
+                rec = {name: flats[i % len(flats)].get(key) for name, key in COLUMNS}
+                rec["t"] = start + i
+                f.write(json.dumps(rec) + "\n")
+
+        def parse_jsonl():
+            cols = {c: [] for c in READ_COLUMNS}
+            with open(jpath) as f:
+                for line in f:
+                    rec = json.loads(line)
+                    for c in READ_COLUMNS:
+                        cols[c].append(rec[c])
+            return cols
+        xs = timed(parse_jsonl, max(3, args.runs // 5))
+        print(f"  jsonl {'one day (text baseline)':<28} {pct(xs, 50):8.2f}  {pct(xs, 90):8.2f}   {DAY}"
+              f"   ({os.path.getsize(jpath) / 1e6:.1f} MB)")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
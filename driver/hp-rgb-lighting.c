@@ -15,6 +15,7 @@
 #define pr_fmt(fmt) KBUILD_MODNAME ": " fmt
 
 #include <linux/acpi.h>
+#include <linux/ctype.h>
 #include <linux/errno.h>
 #include <linux/init.h>
 #include <linux/kernel.h>
@@ -204,6 +205,92 @@ static ssize_t zone_store(struct device *dev, struct device_attribute *attr,
   return ret ? -EIO : count;
 }
 
+/* ══════════════════════════════════════════════════════════════════
+ * RGB FRAME SYSFS  (all zones in one write)
+ * echo "FF0000 00FF00 0000FF ..." > /sys/devices/platform/hp-rgb-lighting/frame
+ * cat  /sys/devices/platform/hp-rgb-lighting/frame   → "FF0000 00FF00 ..."
+ *
+ * Up to RGB_ZONE_COUNT colours, whitespace separated; zones not listed
+ * keep their current colour.  One colour-table GET and one SET per
+ * write instead of one pair per zone.
+ * ══════════════════════════════════════════════════════════════════ */
+static ssize_t frame_show(struct device *dev, struct device_attribute *attr,
+                          char *buf) {
+  u8 tbl[COLOR_TABLE_SIZE];
+  int zone, len = 0;
+  int ret;
+
+  mutex_lock(&rgb_mutex);
+  memset(tbl, 0, sizeof(tbl));
+  ret = hp_wmi_perform_query(HPWMI_COLOR_GET_QUERY, HPWMI_BACKLIGHT, tbl,
+                             sizeof(tbl), sizeof(tbl));
+  mutex_unlock(&rgb_mutex);
+
+  if (ret)
+    return -EIO;
+
+  for (zone = 0; zone < RGB_ZONE_COUNT; zone++)
+    len += sysfs_emit_at(buf, len, "%02X%02X%02X%c",
+                         tbl[COLOR_OFFSET + zone * 3 + 0],
+                         tbl[COLOR_OFFSET + zone * 3 + 1],
+                         tbl[COLOR_OFFSET + zone * 3 + 2],
+                         zone == RGB_ZONE_COUNT - 1 ? '\n' : ' ');
+  return len;
+}
+
+static ssize_t frame_store(struct device *dev, struct device_attribute *attr,
+                           const char *buf, size_t count) {
+  u32 rgb[RGB_ZONE_COUNT];
+  u8 tbl[COLOR_TABLE_SIZE];
+  char tok[8];
+  const char *p = buf, *end = buf + count;
+  int zones = 0, zone, len;
+  int ret;
+
+  while (p < end) {
+    while (p < end && isspace(*p))
+      p++;
+    if (p >= end)
+      break;
+    if (zones >= RGB_ZONE_COUNT)
+      return -EINVAL;
+    len = 0;
+    while (p + len < end && !isspace(p[len]))
+      len++;
+    if (len != 6)
+      return -EINVAL;
+    memcpy(tok, p, len);
+    tok[len] = '\0';
+    if (kstrtou32(tok, 16, &rgb[zones]))
+      return -EINVAL;
+    zones++;
+    p += len;
+  }
+  if (!zones)
+    return -EINVAL;
+
+  mutex_lock(&rgb_mutex);
+  memset(tbl, 0, sizeof(tbl));
+  ret = hp_wmi_perform_query(HPWMI_COLOR_GET_QUERY, HPWMI_BACKLIGHT, tbl,
+                             sizeof(tbl), sizeof(tbl));
+  if (ret) {
+    mutex_unlock(&rgb_mutex);
+    return -EIO;
+  }
+
+  for (zone = 0; zone < zones; zone++) {
+    tbl[COLOR_OFFSET + zone * 3 + 0] = (rgb[zone] >> 16) & 0xFF;
+    tbl[COLOR_OFFSET + zone * 3 + 1] = (rgb[zone] >> 8) & 0xFF;
+    tbl[COLOR_OFFSET + zone * 3 + 2] = rgb[zone] & 0xFF;
+  }
+
+  ret = hp_wmi_perform_query(HPWMI_COLOR_SET_QUERY, HPWMI_BACKLIGHT, tbl,
+                             sizeof(tbl), sizeof(tbl));
+  mutex_unlock(&rgb_mutex);
+
+  return ret ? -EIO : count;
+}
+
 /* ── brightness on/off ── */
 static ssize_t brightness_show(struct device *dev,
                                struct device_attribute *attr, char *buf) {
@@ -261,14 +348,15 @@ static DEVICE_ATTR(zone4, 0644, zone_show, zone_store);
 static DEVICE_ATTR(zone5, 0644, zone_show, zone_store);
 static DEVICE_ATTR(zone6, 0644, zone_show, zone_store);
 static DEVICE_ATTR(zone7, 0644, zone_show, zone_store);
+static DEVICE_ATTR_RW(frame);
 static DEVICE_ATTR_RW(brightness);
 static DEVICE_ATTR_RW(win_lock);
 
 static struct attribute *hp_rgb_lighting_attrs[] = {
     &dev_attr_zone0.attr, &dev_attr_zone1.attr, &dev_attr_zone2.attr,
     &dev_attr_zone3.attr, &dev_attr_zone4.attr, &dev_attr_zone5.attr,
-    &dev_attr_zone6.attr, &dev_attr_zone7.attr, &dev_attr_brightness.attr,
-    &dev_attr_win_lock.attr, NULL,
+    &dev_attr_zone6.attr, &dev_attr_zone7.attr, &dev_attr_frame.attr,
+    &dev_attr_brightness.attr, &dev_attr_win_lock.attr, NULL,
 };
 ATTRIBUTE_GROUPS(hp_rgb_lighting);
 
@@ -238,6 +238,7 @@ do_install() {
 
     # Daemon files
     cp -r src/daemon/* "$INSTALL_DIR/"
+    cp src/common/*.py "$INSTALL_DIR/"
 
     # GUI files
     mkdir -p "$DATA_DIR/gui/pages"
@@ -246,6 +247,7 @@ do_install() {
     cp src/gui/i18n.py        "$DATA_DIR/gui/"
     cp src/gui/pages/*.py     "$DATA_DIR/gui/pages/"
     cp src/gui/widgets/*.py   "$DATA_DIR/gui/widgets/"
+    cp src/common/*.py        "$DATA_DIR/gui/"
 
     # Images (non-fatal if missing)
     if [ -d "images" ] && [ -n "$(ls -A images 2>/dev/null)" ]; then
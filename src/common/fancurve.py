@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Fan curve interpolation shared by the GUI widget and the daemon controller.
+
+The curve is compiled once into a dense lookup table (one entry per 0.1 °C),
+so a lookup is an index calculation instead of a scan over the points.
+The table is rebuilt only when the points change.
+"""
+
+TEMP_LO = 0.0       # °C, first table entry
+TEMP_HI = 110.0     # °C, last table entry
+STEP = 0.1          # °C per table entry
+_SCALE = 1.0 / STEP
+
+
+def interpolate(points, temp):
+    """Reference linear interpolation over sorted (temp, pct) points."""
+    if not points:
+        return 0
+    if temp <= points[0][0]:
+        return points[0][1]
+    if temp >= points[-1][0]:
+        return points[-1][1]
+    for i in range(len(points) - 1):
+        t0, f0 = points[i]
+        t1, f1 = points[i + 1]
+        if t0 <= temp <= t1:
+            ratio = (temp - t0) / (t1 - t0) if t1 != t0 else 0
+            return f0 + (f1 - f0) * ratio
+    return 0
+
+
+class FanCurveLUT:
+    """Fan % per 0.1 °C between TEMP_LO and TEMP_HI, built from curve points."""
+
+    __slots__ = ("points", "table", "_last")
+
+    def __init__(self, points=()):
+        self.points = []
+        self.table = []
+        self._last = 0
+        self.rebuild(points)
+
+    def rebuild(self, points):
+        pts = sorted((float(t), float(f)) for t, f in points)
+        self.points = pts
+        size = int(round((TEMP_HI - TEMP_LO) * _SCALE)) + 1
+        if not pts:
+            self.table = [0.0] * size
+            self._last = size - 1
+            return
+
+        # Walk the segments once instead of interpolating every entry from scratch
+        table = []
+        seg = 0
+        for i in range(size):
+            temp = TEMP_LO + i * STEP
+            if temp <= pts[0][0]:
+                table.append(pts[0][1])
+                continue
+            if temp >= pts[-1][0]:
+                table.append(pts[-1][1])
+                continue
+            while pts[seg + 1][0] < temp:
+                seg += 1
+            (t0, f0), (t1, f1) = pts[seg], pts[seg + 1]
+            table.append(f0 + (f1 - f0) * (temp - t0) / (t1 - t0) if t1 != t0 else f0)
+        self.table = table
+        self._last = size - 1
+
+    def lookup(self, temp):
+        """Fan % for temp, rounded to the nearest 0.1 °C."""
+        i = int((temp - TEMP_LO) * _SCALE + 0.5)
+        if i <= 0:
+            return self.table[0]
+        if i >= self._last:
+            return self.table[self._last]
+        return self.table[i]
+
+    __call__ = lookup
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+CPU / memory utilisation sampler over /proc, shared by the daemon and the
+GUI (which only uses it when talking to an older daemon).
+
+Every file stays open; a sample is one preadv() per file into a buffer
+that is allocated once, and only the fields that are reported get parsed:
+the cpu lines at the top of /proc/stat, four keys of /proc/meminfo and the
+avg10 values of /proc/pressure/{cpu,memory,io}.
+"""
+import os
+
+PSI_RESOURCES = ("cpu", "memory", "io")
+MEMINFO_KEYS = (b"MemTotal:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:")
+
+
+class _ProcFile:
+    """An open /proc file re-read from offset 0 into a reused bytearray."""
+    __slots__ = ("path", "fd", "buf")
+
+    def __init__(self, path, size):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        self.buf = bytearray(size)
+
+    def read(self):
+        """Bytes read this time; the data is buf[:n]. n == len(buf) means possibly truncated."""
+        return os.preadv(self.fd, [self.buf], 0)
+
+    def grow(self):
+        self.buf = bytearray(len(self.buf) * 2)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def _open(path, size):
+    try:
+        return _ProcFile(path, size)
+    except OSError:
+        return None
+
+
+class ProcSampler:
+    """
+    Toplam ve çekirdek başına CPU kullanımı (EMA ile yumuşatılmış), bellek,
+    swap ve PSI baskısı. sample() art arda iki /proc/stat okuması arasındaki
+    farkı kullanır; ilk çağrıda CPU değerleri 0'dır.
+    """
+
+    def __init__(self, smoothing=0.3, proc_root="/proc"):
+        self.smoothing = max(0.05, min(float(smoothing), 1.0))  # EMA alpha (1.0 = raw)
+        ncpu = os.cpu_count() or 1
+        # cpu lines are < 128 bytes each; grown on demand if that guess is short
+        self._stat = _open(f"{proc_root}/stat", 128 * (ncpu + 1) + 256)
+        self._meminfo = _open(f"{proc_root}/meminfo", 4096)
+        self._psi = {}
+        for res in PSI_RESOURCES:
+            f = _open(f"{proc_root}/pressure/{res}", 256)
+            if f:
+                self._psi[res] = f
+        self._prev = {}      # cpu name -> (total, idle) jiffies
+        self._ema = {}       # cpu name -> smoothed percent
+        self.stats = {"samples": 0, "stat_grows": 0}
+
+    def configure(self, smoothing):
+        self.smoothing = max(0.05, min(float(smoothing), 1.0))
+
+    # ── /proc/stat ────────────────────────────────────────────────────────
+    def _read_cpu_lines(self):
+        f = self._stat
+        while True:
+            n = f.read()
+            end = f.buf.find(b"\nintr", 0, n)  # first line after the cpu block
+            if end >= 0:
+                break
+            if n < len(f.buf):
+                end = n
+                break
+            f.grow()
+            self.stats["stat_grows"] += 1
+        return f.buf[:end].split(b"\n")
+
+    def _cpu(self):
+        alpha = self.smoothing
+        usage = {}
+        names = []
+        for line in self._read_cpu_lines():
+            if not line.startswith(b"cpu"):
+                break
+            fields = line.split()
+            name = fields[0].decode()
+            # user nice system idle iowait irq softirq steal (guest is inside user)
+            t = [int(x) for x in fields[1:9]]
+            total = sum(t)
+            idle = t[3] + t[4]
+            names.append(name)
+            prev = self._prev.get(name)
+            self._prev[name] = (total, idle)
+            if prev is None:
+                continue
+            dt = total - prev[0]
+            raw = (1.0 - (idle - prev[1]) / dt) * 100.0 if dt > 0 else 0.0
+            old = self._ema.get(name)
+            usage[name] = self._ema[name] = raw if old is None else old + alpha * (raw - old)
+        if len(self._prev) != len(names):  # a core went offline
+            keep = set(names)
+            self._prev = {k: v for k, v in self._prev.items() if k in keep}
+            self._ema = {k: v for k, v in self._ema.items() if k in keep}
+        return {
+            "usage": round(usage.get("cpu", 0.0), 1),
+            "cores": [round(usage.get(n, 0.0), 1) for n in names[1:]],
+        }
+
+    # ── /proc/meminfo ─────────────────────────────────────────────────────
+    def _mem(self):
+        f = self._meminfo
+        n = f.read()
+        buf = f.buf
+        kb = {}
+        for key in MEMINFO_KEYS:
+            i = buf.find(key, 0, n)
+            if i >= 0:
+                kb[key] = int(buf[i + len(key):buf.find(b"\n", i, n)].split()[0])
+        total = kb.get(b"MemTotal:", 0)
+        avail = kb.get(b"MemAvailable:", total)
+        swap_total = kb.get(b"SwapTotal:", 0)
+        swap_used = swap_total - kb.get(b"SwapFree:", swap_total)
+        return {
+            "total_kb":      total,
+            "available_kb":  avail,
+            "used_pct":      round((1 - avail / total) * 100.0, 1) if total else 0.0,
+            "swap_total_kb": swap_total,
+            "swap_used_kb":  swap_used,
+            "swap_pct":      round(swap_used / swap_total * 100.0, 1) if swap_total else 0.0,
+        }
+
+    # ── /proc/pressure ────────────────────────────────────────────────────
+    @staticmethod
+    def _avg10(buf, n, kind):
+        i = buf.find(kind + b" avg10=", 0, n)
+        if i < 0:
+            return None
+        i += len(kind) + 7
+        return float(buf[i:buf.find(b" ", i, n)])
+
+    def _pressure(self):
+        out = {}
+        for res, f in self._psi.items():
+            try:
+                n = f.read()
+            except OSError:  # "psi=0" on the command line: files exist but refuse reads
+                continue
+            out[res] = {"some": self._avg10(f.buf, n, b"some"), "full": self._avg10(f.buf, n, b"full")}
+        return out
+
+    def sample(self):
+        """{"cpu": {...}, "mem": {...}, "psi": {...}}; a section is left out if its file is missing."""
+        out = {}
+        if self._stat:
+            out["cpu"] = self._cpu()
+        if self._meminfo:
+            out["mem"] = self._mem()
+        if self._psi:
+            out["psi"] = self._pressure()
+        self.stats["samples"] += 1
+        return out
+
+    def get_stats(self):
+        return dict(self.stats, smoothing=self.smoothing, psi=sorted(self._psi),
+                    stat_buffer=len(self._stat.buf) if self._stat else 0)
+
+    def close(self):
+        for f in (self._stat, self._meminfo, *self._psi.values()):
+            if f:
+                f.close()
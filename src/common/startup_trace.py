@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Opt-in startup tracer shared by the daemon and the GUI.
+
+    HP_MANAGER_TRACE=1            phase timings printed to stderr as they happen
+    HP_MANAGER_TRACE=/tmp/t.jsonl one JSON line per process, written by report()
+
+Times are milliseconds since the process was exec'd (interpreter start-up
+included), taken from /proc/self/stat. With the variable unset every call
+is a no-op.
+"""
+import json
+import os
+import sys
+import time
+
+ENV = "HP_MANAGER_TRACE"
+_dest = os.environ.get(ENV, "")
+enabled = _dest not in ("", "0")
+
+
+def _process_start():
+    """time.monotonic() value at exec, so the trace covers interpreter start-up too."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        start = int(fields[19]) / os.sysconf("SC_CLK_TCK")   # field 22: starttime
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - start
+        return time.monotonic() - max(0.0, age)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.monotonic()
+
+
+_t0 = _process_start() if enabled else 0.0
+_events = []   # (name, start ms, duration ms or None)
+_reported = False
+
+
+def now_ms():
+    return (time.monotonic() - _t0) * 1000.0
+
+
+def _record(name, start, duration=None):
+    _events.append((name, round(start, 2), None if duration is None else round(duration, 2)))
+    if _dest == "1":
+        took = f" ({duration:.1f} ms)" if duration is not None else ""
+        print(f"[trace] {now_ms():8.1f} ms  {name}{took}", file=sys.stderr, flush=True)
+
+
+def mark(name):
+    """Point event: name reached at this moment."""
+    if enabled:
+        _record(name, now_ms())
+
+
+def once(name):
+    """mark(), but only the first time name is reached."""
+    if enabled and not any(e[0] == name for e in _events):
+        _record(name, now_ms())
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = now_ms()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, self.start, now_ms() - self.start)
+        return False
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name):
+    """Context manager timing a block: with phase("probe:fan"): ..."""
+    return _Phase(name) if enabled else _NO_PHASE
+
+
+def events():
+    return list(_events)
+
+
+def report(component):
+    """Write this process' trace once (file mode); stderr mode already printed it."""
+    global _reported
+    if not enabled or _reported:
+        return
+    _reported = True
+    if _dest == "1":
+        return
+    line = json.dumps({"component": component, "pid": os.getpid(),
+                       "events": [{"name": n, "at": at, "ms": ms} for n, at, ms in _events]})
+    try:
+        with open(_dest, "a") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"[trace] cannot write {_dest}: {e}", file=sys.stderr)
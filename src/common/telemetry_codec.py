@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Telemetry wire format shared by the daemon and its clients.
+
+GetTelemetryDelta sends the telemetry snapshot flattened into dotted keys
+("fan.fans.1.current") as a D-Bus a{sv}, containing only the keys that
+changed after the sequence number the client already has. No JSON is
+involved on either side; pydbus marshals the variants natively.
+"""
+
+TELEMETRY_VERSION = 1
+SEP = "."
+
+
+def flatten(d, prefix="", out=None):
+    """Nested dict -> {"a.b.c": leaf}. None leaves are dropped (D-Bus has no null)."""
+    if out is None:
+        out = {}
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            flatten(v, key + SEP, out)
+        elif v is not None:
+            out[key] = v
+    return out
+
+
+def unflatten(flat):
+    """Inverse of flatten()."""
+    root = {}
+    for key, v in flat.items():
+        node = root
+        *parents, leaf = key.split(SEP)
+        for p in parents:
+            node = node.setdefault(p, {})
+        node[leaf] = v
+    return root
+
+
+def to_variant(v):
+    """Python leaf -> GLib.Variant with the narrowest natural D-Bus type."""
+    from gi.repository import GLib
+    if isinstance(v, bool):
+        return GLib.Variant("b", v)
+    if isinstance(v, int):
+        return GLib.Variant("x", v)
+    if isinstance(v, float):
+        return GLib.Variant("d", v)
+    if isinstance(v, str):
+        return GLib.Variant("s", v)
+    if isinstance(v, (list, tuple)):
+        if all(isinstance(x, str) for x in v):
+            return GLib.Variant("as", list(v))
+        if all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in v):
+            return GLib.Variant("ad", [float(x) for x in v])
+        return GLib.Variant("av", [to_variant(x) for x in v])
+    return GLib.Variant("s", str(v))
+
+
+class TelemetryMirror:
+    """
+    Client-side copy of the daemon's telemetry kept current with deltas:
+
+        mirror = TelemetryMirror()
+        tel = mirror.update(proxy)   # nested dict, same shape as GetTelemetry
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.timestamp = 0.0
+        self.flat = {}
+        self._nested = {}
+
+    def apply(self, version, seq, timestamp, changed, removed):
+        if version != TELEMETRY_VERSION:
+            raise ValueError(f"unsupported telemetry version {version}")
+        if seq < self.seq:
+            # Daemon restarted; the reply is a full snapshot
+            self.flat = {}
+        if changed or removed or seq < self.seq:
+            self.flat.update(changed)
+            for k in removed:
+                self.flat.pop(k, None)
+            self._nested = unflatten(self.flat)
+        self.seq = seq
+        self.timestamp = timestamp
+        self._nested["seq"] = seq
+        self._nested["timestamp"] = timestamp
+        return self._nested
+
+    def update(self, proxy):
+        return self.apply(*proxy.GetTelemetryDelta(self.seq))
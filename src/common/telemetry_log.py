@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+On-disk telemetry log shared by the daemon (writer) and the GUI (reader).
+
+One segment file per local day, telemetry-YYYYMMDD.bin:
+
+    header  HEADER_SIZE bytes: magic, version, record size, column count,
+            creation time, then the NUL-separated column names
+    records fixed width: float64 unix time + one float32 per column
+            (NaN = not available), padded to a multiple of 8 bytes
+
+The writer buffers records in memory and appends them with one write()
+every FLUSH_INTERVAL seconds, so the disk is not woken on every sample.
+Old segments are deleted once the directory exceeds max_bytes. Readers
+mmap a segment and slice columns out of it with strided memoryviews: no
+parsing, and only the pages that are touched get read.
+"""
+import bisect
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger("hp-manager")
+
+LOG_DIR = "/var/lib/hp-manager/telemetry"
+MAGIC = b"HPTL"
+VERSION = 1
+HEADER_SIZE = 512
+HEADER = struct.Struct("<4sHHHxxd")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# (column, flattened telemetry key)
+COLUMNS = (
+    ("cpu_temp",    "sys.cpu_temp"),
+    ("gpu_temp",    "sys.gpu_temp"),
+    ("fan1",        "fan.fans.1.current"),
+    ("fan2",        "fan.fans.2.current"),
+    ("fan1_target", "fan.fans.1.target"),
+    ("fan2_target", "fan.fans.2.target"),
+    ("cpu_usage",   "cpu.usage"),
+    ("mem_used",    "mem.used_pct"),
+    ("swap_used",   "mem.swap_pct"),
+    ("dgpu_temp",   "dgpu.temp"),
+    ("dgpu_util",   "dgpu.util"),
+    ("dgpu_power",  "dgpu.power_w"),
+    ("dgpu_clock",  "dgpu.clock_mhz"),
+    ("psi_cpu",     "psi.cpu.some"),
+    ("psi_memory",  "psi.memory.some"),
+    ("psi_io",      "psi.io.some"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+_PAD = -(8 + 4 * len(COLUMNS)) % 8
+RECORD = struct.Struct(f"<d{len(COLUMNS)}f{_PAD}x")
+NAN = float("nan")
+
+
+def _num(v):
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return v
+    return NAN
+
+
+def _header():
+    names = "\0".join(COLUMN_NAMES).encode()
+    head = HEADER.pack(MAGIC, VERSION, RECORD.size, len(COLUMNS), time.time()) + names
+    if len(head) > HEADER_SIZE:
+        raise ValueError("telemetry log header overflow")
+    return head.ljust(HEADER_SIZE, b"\0")
+
+
+def _parse_header(data):
+    """(record size, column names) or None if this is not a segment we can read."""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, rec_size, ncols, _created = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or rec_size < 8 + 4 * ncols or rec_size % 8:
+        return None
+    names = bytes(data[HEADER.size:HEADER_SIZE]).rstrip(b"\0").decode(errors="replace").split("\0")
+    return (rec_size, tuple(names)) if len(names) == ncols else None
+
+
+def segment_name(now):
+    return time.strftime("telemetry-%Y%m%d.bin", time.localtime(now))
+
+
+def segments(directory=LOG_DIR):
+    """Segment paths, oldest first (a "-prev" file sorts before its day's current one)."""
+    try:
+        names = [n for n in os.listdir(directory) if n.startswith("telemetry-") and n.endswith(".bin")]
+    except OSError:
+        return []
+    return [os.path.join(directory, n) for n in sorted(names)]
+
+
+class TelemetryLogWriter:
+    """Append-only; called from the telemetry sampler thread, close() from anywhere."""
+    FLUSH_INTERVAL = 30.0
+
+    def __init__(self, directory=LOG_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(directory, mode=0o755, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._fd = None
+        self._name = None
+        self._buf = bytearray()
+        self._last_flush = time.monotonic()
+        self._dir_bytes = sum(os.path.getsize(p) for p in segments(directory))
+        self.stats = {"records": 0, "flushes": 0, "bytes": 0, "removed": 0, "errors": 0}
+
+    def append(self, now, flat):
+        """One record from a flattened telemetry snapshot; missing keys become NaN."""
+        rec = RECORD.pack(now, *[_num(flat.get(key)) for _, key in COLUMNS])
+        with self._lock:
+            name = segment_name(now)
+            if name != self._name:
+                self._flush()
+                self._open(name)
+            if self._fd is None:
+                return
+            self._buf += rec
+            self.stats["records"] += 1
+            if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+                self._flush()
+
+    def _open(self, name):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._name = name
+        path = os.path.join(self.directory, name)
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            size = os.fstat(fd).st_size
+            layout = _parse_header(os.pread(fd, HEADER_SIZE, 0)) if size else None
+            if size and layout != (RECORD.size, COLUMN_NAMES):
+                # Written by another schema: keep it readable under another name, start fresh
+                os.close(fd)
+                os.replace(path, path[:-4] + "-prev.bin")
+                fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+                size = 0
+            if not size:
+                os.write(fd, _header())
+                self._dir_bytes += HEADER_SIZE
+            elif (size - HEADER_SIZE) % RECORD.size:
+                # Torn record from a crash mid-write
+                os.ftruncate(fd, size - (size - HEADER_SIZE) % RECORD.size)
+            self._fd = fd
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Telemetry log: cannot open {path}: {e}")
+        self._prune()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buf or self._fd is None:
+            self._buf.clear()
+            return
+        data = memoryview(self._buf)
+        try:
+            while data:
+                data = data[os.write(self._fd, data):]
+            self.stats["flushes"] += 1
+            self.stats["bytes"] += len(self._buf)
+            self._dir_bytes += len(self._buf)
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Telemetry log: write failed: {e}")
+        finally:
+            data.release()
+            self._buf.clear()
+        if self._dir_bytes > self.max_bytes:
+            self._prune()
+
+    def _prune(self):
+        """Delete the oldest segments (never the open one) until under max_bytes."""
+        paths = segments(self.directory)
+        sizes = {}
+        for p in paths:
+            try:
+                sizes[p] = os.path.getsize(p)
+            except OSError:
+                pass
+        total = sum(sizes.values())
+        current = os.path.join(self.directory, self._name) if self._name else None
+        for p in paths:
+            if total <= self.max_bytes:
+                break
+            if p == current:
+                continue
+            try:
+                os.unlink(p)
+                total -= sizes.get(p, 0)
+                self.stats["removed"] += 1
+            except OSError:
+                pass
+        self._dir_bytes = total
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def get_stats(self):
+        return dict(self.stats, segment=self._name, pending=len(self._buf) // RECORD.size,
+                    dir_bytes=self._dir_bytes, max_bytes=self.max_bytes)
+
+
+class Segment:
+    """
+    mmap'ed segment. Columns come out as strided memoryview slices over the
+    mapping, converted to lists only for the requested record range.
+
+        with Segment(path) as seg:
+            i = seg.index_at(time.time() - 3600)
+            t, temps = seg.times(i), seg.column("cpu_temp", i)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mm = None
+        self._views = []
+        self.count = 0
+        self.columns = ()
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER_SIZE:
+                return
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        layout = _parse_header(self._mm[:HEADER_SIZE])
+        if layout is None:
+            self.close()
+            return
+        self.record_size, self.columns = layout
+        self.count = (size - HEADER_SIZE) // self.record_size
+        body = memoryview(self._mm)[HEADER_SIZE:HEADER_SIZE + self.count * self.record_size]
+        self._d = body.cast("d")   # float64 view: timestamps at stride record_size / 8
+        self._f = body.cast("f")   # float32 view: columns at stride record_size / 4
+        self._views = [body, self._d, self._f]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def times(self, start=0, stop=None):
+        step = self.record_size // 8
+        return self._d[start * step:(self.count if stop is None else stop) * step:step].tolist() \
+            if self.count else []
+
+    def column(self, name, start=0, stop=None):
+        if not self.count:
+            return []
+        step = self.record_size // 4
+        j = 2 + self.columns.index(name)
+        return self._f[start * step + j:(self.count if stop is None else stop) * step:step].tolist()
+
+    def index_at(self, ts):
+        """First record with time >= ts (records are appended in time order)."""
+        if not self.count:
+            return 0
+        step = self.record_size // 8
+        return bisect.bisect_left(_Strided(self._d, step, self.count), ts)
+
+    def close(self):
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class _Strided:
+    """Sequence view for bisect over one strided field, without copying."""
+    __slots__ = ("view", "step", "n")
+
+    def __init__(self, view, step, n):
+        self.view, self.step, self.n = view, step, n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        return self.view[i * self.step]
+
+
+def read_range(since, until=None, columns=COLUMN_NAMES, directory=LOG_DIR):
+    """
+    {"t": [...], column: [...]} for records with since <= t < until, across
+    segments. NaN entries are kept so every list lines up with "t".
+    """
+    until = time.time() + 1 if until is None else until
+    first, last = segment_name(since), segment_name(until)
+    out = {"t": []}
+    for c in columns:
+        out[c] = []
+    for path in segments(directory):
+        day = os.path.basename(path)[:len("telemetry-YYYYMMDD")] + ".bin"
+        if not first <= day <= last:
+            continue
+        try:
+            seg = Segment(path)
+        except (OSError, ValueError):
+            continue
+        with seg:
+            lo, hi = seg.index_at(since), seg.index_at(until)
+            if lo >= hi:
+                continue
+            out["t"] += seg.times(lo, hi)
+            for c in columns:
+                out[c] += seg.column(c, lo, hi) if c in seg.columns else [NAN] * (hi - lo)
+    return out
+
+
+def summarize(values):
+    """(min, mean, max) of the non-NaN values, or None."""
+    vals = [v for v in values if not math.isnan(v)]
+    if not vals:
+        return None
+    return min(vals), sum(vals) / len(vals), max(vals)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Kernel uevent listener (NETLINK_KOBJECT_UEVENT), shared by the daemon and
+the GUI. Readable without privileges; events arrive only when a device is
+added, removed or changed, so watching it costs nothing while idle.
+"""
+import socket
+
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_GROUP = 1   # raw kernel events (udevd re-broadcasts on group 2)
+
+
+class UeventMonitor:
+    """
+    Non-blocking uevent socket. Hook fileno() into a poll loop (or call
+    read_events() on a timer) and drain it with read_events().
+    """
+
+    def __init__(self, subsystems=None):
+        self.subsystems = set(subsystems) if subsystems else None
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC,
+                                  NETLINK_KOBJECT_UEVENT)
+        self.sock.bind((0, KERNEL_GROUP))  # pid 0: kernel assigns the port id
+        self.sock.setblocking(False)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def read_events(self):
+        """All pending events as dicts (ACTION, DEVPATH, SUBSYSTEM, ...)."""
+        events = []
+        while True:
+            try:
+                data = self.sock.recv(16384)
+            except OSError:  # BlockingIOError: drained
+                break
+            ev = self.parse(data)
+            if ev and (self.subsystems is None or ev.get("SUBSYSTEM") in self.subsystems):
+                events.append(ev)
+        return events
+
+    @staticmethod
+    def parse(data):
+        parts = data.split(b"\0")
+        if not parts or b"@" not in parts[0]:
+            return None
+        ev = {}
+        for p in parts[1:]:
+            k, sep, v = p.partition(b"=")
+            if sep:
+                ev[k.decode(errors="replace")] = v.decode(errors="replace")
+        return ev if "ACTION" in ev else None
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
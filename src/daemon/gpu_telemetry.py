@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+HP Laptop Manager - NVIDIA GPU telemetrisi (NVML, ctypes).
+libnvidia-ml bir kez yüklenir; sıcaklık, kullanım, güç ve saatler tek
+örneklemede okunur. dGPU'ya dokunan her sorgu DGpuPowerTracker'dan geçer:
+PCI runtime_status uykudayken NVML'e ve dGPU hwmon'una hiç dokunulmaz,
+böylece askıdaki dGPU uyandırılmaz.
+"""
+import ctypes, logging, os, time
+
+logger = logging.getLogger("hp-manager")
+
+NVML_SUCCESS = 0
+NVML_TEMPERATURE_GPU = 0
+NVML_CLOCK_GRAPHICS = 0
+NVML_CLOCK_MEM = 2
+# nvmlClocksThrottleReasons bits
+THROTTLE_SW_POWER_CAP = 0x04
+THROTTLE_HW_SLOWDOWN = 0x08
+THROTTLE_SW_THERMAL = 0x20
+THROTTLE_HW_THERMAL = 0x40
+THROTTLE_HW_POWER_BRAKE = 0x80
+NVIDIA_VENDOR = "0x10de"
+# runtime_status values in which the device may be touched without waking it
+AWAKE_STATES = ("active", "unsupported")
+
+
+def _read_file(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+class NVMLError(Exception):
+    pass
+
+
+class _Utilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class NVML:
+    """Minimal binding: the library is dlopen'ed once, the session opened on demand."""
+    FUNCS = ("nvmlInit_v2", "nvmlShutdown", "nvmlDeviceGetHandleByIndex_v2",
+             "nvmlDeviceGetTemperature", "nvmlDeviceGetUtilizationRates",
+             "nvmlDeviceGetPowerUsage", "nvmlDeviceGetPowerManagementLimitConstraints",
+             "nvmlDeviceGetClockInfo", "nvmlDeviceGetCurrentClocksThrottleReasons")
+
+    def __init__(self, libname="libnvidia-ml.so.1"):
+        lib = ctypes.CDLL(libname)  # OSError when the driver is not installed
+        self.fn = {name: getattr(lib, name) for name in self.FUNCS}
+        self._error_string = lib.nvmlErrorString
+        self._error_string.restype = ctypes.c_char_p
+        self.handle = ctypes.c_void_p()
+        self.initialized = False
+
+    def _call(self, name, *args):
+        rc = self.fn[name](*args)
+        if rc != NVML_SUCCESS:
+            raise NVMLError(f"{name}: {self._error_string(rc).decode(errors='replace')}")
+
+    def open(self):
+        if self.initialized:
+            return
+        self._call("nvmlInit_v2")
+        self.initialized = True
+        try:
+            self._call("nvmlDeviceGetHandleByIndex_v2", ctypes.c_uint(0), ctypes.byref(self.handle))
+        except NVMLError:
+            self.close()
+            raise
+
+    def close(self):
+        if self.initialized:
+            self.initialized = False
+            self.fn["nvmlShutdown"]()
+
+    def sample(self):
+        """Temperature, utilization, power draw, clocks and throttle reasons in one pass."""
+        h = self.handle
+        temp, power, gfx, mem = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        util = _Utilization()
+        self._call("nvmlDeviceGetTemperature", h, NVML_TEMPERATURE_GPU, ctypes.byref(temp))
+        self._call("nvmlDeviceGetUtilizationRates", h, ctypes.byref(util))
+        self._call("nvmlDeviceGetClockInfo", h, NVML_CLOCK_GRAPHICS, ctypes.byref(gfx))
+        self._call("nvmlDeviceGetClockInfo", h, NVML_CLOCK_MEM, ctypes.byref(mem))
+        out = {
+            "temp":          float(temp.value),
+            "util":          int(util.gpu),
+            "mem_util":      int(util.memory),
+            "clock_mhz":     int(gfx.value),
+            "mem_clock_mhz": int(mem.value),
+        }
+        try:
+            self._call("nvmlDeviceGetPowerUsage", h, ctypes.byref(power))
+            out["power_w"] = round(power.value / 1000.0, 1)
+        except NVMLError:
+            pass  # not supported on every mobile SKU
+        reasons = ctypes.c_ulonglong()
+        try:
+            self._call("nvmlDeviceGetCurrentClocksThrottleReasons", h, ctypes.byref(reasons))
+            out["throttle"] = int(reasons.value)
+        except NVMLError:
+            pass
+        return out
+
+    def power_limit_w(self):
+        lo, hi = ctypes.c_uint(), ctypes.c_uint()
+        self._call("nvmlDeviceGetPowerManagementLimitConstraints", self.handle,
+                   ctypes.byref(lo), ctypes.byref(hi))
+        return int(hi.value / 1000)
+
+
+class DGpuPowerTracker:
+    """
+    dGPU'nun PCI cihazını bir kez çözer ve power/runtime_status'ı önbellekli
+    tek bir pread ile izler. GPU'ya dokunan her sorgu önce gate()'e sorar;
+    cihaz uykudaysa sorgu hiç çalışmaz ve durum "suspended" raporlanır.
+    """
+    STATE_TTL = 0.2   # one runtime_status read serves every query of a sample
+
+    def __init__(self, sysfs_root="/sys", reader=None):
+        self.sysfs_root = sysfs_root
+        self.read = reader or _read_file
+        self.pci_path = None
+        self.vendor = None
+        self._resolved = False
+        self._state = ("absent", 0.0)
+        self.stats = {"checks": 0, "status_reads": 0, "allowed": 0, "blocked": {}}
+
+    def _resolve(self):
+        """NVIDIA display controller, else any display controller that is not the boot VGA."""
+        self._resolved = True
+        base = f"{self.sysfs_root}/bus/pci/devices"
+        candidates = []
+        try:
+            for dev in sorted(os.listdir(base)):
+                path = os.path.join(base, dev)
+                try:
+                    if not _read_file(f"{path}/class").startswith("0x03"):
+                        continue
+                    vendor = _read_file(f"{path}/vendor")
+                except OSError:
+                    continue
+                try:
+                    boot_vga = _read_file(f"{path}/boot_vga") == "1"
+                except OSError:
+                    boot_vga = False
+                candidates.append((vendor != NVIDIA_VENDOR, boot_vga, path, vendor))
+        except OSError:
+            pass
+        for is_other, boot_vga, path, vendor in sorted(candidates):
+            if not is_other or not boot_vga:
+                self.pci_path = os.path.realpath(path)
+                self.vendor = vendor
+                logger.info(f"dGPU: {vendor} device at {self.pci_path}")
+                return
+
+    def present(self):
+        if not self._resolved:
+            self._resolve()
+        return self.pci_path is not None
+
+    def is_nvidia(self):
+        return self.present() and self.vendor == NVIDIA_VENDOR
+
+    def state(self):
+        """runtime_status, re-read at most every STATE_TTL seconds ("absent": no dGPU)."""
+        if not self.present():
+            return "absent"
+        value, at = self._state
+        now = time.monotonic()
+        if now - at < self.STATE_TTL:
+            return value
+        self.stats["status_reads"] += 1
+        try:
+            value = self.read(f"{self.pci_path}/power/runtime_status")
+        except OSError:
+            value = "unsupported"  # no runtime PM: the device is always powered
+        self._state = (value, now)
+        return value
+
+    def awake(self):
+        return self.state() in AWAKE_STATES
+
+    def gate(self, what):
+        """True if query `what` may touch the dGPU now; blocked queries are counted."""
+        self.stats["checks"] += 1
+        if self.awake():
+            self.stats["allowed"] += 1
+            return True
+        self.stats["blocked"][what] = self.stats["blocked"].get(what, 0) + 1
+        return False
+
+    def owns(self, path):
+        """Is this sysfs path (e.g. a hwmon temp input) served by the dGPU?"""
+        if not path or not self.present():
+            return False
+        return os.path.realpath(path).startswith(self.pci_path + "/")
+
+    def get_stats(self):
+        return dict(self.stats, blocked=dict(self.stats["blocked"]),
+                    device=self.pci_path, state=self._state[0])
+
+
+class GpuTelemetry:
+    """
+    NVIDIA dGPU örnekleyici; her sorgu DGpuPowerTracker kapısından geçer.
+    NVML oturumu GPU çalışırken açık tutulur; art arda RELEASE_AFTER_IDLE
+    boşta örnekten sonra kapatılır ki sürücü kartı askıya alabilsin (açık
+    bir NVML oturumu runtime D3'ü engeller) ve PARK_SECONDS boyunca
+    yeniden açılmaz.
+    """
+    RELEASE_AFTER_IDLE = 3
+    PARK_SECONDS = 30.0
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.nvml = None
+        self._nvml_failed = False
+        self._idle = 0
+        self._parked_until = 0.0
+        self._power_limit = None
+        self.last = {}
+        self.stats = {"samples": 0, "sessions": 0, "errors": 0}
+
+    def present(self):
+        return self.tracker.present()
+
+    def _load(self):
+        if self.nvml is None and not self._nvml_failed:
+            try:
+                self.nvml = NVML()
+            except (OSError, AttributeError) as e:
+                self._nvml_failed = True
+                logger.info(f"dGPU: NVML not available ({e})")
+        return self.nvml
+
+    def release(self):
+        if self.nvml and self.nvml.initialized:
+            self.nvml.close()
+
+    def sample(self):
+        tracker = self.tracker
+        if not tracker.present():
+            self.last = {"present": False}
+            return self.last
+        out = {"present": True, "state": tracker.state()}
+        if not tracker.is_nvidia():
+            self.last = out
+            return out
+        if not tracker.gate("nvml"):
+            self.release()
+            self._parked_until = 0.0  # woken by someone else next time: sample at once
+            self.last = out
+            return out
+        if time.monotonic() < self._parked_until:
+            self.last = out
+            return out
+
+        nvml = self._load()
+        if nvml:
+            try:
+                if not nvml.initialized:
+                    nvml.open()
+                    self.stats["sessions"] += 1
+                out.update(nvml.sample())
+                if self._power_limit is None:
+                    try:
+                        self._power_limit = nvml.power_limit_w()
+                    except NVMLError:
+                        self._power_limit = 0
+                if self._power_limit:
+                    out["power_limit_w"] = self._power_limit
+                self.stats["samples"] += 1
+                self._idle = self._idle + 1 if out["util"] == 0 else 0
+                if self._idle >= self.RELEASE_AFTER_IDLE:
+                    self._idle = 0
+                    self._parked_until = time.monotonic() + self.PARK_SECONDS
+                    self.release()
+            except NVMLError as e:
+                self.stats["errors"] += 1
+                logger.debug(f"dGPU: NVML sample failed: {e}")
+                self.release()
+        self.last = out
+        return out
+
+    def get_stats(self):
+        return dict(self.stats, nvml=self.nvml is not None,
+                    session=bool(self.nvml and self.nvml.initialized))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+HP Laptop Manager - telemetri geçmişi.
+Her örnek birkaç çözünürlükte sabit boyutlu halka tamponlara yazılır
+(varsayılan: 1 sn x 10 dk, 10 sn x 24 sa, 1 dk x 7 gün). Her kademe
+kendi adımındaki örneklerin ortalamasını tutar; bellek başta ayrılır ve
+bir daha büyümez.
+"""
+import array, math, re, threading, time
+
+NAN = float("nan")
+
+# (step seconds, slots)
+DEFAULT_TIERS = ((1, 600), (10, 8640), (60, 10080))
+
+# Flattened telemetry keys (telemetry_codec.flatten) that get a history
+HISTORY_KEYS = re.compile(
+    r"^(sys\.(cpu|gpu)_temp"
+    r"|fan\.fans\.\d+\.(current|target)"
+    r"|cpu\.usage|mem\.(used_pct|swap_pct)"
+    r"|dgpu\.(temp|util|power_w|clock_mhz)"
+    r"|psi\.\w+\.some|thermal\.cpu_power_w)$")
+
+
+class _Tier:
+    """
+    One resolution. Timestamps are shared by every metric of the tier
+    (array('d')); each metric is one array('f') column, NaN where it had
+    no samples in that slot. The slot being filled is averaged on the fly
+    and written when the first sample of the next slot arrives.
+    """
+
+    def __init__(self, step, capacity):
+        self.step = step
+        self.capacity = capacity
+        self.t = array.array("d", bytes(8 * capacity))
+        self.cols = {}
+        self.head = 0       # next slot to write
+        self.size = 0
+        self._slot = None   # slot number being accumulated
+        self._acc = {}      # metric -> [sum, count]
+
+    def add(self, now, values):
+        slot = int(now // self.step)
+        if self._slot is not None and slot != self._slot:
+            if slot < self._slot:
+                self.clear()  # wall clock stepped back: the ring must stay sorted
+            else:
+                self._flush()
+        self._slot = slot
+        acc = self._acc
+        for k, v in values.items():
+            a = acc.get(k)
+            if a is None:
+                acc[k] = [v, 1]
+            else:
+                a[0] += v
+                a[1] += 1
+
+    def _flush(self):
+        i = self.head
+        self.t[i] = self._slot * self.step
+        acc = self._acc
+        for k in acc.keys() - self.cols.keys():
+            self.cols[k] = array.array("f", [NAN]) * self.capacity
+        for k, col in self.cols.items():
+            a = acc.get(k)
+            col[i] = a[0] / a[1] if a else NAN
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self._acc = {}
+
+    def clear(self):
+        self.head = self.size = 0
+        self._slot = None
+        self._acc = {}
+
+    def _first_at_or_after(self, since):
+        """Logical index (0 = oldest) of the first slot with t >= since."""
+        lo, hi = 0, self.size
+        base = self.head - self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.t[(base + mid) % self.capacity] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(self, metric, since):
+        ts, vs = [], []
+        col = self.cols.get(metric)
+        if col is not None:
+            base, cap = self.head - self.size, self.capacity
+            for j in range(self._first_at_or_after(since), self.size):
+                i = (base + j) % cap
+                v = col[i]
+                if not math.isnan(v):
+                    ts.append(self.t[i])
+                    vs.append(round(v, 2))
+        a = self._acc.get(metric)
+        if a and self._slot * self.step >= since:
+            ts.append(float(self._slot * self.step))
+            vs.append(round(a[0] / a[1], 2))
+        return ts, vs
+
+    def oldest(self):
+        if not self.size:
+            return None
+        return self.t[(self.head - self.size) % self.capacity]
+
+
+class MetricHistory:
+    """Thread-safe: the telemetry sampler records, D-Bus handlers query."""
+
+    def __init__(self, tiers=DEFAULT_TIERS, lock=None):
+        self.tiers = [_Tier(step, cap) for step, cap in tiers]
+        self._lock = lock or threading.Lock()
+        self.stats = {"records": 0, "queries": 0}
+
+    def record(self, now, flat):
+        """flat: flattened telemetry snapshot; non-history and non-numeric keys are ignored."""
+        values = {k: float(v) for k, v in flat.items()
+                  if HISTORY_KEYS.match(k) and isinstance(v, (int, float)) and not isinstance(v, bool)}
+        if not values:
+            return
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(now, values)
+            self.stats["records"] += 1
+
+    def metrics(self):
+        with self._lock:
+            names = set()
+            for tier in self.tiers:
+                names.update(tier.cols)
+                names.update(tier._acc)
+        return sorted(names)
+
+    def _pick(self, since, resolution, now):
+        if resolution > 0:
+            # finest tier at least as coarse as asked for
+            return next((t for t in self.tiers if t.step >= resolution), self.tiers[-1])
+        # finest tier whose span reaches back to `since`
+        return next((t for t in self.tiers if now - t.step * t.capacity <= since), self.tiers[-1])
+
+    def query(self, metric, since=0.0, resolution=0.0):
+        """
+        Points of `metric` with t >= since. since < 0 means "the last -since
+        seconds". resolution > 0 picks the finest tier with step >= resolution;
+        0 picks the finest tier that reaches back to since.
+        """
+        now = time.time()
+        if since < 0:
+            since = now + since
+        with self._lock:
+            tier = self._pick(since, resolution, now)
+            ts, vs = tier.query(metric, since)
+            self.stats["queries"] += 1
+        return {"metric": metric, "resolution": tier.step, "t": ts, "v": vs}
+
+    def get_stats(self):
+        with self._lock:
+            tiers = [{"step": t.step, "slots": t.capacity, "used": t.size,
+                      "metrics": len(t.cols), "oldest": t.oldest()} for t in self.tiers]
+            nbytes = sum(t.t.itemsize * t.capacity
+                         + sum(c.itemsize * t.capacity for c in t.cols.values()) for t in self.tiers)
+        return dict(self.stats, tiers=tiers, bytes=nbytes)
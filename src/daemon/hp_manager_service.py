@@ -3,53 +3,291 @@
 HP Laptop Manager - D-Bus Daemon Service
 Root olarak çalışır, donanım erişimi sağlar.
 """
-import sys, os, time, threading, logging, json, copy, colorsys, math, shutil, subprocess, re, typing, glob, platform
+import sys, os, time, threading, logging, json, shutil, subprocess, re, typing, glob, platform, types, collections
+import abc
+import concurrent.futures
+
+# Shared with the GUI; installed next to this file, src/common in a checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import startup_trace
+
 from gi.repository import GLib
 from pydbus import SystemBus
+from pydbus.generic import signal
+from signal import SIGINT, SIGTERM
+
+from fancurve import FanCurveLUT
+from telemetry_codec import TELEMETRY_VERSION, flatten, to_variant
+from rgb_frames import MAX_FPS, FrameTable, lighting_params, table_key
+from uevent import UeventMonitor
+from procstat import ProcSampler
+from history import MetricHistory
+from telemetry_log import TelemetryLogWriter
+from thermal_events import ThermalEventDetector
+from gpu_telemetry import DGpuPowerTracker, GpuTelemetry
+startup_trace.mark("imports")
 
 # --- PATHS ---
-DRIVER_PATH_CUSTOM = "/sys/devices/platform/hp-rgb-lighting"
+# Overridable so the daemon can run against a fake tree (benchmarks/coldstart_bench.py)
+SYSFS_ROOT = os.environ.get("HP_MANAGER_SYSFS_ROOT", "/sys").rstrip("/")
+DRIVER_PATH_CUSTOM = f"{SYSFS_ROOT}/devices/platform/hp-rgb-lighting"
 CONFIG_FILE = "/etc/hp-manager/state.json"
+PROFILES_FILE = "/etc/hp-manager/profiles.json"
+TELEMETRY_LOG_DIR = "/var/lib/hp-manager/telemetry"
 
 # --- LOGLAMA ---
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("hp-manager")
 
-lock = threading.RLock()
 state_changed = threading.Event()
+# Called (from any thread) after state was modified; D-Bus service hooks in here
+state_listeners: typing.List[typing.Callable[[], None]] = []
 HEX_COLOR_RE = re.compile(r"^[0-9A-F]{6}$")
 VALID_LIGHT_MODES = {"static", "breathing", "cycle", "wave"}
 VALID_DIRECTIONS = {"ltr", "rtl"}
 VALID_GPU_MODES = {"hybrid", "discrete", "integrated"}
+# Answer of hardware methods while their controller is still being probed
+INITIALIZING = "initializing"
+
+
+# ============================================================
+# LOCK METRICS
+# ============================================================
+class InstrumentedLock:
+    """
+    threading.Lock/RLock sarmalayıcı: kaç kez alındığını, kaçının beklemeye
+    düştüğünü ve bekleme süresini (toplam/en uzun) sayar. Çekişmesiz yol
+    tek bir non-blocking acquire'dır.
+    """
+    registry: typing.List["InstrumentedLock"] = []
+
+    def __init__(self, name, reentrant=False):
+        self.name = name
+        self._lock = threading.RLock() if reentrant else threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        InstrumentedLock.registry.append(self)
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        t0 = time.perf_counter()
+        ok = self._lock.acquire(True, timeout)
+        if ok:
+            # Counters are only touched while holding the lock
+            waited = time.perf_counter() - t0
+            self.acquisitions += 1
+            self.contended += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return ok
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def get_stats(self):
+        return {
+            "acquisitions":  self.acquisitions,
+            "contended":     self.contended,
+            "wait_ms_total": round(self.wait_total * 1000, 3),
+            "wait_ms_max":   round(self.wait_max * 1000, 3),
+        }
+
+    @classmethod
+    def all_stats(cls):
+        return {lk.name: lk.get_stats() for lk in cls.registry}
+
+
+# ============================================================
+# SYSFS HANDLE CACHE
+# ============================================================
+class SysfsAttrCache:
+    """
+    Sysfs attribute'larını bir kez açar, sonra pread/pwrite ile offset 0'dan
+    tekrar okur/yazar. kernfs her offset-0 okumada show() çağırdığı için
+    değer her zaman tazedir; sadece path lookup + open/close maliyeti kalkar.
+    """
+    # Python open()+read()+close() on a sysfs file: openat, fstat, ioctl,
+    # lseek, read, read (EOF), close. A cached pread/pwrite is a single call.
+    SYSCALLS_PER_OPEN_ACCESS = 7
+
+    def __init__(self):
+        self._fds: typing.Dict[typing.Tuple[str, bool], int] = {}
+        self._lock = InstrumentedLock("sysfs_cache")
+        self.stats = {"opens": 0, "reopens": 0, "reads": 0, "writes": 0, "errors": 0}
+
+    def _fd(self, path, writable):
+        key = (path, writable)
+        fd = self._fds.get(key)
+        if fd is not None:
+            return fd
+        with self._lock:
+            fd = self._fds.get(key)
+            if fd is None:
+                fd = os.open(path, (os.O_RDWR if writable else os.O_RDONLY) | os.O_CLOEXEC)
+                self._fds[key] = fd
+                self.stats["opens"] += 1
+            return fd
+
+    def _drop(self, path, writable):
+        with self._lock:
+            fd = self._fds.pop((path, writable), None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _io(self, path, writable, op):
+        # One retry with a fresh fd: the attribute may have been recreated
+        # (module reload, hwmon re-registration after resume).
+        for attempt in (0, 1):
+            fd = self._fd(path, writable)
+            try:
+                return op(fd)
+            except OSError:
+                self._drop(path, writable)
+                if attempt:
+                    self.stats["errors"] += 1
+                    raise
+                self.stats["reopens"] += 1
+
+    def read(self, path):
+        data = self._io(path, False, lambda fd: os.pread(fd, 4096, 0))
+        self.stats["reads"] += 1
+        return data.decode(errors="replace").strip()
+
+    def write(self, path, value):
+        data = value if isinstance(value, bytes) else str(value).encode()
+        self._io(path, True, lambda fd: os.pwrite(fd, data, 0))
+        self.stats["writes"] += 1
+
+    def invalidate(self, prefix=None):
+        """Close cached handles (all, or those under prefix)."""
+        with self._lock:
+            keys = [k for k in self._fds if prefix is None or k[0].startswith(prefix)]
+            fds = [self._fds.pop(k) for k in keys]
+        for fd in fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def get_stats(self):
+        s = dict(self.stats)
+        accesses = s["reads"] + s["writes"]
+        s["open_handles"] = len(self._fds)
+        s["syscalls_uncached"] = accesses * self.SYSCALLS_PER_OPEN_ACCESS
+        s["syscalls_cached"] = accesses + (s["opens"] + s["reopens"]) * 2
+        s["syscalls_saved"] = max(0, s["syscalls_uncached"] - s["syscalls_cached"])
+        return s
+
+
+sysfs = SysfsAttrCache()
+
+
+# ============================================================
+# CONTROLLER PROBING
+# ============================================================
+class ProbedController(abc.ABC):
+    """
+    Kurucu ucuzdur; donanım yoklaması probe() içinde, açılışta bir thread
+    havuzunda yapılır. ready set olana kadar D-Bus metodları INITIALIZING döner.
+    """
+    name = "controller"
+
+    def __init__(self):
+        self.ready = threading.Event()
+
+    def probe(self, on_probed=None):
+        """
+        ready, on_probed(self) (kayıtlı ayarların geri yüklenmesi) bittikten
+        sonra set edilir; ready'yi gören kod yarım kalmış bir restore görmez.
+        """
+        try:
+            self._probe()
+        except Exception as e:
+            logger.error(f"{self.name} probe failed: {e}")
+        try:
+            if on_probed:
+                on_probed(self)
+        except Exception as e:
+            logger.error(f"{self.name} restore failed: {e}")
+        finally:
+            self.ready.set()
+
+    @abc.abstractmethod
+    def _probe(self):
+        """Donanımı yokla; probe() tarafından probe thread'inde çağrılır."""
 
 
 # ============================================================
 # FAN CONTROLLER
 # ============================================================
-class FanController:
+class FanController(ProbedController):
+    name = "fan"
+
     def __init__(self):
-        self.hwmon_path = self._find_hwmon()
+        super().__init__()
+        self.hwmon_path = None
         self.fan_count = 0
         self.found_fans = []
         self.max_speeds = {}
         self.mode = "auto"
+
+    def _probe(self):
+        self.hwmon_path = self._find_hwmon()
         if self.hwmon_path:
             self._detect_fans()
             self._read_max_speeds()
             self._read_current_mode()
 
+    def _rediscover(self):
+        """hwmon index değişti mi (resume sonrası)? Yolu ve fanları yeniden çöz."""
+        old = self.hwmon_path
+        if old:
+            sysfs.invalidate(old + "/")
+        new = self._find_hwmon()
+        if new == old and (not new or os.path.isdir(new)):
+            return False
+        self.hwmon_path = new
+        self.found_fans = []
+        self.fan_count = 0
+        self.max_speeds = {}
+        if new:
+            self._detect_fans()
+            self._read_max_speeds()
+            self._read_current_mode()
+        logger.info(f"HP hwmon re-resolved: {old} -> {new}")
+        return True
+
     def _find_hwmon(self):
-        for path in glob.glob("/sys/class/hwmon/hwmon*/name"):
+        for path in glob.glob(f"{SYSFS_ROOT}/class/hwmon/hwmon*/name"):
             try:
                 with open(path, 'r') as f:
                     if f.read().strip() == "hp":
-                        logger.info(f"Found HP hwmon at {os.path.dirname(path)}")
-                        return os.path.dirname(path)
+                        # Resolve the class symlink so cached handles go stale
+                        # (ENOENT) instead of silently following a renumbered hwmonN.
+                        hwmon = os.path.realpath(os.path.dirname(path))
+                        logger.info(f"Found HP hwmon at {hwmon}")
+                        return hwmon
             except Exception:
                 pass
 
         for platform_name in ("hp-wmi", "hp_wmi"):
-            platform_hwmon = f"/sys/devices/platform/{platform_name}/hwmon"
+            platform_hwmon = f"{SYSFS_ROOT}/devices/platform/{platform_name}/hwmon"
             if os.path.exists(platform_hwmon):
                 try:
                     entries = sorted(os.listdir(platform_hwmon))
@@ -81,8 +319,7 @@ class FanController:
         for i in self.found_fans:
             max_path = os.path.join(self.hwmon_path, f"fan{i}_max")
             try:
-                with open(max_path) as f:
-                    self.max_speeds[i] = int(f.read().strip())
+                self.max_speeds[i] = int(sysfs.read(max_path))
             except Exception:
                 self.max_speeds[i] = 6000
 
@@ -91,8 +328,7 @@ class FanController:
             return
         pwm_path = os.path.join(self.hwmon_path, "pwm1_enable")
         try:
-            with open(pwm_path) as f:
-                val = int(f.read().strip())
+            val = int(sysfs.read(pwm_path))
             self.mode = {0: "max", 1: "custom"}.get(val, "auto")
         except Exception:
             self.mode = "auto"
@@ -100,22 +336,31 @@ class FanController:
     def _sysfs_read(self, filename):
         if not self.hwmon_path:
             return 0
-        try:
-            with open(os.path.join(self.hwmon_path, filename)) as f:
-                return int(f.read().strip())
-        except Exception:
-            return 0
+        for attempt in (0, 1):
+            try:
+                return int(sysfs.read(os.path.join(self.hwmon_path, filename)))
+            except OSError:
+                if attempt or not self._rediscover():
+                    return 0
+            except Exception:
+                return 0
+        return 0
 
     def _sysfs_write(self, filename, value):
         if not self.hwmon_path:
             return False
-        try:
-            with open(os.path.join(self.hwmon_path, filename), "w") as f:
-                f.write(str(value))
-            return True
-        except Exception as e:
-            logger.error(f"sysfs write {filename}={value} error: {e}")
-            return False
+        for attempt in (0, 1):
+            try:
+                sysfs.write(os.path.join(self.hwmon_path, filename), value)
+                return True
+            except OSError as e:
+                if attempt or not self._rediscover():
+                    logger.error(f"sysfs write {filename}={value} error: {e}")
+                    return False
+            except Exception as e:
+                logger.error(f"sysfs write {filename}={value} error: {e}")
+                return False
+        return False
 
     def get_fan_count(self):
         return self.fan_count
@@ -162,11 +407,43 @@ class FanController:
 # ============================================================
 # RGB CONTROLLER
 # ============================================================
-class RGBController:
+class RGBController(ProbedController):
+    name = "rgb"
+
     def __init__(self):
+        super().__init__()
+        self.driver_path = None
+        self.available = False
+        self.last_written = [None] * 8
+        self.last_brightness = None
+        self.has_frame = False
+
+    def _probe(self):
         self.driver_path = self._find_rgb_path()
         self.available = self.driver_path is not None
+        # Newer module builds expose "frame": all 8 zones in a single write
+        # (one WMI GET+SET instead of one pair per zone).
+        self.has_frame = self.available and os.path.exists(f"{self.driver_path}/frame")
+        if self.has_frame:
+            logger.info("RGB: Batched frame attribute available")
+
+    def rediscover(self):
+        """Modül yüklendi/kaldırıldı: yolu yeniden çöz. Değiştiyse True."""
+        old = self.driver_path
+        if old:
+            sysfs.invalidate(old + "/")
+        new = self._find_rgb_path()
+        had_frame = self.has_frame
+        self.driver_path = new
+        self.available = new is not None
+        self.has_frame = self.available and os.path.exists(f"{new}/frame")
+        # Fresh module instance: its zones hold nothing we wrote
         self.last_written = [None] * 8
+        self.last_brightness = None
+        if new == old and self.has_frame == had_frame:
+            return False
+        logger.info(f"RGB re-resolved: {old} -> {new} (frame={self.has_frame})")
+        return True
 
     def _find_rgb_path(self):
         if os.path.exists(DRIVER_PATH_CUSTOM):
@@ -175,8 +452,8 @@ class RGBController:
         try:
             result = subprocess.run(["lsmod"], capture_output=True, text=True, timeout=5)
             if "hp_rgb_lighting" in result.stdout:
-                for candidate in ("/sys/devices/platform/hp-rgb-lighting",
-                                  "/sys/devices/platform/hp_rgb_lighting"):
+                for candidate in (f"{SYSFS_ROOT}/devices/platform/hp-rgb-lighting",
+                                  f"{SYSFS_ROOT}/devices/platform/hp_rgb_lighting"):
                     if os.path.exists(candidate):
                         logger.info(f"RGB: Found loaded module at {candidate}")
                         return candidate
@@ -194,24 +471,43 @@ class RGBController:
         if self.last_written[zone] == hex_color:
             return
         try:
-            with open(f"{self.driver_path}/zone{zone}", "w") as f:
-                f.write(hex_color)
-                f.flush()
+            sysfs.write(f"{self.driver_path}/zone{zone}", hex_color)
             self.last_written[zone] = hex_color
         except Exception:
             pass
 
-    def write_all(self, hex_list):
+    def write_all(self, hex_list, payload=None):
+        if self.has_frame:
+            self.write_frame(hex_list, payload)
+            return
         for i, hc in enumerate(hex_list[:8]):
             self.write_zone(i, hc)
 
-    def write_brightness(self, on):
+    def write_frame(self, hex_list, payload=None):
+        """payload: the pre-encoded " ".join(hex_list) from a FrameTable."""
         if not self.available:
             return
+        frame = list(hex_list[:8])
+        if frame == self.last_written[:len(frame)]:
+            return
+        try:
+            sysfs.write(f"{self.driver_path}/frame", payload or " ".join(frame))
+            self.last_written[:len(frame)] = frame
+        except FileNotFoundError:
+            # Module was swapped for an older build — fall back to per-zone files
+            logger.warning("RGB: frame attribute disappeared, using per-zone writes")
+            self.has_frame = False
+            for i, hc in enumerate(frame):
+                self.write_zone(i, hc)
+        except Exception:
+            pass
+
+    def write_brightness(self, on):
+        if not self.available or on == self.last_brightness:
+            return
         try:
-            with open(f"{self.driver_path}/brightness", "w") as f:
-                f.write("1" if on else "0")
-                f.flush()
+            sysfs.write(f"{self.driver_path}/brightness", "1" if on else "0")
+            self.last_brightness = on
         except Exception:
             pass
 
@@ -219,9 +515,7 @@ class RGBController:
         if not self.available:
             return
         try:
-            with open(f"{self.driver_path}/win_lock", "w") as f:
-                f.write("1" if locked else "0")
-                f.flush()
+            sysfs.write(f"{self.driver_path}/win_lock", "1" if locked else "0")
         except Exception:
             pass
 
@@ -229,18 +523,22 @@ class RGBController:
 # ============================================================
 # POWER PROFILE CONTROLLER
 # ============================================================
-class PowerProfileController:
+class PowerProfileController(ProbedController):
+    name = "power"
     PPD_BUS   = "net.hadess.PowerProfiles"
     PPD_PATH  = "/net/hadess/PowerProfiles"
     TUNED_BUS = "com.redhat.tuned"
     TUNED_PATH = "/Tuned"
 
     def __init__(self):
+        super().__init__()
         self.mode = "ppd"
         self.available = False
-        self.bus = SystemBus()
+        self.bus = None
         self.proxy = None
 
+    def _probe(self):
+        self.bus = SystemBus()
         try:
             self.proxy = self.bus.get(self.TUNED_BUS, self.TUNED_PATH)
             self.proxy.active_profile()
@@ -303,15 +601,60 @@ class PowerProfileController:
 # ============================================================
 # MUX CONTROLLER
 # ============================================================
-class MUXController:
+class MUXController(ProbedController):
+    """
+    Modu backend'in kendi durumundan okur (supergfxd D-Bus, prime-select
+    config dosyası, envycontrol'ün ürettiği dosyalar); sonuç önbellekte
+    tutulur ve yalnızca set_mode, NotifyGfx sinyali ya da dosya mtime
+    değişince yenilenir. Komut çalıştırmak sadece yedek yoldur.
+    """
+    name = "mux"
+    SUPERGFX_BUS  = "org.supergfxctl.Daemon"
+    SUPERGFX_PATH = "/org/supergfxctl/Gfx"
+    # supergfxd GfxMode enum, spelled the way "supergfxctl -g" prints it
+    SUPERGFX_MODES = ("hybrid", "integrated", "nvidianomodeset", "vfio",
+                      "asusegpu", "asusmuxdgpu", "none")
+    # Ubuntu/Debian nvidia-prime, then openSUSE suse-prime
+    PRIME_FILES = ("/etc/prime-discrete", "/etc/prime/current_type")
+    PRIME_MODES = {"on": "nvidia", "off": "intel", "on-demand": "on-demand",
+                   "nvidia": "nvidia", "intel": "intel", "offload": "on-demand"}
+    # The files "envycontrol --query" itself checks
+    ENVY_INTEGRATED = ("/etc/modprobe.d/blacklist-nvidia.conf", "/lib/udev/rules.d/50-remove-nvidia.rules")
+    ENVY_NVIDIA     = ("/etc/X11/xorg.conf", "/etc/modprobe.d/nvidia.conf")
+    FALLBACK_TTL = 10.0
+
     def __init__(self):
-        self.envycontrol  = shutil.which("envycontrol")
-        self.supergfxctl  = shutil.which("supergfxctl")
-        self.prime_select = shutil.which("prime-select")
+        super().__init__()
+        self.envycontrol  = None
+        self.supergfxctl  = None
+        self.prime_select = None
         self.backend: typing.Optional[str] = None
         self._cached_mode = "unknown"
+        self._cache_key = None     # state the cached mode was read from; None: not cached
         self._last_check = 0.0
+        self._gfx = None           # supergfxd proxy
+        self._gfx_generation = 0   # bumped by NotifyGfx
+        self._gfx_subscribed = False
+        self._reader_ok = False    # state reader agreed with the backend's own query at probe
+        self.stats = {"state_reads": 0, "forks": 0, "cache_hits": 0}
+
+    def _probe(self):
+        self.envycontrol  = shutil.which("envycontrol")
+        self.supergfxctl  = shutil.which("supergfxctl")
+        self.prime_select = shutil.which("prime-select")
         self._detect_backend()
+        if not self.backend:
+            return
+        if self.backend == "supergfxctl":
+            self._connect_supergfxd()
+        # Trust the reader only if it matches the backend's answer once
+        queried = self._query_subprocess()
+        read = self._read_state()
+        self._reader_ok = read is not None and read == queried
+        if not self._reader_ok:
+            logger.info(f"MUX: {self.backend} state not readable directly "
+                        f"(read={read}, query={queried}); using subprocess queries")
+        self._store(queried)
 
     def _detect_backend(self):
         if self.envycontrol:
@@ -321,17 +664,69 @@ class MUXController:
         elif self.prime_select:
             self.backend = "prime-select"
 
+    def _connect_supergfxd(self):
+        try:
+            self._gfx = SystemBus().get(self.SUPERGFX_BUS, self.SUPERGFX_PATH)
+        except Exception as e:
+            logger.info(f"MUX: supergfxd not reachable over D-Bus ({e})")
+            self._gfx = None
+            return
+        try:
+            self._gfx.NotifyGfx.connect(self._on_notify_gfx)
+            self._gfx_subscribed = True
+        except Exception:
+            self._gfx_subscribed = False
+
+    def _on_notify_gfx(self, *args):
+        self._gfx_generation += 1
+
     def is_available(self):
         return self.backend is not None
 
     def get_backend(self):
         return self.backend or "none"
 
-    def get_mode(self):
-        now = time.time()
-        if now - self._last_check < 10.0:
-            return self._cached_mode
+    # ── state readers ──
+    def _state_key(self):
+        """Cheap token that changes whenever the backend's state may have changed."""
+        if self.backend == "supergfxctl":
+            return ("gfx", self._gfx_generation) if self._gfx_subscribed else None
+        files = self.PRIME_FILES if self.backend == "prime-select" else self.ENVY_INTEGRATED + self.ENVY_NVIDIA
+        key = []
+        for path in files:
+            try:
+                key.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _read_state(self):
+        """Mode from the backend's own state, or None if it cannot be read."""
+        self.stats["state_reads"] += 1
+        try:
+            if self.backend == "supergfxctl":
+                if not self._gfx:
+                    return None
+                idx = int(self._gfx.Mode())
+                return self.SUPERGFX_MODES[idx] if 0 <= idx < len(self.SUPERGFX_MODES) else None
+            if self.backend == "prime-select":
+                for path in self.PRIME_FILES:
+                    if os.path.exists(path):
+                        with open(path) as f:
+                            return self.PRIME_MODES.get(f.read().strip().lower())
+                return None
+            if self.backend == "envycontrol":
+                if all(os.path.exists(p) for p in self.ENVY_INTEGRATED):
+                    return "integrated"
+                if all(os.path.exists(p) for p in self.ENVY_NVIDIA):
+                    return "nvidia"
+                return "hybrid"
+        except Exception:
+            return None
+        return None
 
+    def _query_subprocess(self):
+        self.stats["forks"] += 1
         mode = "unknown"
         try:
             if self.backend == "envycontrol" and self.envycontrol:
@@ -342,9 +737,40 @@ class MUXController:
                 mode = subprocess.check_output([self.prime_select, "query"], stderr=subprocess.STDOUT, timeout=5).decode().strip().lower()
         except Exception:
             pass
+        return mode
 
+    def _store(self, mode, key=None):
         self._cached_mode = mode
-        self._last_check = now
+        self._cache_key = key
+        self._last_check = time.time()
+
+    def invalidate(self):
+        self._cache_key = None
+        self._last_check = 0.0
+
+    def get_mode(self):
+        if not self.backend:
+            return "unknown"
+        if self._reader_ok:
+            key = self._state_key()
+            # key None (supergfxd without signals): fall back to the TTL below
+            if key is not None and key == self._cache_key:
+                self.stats["cache_hits"] += 1
+                return self._cached_mode
+            if key is not None or time.time() - self._last_check >= self.FALLBACK_TTL:
+                mode = self._read_state()
+                if mode is not None:
+                    self._store(mode, key)
+                    return mode
+            else:
+                self.stats["cache_hits"] += 1
+                return self._cached_mode
+
+        if time.time() - self._last_check < self.FALLBACK_TTL:
+            self.stats["cache_hits"] += 1
+            return self._cached_mode
+        mode = self._query_subprocess()
+        self._store(mode)
         return mode
 
     def set_mode(self, mode):
@@ -362,93 +788,512 @@ class MUXController:
                 return "OK"
         except Exception as e:
             return f"Error: {e}"
+        finally:
+            # The backend rewrote its state (or failed halfway): re-read on the next query
+            self.invalidate()
         return "No backend"
 
+    def get_stats(self):
+        return dict(self.stats, backend=self.get_backend(), reader=self._reader_ok)
+
 
 # ============================================================
 # ANIMATION ENGINE
 # ============================================================
 class AnimationEngine(threading.Thread):
-    FRAME_TIME = 0.05  # 20 fps
+    """
+    Olay güdümlü animasyon: periyodik modlar ayar değiştiğinde bir
+    FrameTable'a derlenir; her karede çıktının (8-bit kuantize renk) bir
+    sonraki değişeceği an tablodan okunur ve o ana kadar uyunur. Değişmeyen
+    kareler hiç yazılmaz; mod başına FPS sınırı vardır, parlaklık 0 ise
+    düşük frekanslı boşta moduna geçer.
+    """
+    MAX_FPS = MAX_FPS
+    TABLE_CACHE = 4       # compiled tables kept for quick switching back
+    IDLE_TIME = 5.0       # re-sync period while brightness is 0
+    RATE_WINDOW = 10.0    # seconds averaged by the wakeups/frames per second figures
 
     def __init__(self, rgb_ctrl):
         super().__init__(daemon=True)
         self.rgb = rgb_ctrl
         self.running = True
+        self.mode = "static"
+        self.idle = False
+        self.stats = {"wakeups": 0, "frames": 0, "skipped": 0, "compiles": 0, "compile_ms": 0.0,
+                      "activate_to_frame_ms": None}
+        self._wakeup_times = collections.deque(maxlen=1024)
+        self._frame_times = collections.deque(maxlen=1024)
+        self._mode_since = time.monotonic()
+        self._tables: typing.Dict[tuple, FrameTable] = {}
+        # Tables of saved profiles; replaced (never mutated) so the engine reads it lock-free
+        self._pinned: typing.Dict[tuple, FrameTable] = {}
+        self._activated_at = None
+
+    def pin(self, table, old_key=None):
+        pinned = dict(self._pinned)
+        if old_key is not None:
+            pinned.pop(old_key, None)
+        if table is not None:
+            pinned[table.key] = table
+        self._pinned = pinned
+
+    def mark_activation(self):
+        """Profile switch: the next frame write reports its latency."""
+        self._activated_at = time.perf_counter()
 
     def run(self):
         logger.info("Animation engine started")
         while self.running:
-            loop_start = time.time()
-            with lock:
-                pwr  = bool(state.get("power", True))
-                mode = str(state.get("mode", "static"))
-                bri  = float(state.get("brightness", 100)) / 100.0
-                spd  = float(state.get("speed", 50))
-                cols = [str(c) for c in state.get("colors", ["FF0000"] * 8)]
-                d    = str(state.get("direction", "ltr"))
+            self._count(self._wakeup_times, "wakeups")
+            state_changed.clear()  # before reading, so no update is missed
+            snap = state.snapshot()  # lock-free: one immutable version
+            pwr    = bool(snap.get("power", True))
+            mode   = str(snap.get("mode", "static"))
+            params = lighting_params(snap)
+
+            if mode != self.mode:
+                self.mode = mode
+                self._mode_since = time.monotonic()
 
             if not pwr:
+                self.idle = True
                 self.rgb.write_brightness(False)
-                self.rgb.write_all(["000000"] * 8)
-                state_changed.clear()
-                state_changed.wait() 
+                self._write(["000000"] * 8)
+                state_changed.wait()
                 continue
 
             self.rgb.write_brightness(True)
+
+            if mode == "static" or mode not in self.MAX_FPS:
+                self.idle = False
+                hexes, payload = self._table("static", params).frames[0]
+                self._write(hexes, payload)
+                state_changed.wait()
+                continue
+
+            if params[0] <= 0.0:
+                # Every animated frame is black: nothing to schedule
+                self.idle = True
+                self._write(["000000"] * 8)
+                state_changed.wait(self.IDLE_TIME)
+                continue
+
+            self.idle = False
+            table = self._table(mode, params)
             t = time.time()
-            targets = []
-
-            if mode == "static":
-                targets = [self._hex_to_rgb(c) for c in cols]
-                self.rgb.write_all([
-                    f"{int(r * bri):02X}{int(g * bri):02X}{int(b * bri):02X}"
-                    for r, g, b in targets
-                ])
-                state_changed.clear()
-                state_changed.wait() 
+            i = table.index(t)
+            hexes, payload = table.frames[i]
+            self._write(hexes, payload)
+            nxt = table.next_time(t, i)
+            if nxt is None:
+                state_changed.wait()
+            else:
+                delay = nxt - time.time()
+                if delay > 0:
+                    state_changed.wait(delay)
+
+    def _table(self, mode, params):
+        key = table_key(mode, params)
+        table = self._pinned.get(key)
+        if table is not None:
+            return table
+        table = self._tables.pop(key, None)
+        if table is None:
+            t0 = time.perf_counter()
+            table = FrameTable.compile(mode, params)
+            self.stats["compiles"] += 1
+            self.stats["compile_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            while len(self._tables) >= self.TABLE_CACHE:
+                self._tables.pop(next(iter(self._tables)))
+        self._tables[key] = table  # most recently used last
+        return table
+
+    def _write(self, frame, payload=None):
+        if frame == self.rgb.last_written:
+            self.stats["skipped"] += 1
+        else:
+            self.rgb.write_all(frame, payload)
+            self._count(self._frame_times, "frames")
+        if self._activated_at is not None:
+            self.stats["activate_to_frame_ms"] = round((time.perf_counter() - self._activated_at) * 1000, 3)
+            self._activated_at = None
+
+    def _count(self, times, key):
+        self.stats[key] += 1
+        times.append(time.monotonic())
+
+    def _rate(self, times):
+        now = time.monotonic()
+        window = min(self.RATE_WINDOW, max(now - self._mode_since, 1.0))
+        return round(sum(1 for x in times if x > now - window) / window, 2)
+
+    def get_stats(self):
+        return {
+            "mode":             self.mode,
+            "idle":             self.idle,
+            "fps_cap":          self.MAX_FPS.get(self.mode, 0),
+            "wakeups_per_sec":  self._rate(self._wakeup_times),
+            "frames_per_sec":   self._rate(self._frame_times),
+            **self.stats,
+        }
+
+
+# ============================================================
+# TELEMETRY SAMPLER
+# ============================================================
+# Flattened keys that move on almost every sample of an idle machine. A
+# change smaller than the band (from the last published value) neither
+# bumps seq nor emits TelemetryUpdated; GetHistory keeps every sample.
+TELEMETRY_DEADBANDS = (
+    (re.compile(r"^cpu\.(usage|cores)$"), 5.0),
+    (re.compile(r"^mem\.(used_pct|swap_pct)$"), 1.0),
+    (re.compile(r"^mem\.(available_kb|swap_used_kb)$"), 65536),
+    (re.compile(r"^psi\.\w+\.(some|full)$"), 1.0),
+    (re.compile(r"^(thermal\.cpu_power_w|dgpu\.power_w)$"), 2.0),
+)
+
+
+def _moved(old, new, band):
+    """Has a deadbanded value (number or list of numbers) moved by at least band?"""
+    if isinstance(new, (int, float)) and isinstance(old, (int, float)):
+        return abs(new - old) >= band
+    if isinstance(new, list) and isinstance(old, list) and len(new) == len(old):
+        return any(_moved(o, n, band) for o, n in zip(old, new))
+    return True
+
+
+class TelemetrySampler(threading.Thread):
+    """
+    Tek örnekleyici thread: sıcaklık, fan, güç profili, GPU modu ve
+    /proc kullanım değerlerini (CPU, bellek, PSI) sabit aralıkla okur ve
+    değişmez bir snapshot yayınlar. GetTelemetry sadece hazır JSON'u
+    döndürür — istek yolunda I/O ya da encode yok, N istemcinin maliyeti
+    tek örnekleme kadar. Gürültülü alanlar (TELEMETRY_DEADBANDS) eşik
+    aşılmadıkça yeni yayın tetiklemez.
+    """
+    MIN_INTERVAL = 0.5
+    MAX_INTERVAL = 30.0
+
+    def __init__(self, service, interval=2.0, on_update=None, usage_smoothing=0.3):
+        super().__init__(daemon=True)
+        self.service = service
+        self.proc = ProcSampler(usage_smoothing)
+        self.history = MetricHistory(lock=InstrumentedLock("history"))
+        self.log: typing.Optional[TelemetryLogWriter] = None  # on-disk log, set by startup()
+        self.thermal = ThermalEventDetector(SYSFS_ROOT, reader=sysfs.read,
+                                            lock=InstrumentedLock("thermal_events"))
+        self.interval = max(self.MIN_INTERVAL, min(float(interval), self.MAX_INTERVAL))
+        self.on_update = on_update  # called with the new JSON when values changed
+        self.running = True
+        self.seq = 0
+        self._wake = threading.Event()
+        # (frozen snapshot, pre-encoded JSON) — swapped as one reference
+        self._current = (types.MappingProxyType({}), "{}")
+        # Delta view for GetTelemetryDelta, swapped the same way:
+        # (flat values, {key: (seq, GLib.Variant)}, {removed key: seq})
+        self._delta = ({}, {}, {})
+        self._bands = {}  # flat key -> deadband (0: exact comparison)
+        self.stats = {"samples": 0, "published": 0}
+
+    def run(self):
+        logger.info(f"Telemetry sampler started ({self.interval:.1f}s interval)")
+        while self.running:
+            try:
+                snap = self._sample()
+                flat = flatten(snap)
+                now = time.time()
+                self.history.record(now, flat)
+                if self.log:
+                    self.log.append(now, flat)
+                self._publish(snap, flat)
+            except Exception as e:
+                logger.error(f"Telemetry sample error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def request_sample(self):
+        """Setter'lar sonrası bir sonraki aralığı beklemeden yeniden örnekle."""
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    def _sample(self):
+        svc = self.service
+        dgpu = svc.gpu_telemetry.sample()  # first, so gpu_temp below is current
+        sys_info = dict(svc._static_info)
+        sys_info["cpu_temp"] = svc._get_cached_cpu_temp()
+        sys_info["gpu_temp"] = svc._get_cached_gpu_temp()
+        snap = {
+            "interval": self.interval,
+            "sys": sys_info,
+            "fan": svc._read_fan_info(),
+            "pp":  svc._read_power_profile(),
+            "gpu": svc._read_gpu_info(),
+            "dgpu": dgpu,
+        }
+        snap.update(self.proc.sample())  # cpu / mem / psi
+        snap["thermal"] = self.thermal.update(time.time(), snap)
+        return snap
+
+    def _band(self, key):
+        band = self._bands.get(key)
+        if band is None:
+            band = self._bands[key] = next((b for rx, b in TELEMETRY_DEADBANDS if rx.match(key)), 0)
+        return band
+
+    def _changed(self, flat):
+        old = self._delta[0]
+        if flat.keys() != old.keys():
+            return True
+        for k, v in flat.items():
+            o = old[k]
+            if v == o and type(v) is type(o):
                 continue
-                
-            elif mode == "breathing":
-                period = 8.0 - (spd * 0.06)
-                phase  = 0.1 + 0.9 * ((math.sin(2 * math.pi * t / period) + 1) / 2)
-                base   = self._hex_to_rgb(cols[0])
-                targets = [(int(base[0] * phase), int(base[1] * phase), int(base[2] * phase))] * 8
-            elif mode == "cycle":
-                hue = (t * (spd * 0.003)) % 1.0
-                r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                targets = [(int(r * 255), int(g * 255), int(b * 255))] * 8
-            elif mode == "wave":
-                for i in range(8):
-                    offset = (i * 0.15) if d == "ltr" else ((7 - i) * 0.15)
-                    r, g, b = colorsys.hsv_to_rgb((t * spd * 0.007 + offset) % 1.0, 1.0, 1.0)
-                    targets.append((int(r * 255), int(g * 255), int(b * 255)))
-
-            self.rgb.write_all([
-                f"{int(r * bri):02X}{int(g * bri):02X}{int(b * bri):02X}"
-                for r, g, b in targets
-            ])
-
-            sleep_time = max(self.FRAME_TIME - (time.time() - loop_start), 0.001)
-            if state_changed.wait(timeout=sleep_time):
-                state_changed.clear()
-
-    def _hex_to_rgb(self, h):
-        h = str(h).lstrip("#")
-        if not h or len(h) < 6:
-            logger.warning(f"Invalid hex color: '{h}', falling back to red")
-            return (255, 0, 0)
-        try:
-            return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
-        except ValueError as e:
-            logger.error(f"Hex conversion error for '{h}': {e}")
-            return (255, 0, 0)
+            band = self._band(k)
+            if not band or _moved(o, v, band):
+                return True
+        return False
+
+    def _publish(self, snap, flat):
+        # Aynı (ya da eşik altında kalan) değerler yayınlanmaz: seq artmaz, sinyal gitmez
+        self.stats["samples"] += 1
+        if self.seq and not self._changed(flat):
+            return
+        self.stats["published"] += 1
+        self.seq += 1
+        self._delta = self._build_delta(flat, self.seq)
+        snap["seq"] = self.seq
+        snap["timestamp"] = time.time()
+        self._current = (types.MappingProxyType(snap), json.dumps(snap))
+        if self.on_update:
+            self.on_update(self._current[1])
+
+    def _build_delta(self, flat, seq):
+        # Variants are built once per changed key here, not per request
+        old_flat, old_fields, old_removed = self._delta
+        fields = {}
+        for k, v in flat.items():
+            prev = old_fields.get(k)
+            if prev is not None and old_flat.get(k) == v and type(old_flat[k]) is type(v):
+                fields[k] = prev
+            else:
+                fields[k] = (seq, to_variant(v))
+        removed = {k: s for k, s in old_removed.items() if k not in flat}
+        for k in old_flat:
+            if k not in flat:
+                removed[k] = seq
+        return (flat, fields, removed)
+
+    def delta_since(self, since):
+        """(seq, timestamp, {key: Variant} changed after since, [removed keys])."""
+        snap = self._current[0]
+        _, fields, removed = self._delta
+        seq = snap.get("seq", 0)
+        if since > seq:
+            since = 0  # client saw a previous daemon instance
+        changed = {k: v for k, (s, v) in fields.items() if s > since}
+        gone = [k for k, s in removed.items() if s > since] if since else []
+        return seq, snap.get("timestamp", 0.0), changed, gone
+
+    def snapshot(self):
+        return self._current[0]
+
+    def snapshot_json(self):
+        return self._current[1]
+
+    def has_data(self):
+        return self.seq > 0
+
+
+# ============================================================
+# FAN CURVE CONTROLLER
+# ============================================================
+DEFAULT_FAN_CURVE = [(48.0, 0.0), (58.0, 35.0), (70.0, 60.0), (78.0, 72.0), (85.0, 100.0)]
+
+
+def validate_fan_curve(points):
+    """2-16 nokta, sıcaklık artan (0-110 °C), fan 0-100 %. Geçersizse None."""
+    try:
+        pts = [(float(t), float(f)) for t, f in points]
+    except (TypeError, ValueError):
+        return None
+    if not (2 <= len(pts) <= 16):
+        return None
+    for i, (t, f) in enumerate(pts):
+        if not (0.0 <= t <= 110.0 and 0.0 <= f <= 100.0):
+            return None
+        if i and t <= pts[i - 1][0]:
+            return None
+    return pts
+
+
+class FanCurveController(threading.Thread):
+    """
+    Özel fan modu için daemon içi kontrol döngüsü. GUI açık olmasa da
+    çalışır: her periyotta CPU sıcaklığını okur, EMA ile yumuşatır,
+    eğriden % hesaplar ve histerezis eşiğini aşan hedefleri doğrudan
+    FanController.set_fan_target ile yazar. Pasifken hiç uyanmaz.
+    """
+
+    def __init__(self, temp_reader, points=None, period=1.0, smoothing=0.3, hysteresis=300):
+        super().__init__(daemon=True)
+        self.temp_reader = temp_reader
+        self.points = list(points or DEFAULT_FAN_CURVE)
+        self.lut = FanCurveLUT(self.points)
+        self.period = period          # seconds between samples
+        self.smoothing = smoothing    # EMA alpha (1.0 = no smoothing)
+        self.hysteresis = hysteresis  # minimum RPM change before rewriting
+        self.active = False
+        self.running = True
+        self._wake = threading.Event()
+        self._smoothed: typing.Optional[float] = None
+        self._last_rpm: typing.Dict[int, int] = {}
+
+    def configure(self, points=None, period=None, smoothing=None, hysteresis=None):
+        if points is not None:
+            self.points = list(points)
+            self.lut.rebuild(self.points)
+        if period is not None:
+            self.period = max(0.25, min(float(period), 10.0))
+        if smoothing is not None:
+            self.smoothing = max(0.05, min(float(smoothing), 1.0))
+        if hysteresis is not None:
+            self.hysteresis = max(0, min(int(hysteresis), 2000))
+        # Yeni eğri hemen uygulansın
+        self._last_rpm = {}
+        self._wake.set()
+
+    def set_active(self, active):
+        self.active = bool(active)
+        self._smoothed = None
+        self._last_rpm = {}
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    def run(self):
+        logger.info("Fan curve controller started")
+        while self.running:
+            if not self.active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            try:
+                self._step()
+            except Exception as e:
+                logger.error(f"Fan curve step error: {e}")
+            self._wake.wait(self.period)
+            self._wake.clear()
+
+    def _step(self):
+        temp = self.temp_reader()
+        if not temp:
+            return
+        if self._smoothed is None:
+            self._smoothed = temp
+        else:
+            self._smoothed += self.smoothing * (temp - self._smoothed)
+        pct = self.lut.lookup(self._smoothed)
+        for fan in fan_ctrl.found_fans:
+            rpm = int(fan_ctrl.get_max_speed(fan) * pct / 100)
+            last = self._last_rpm.get(fan)
+            if last is not None and abs(rpm - last) < self.hysteresis:
+                continue
+            if fan_ctrl.set_fan_target(fan, rpm):
+                self._last_rpm[fan] = rpm
+
+    def describe(self):
+        return {
+            "points":     [list(p) for p in self.points],
+            "period":     self.period,
+            "smoothing":  self.smoothing,
+            "hysteresis": self.hysteresis,
+            "active":     self.active,
+            "smoothed_temp": self._smoothed,
+        }
 
 
 # ============================================================
 # STATE
 # ============================================================
-state: typing.Dict[str, typing.Any] = {
+def freeze(value):
+    """dict/list ağacını MappingProxyType/tuple'a çevirir (salt okunur)."""
+    if isinstance(value, (dict, types.MappingProxyType)):
+        return types.MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """freeze() tersi: düz dict/list (JSON ve düzenleme için)."""
+    if isinstance(value, (dict, types.MappingProxyType)):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+class StateSnapshot:
+    """Tek bir state sürümü: değişmez veri + yayın anında encode edilmiş JSON."""
+    __slots__ = ("version", "data", "json")
+
+    def __init__(self, version, data):
+        self.version = version
+        self.data = freeze(data)
+        self.json = json.dumps(thaw(self.data))
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+
+class StateStore:
+    """
+    Sürümlü, değişmez state. Okuyucular (animasyon thread'i, GetState)
+    snapshot() ile o anki referansı kilitsiz alır; yazıcılar update() ile
+    yeni bir sürüm üretip tek atamayla yayınlar. Yazıcılar yalnızca
+    birbirleriyle sıralanır.
+    """
+
+    def __init__(self, initial):
+        self._lock = InstrumentedLock("state_write")
+        self._current = StateSnapshot(0, initial)
+
+    def snapshot(self) -> StateSnapshot:
+        return self._current
+
+    def __getitem__(self, key):
+        return self._current[key]
+
+    def get(self, key, default=None):
+        return self._current.get(key, default)
+
+    def update(self, fn=None, **changes):
+        """
+        Yeni sürüm yayınlar. fn verilirse mevcut state'in düz bir kopyasını
+        alır ve yerinde değiştirir; False döndürürse hiçbir şey yayınlanmaz.
+        """
+        with self._lock:
+            cur = self._current
+            if fn is not None:
+                data = thaw(cur.data)
+                if fn(data) is False:
+                    return cur
+            else:
+                data = dict(cur.data)
+            data.update(changes)
+            self._current = StateSnapshot(cur.version + 1, data)
+            return self._current
+
+
+state = StateStore({
     "mode":          "static",
     "colors":        ["FF0000"] * 8,
     "speed":         50,
@@ -460,7 +1305,18 @@ state: typing.Dict[str, typing.Any] = {
     "win_lock":      False,
     "prtsc_fix":     False,
     "f1_fix":        False,
-}
+    "telemetry_interval": 2.0,
+    "usage_smoothing": 0.3,
+    "telemetry_log": True,
+    "telemetry_log_mb": 64,
+    "persist_interval": 2.0,
+    "fan_curve": {
+        "points":     [list(p) for p in DEFAULT_FAN_CURVE],
+        "period":     1.0,
+        "smoothing":  0.3,
+        "hysteresis": 300,
+    },
+})
 
 ALLOWED_PACKAGES = {
     "steam":       "com.valvesoftware.Steam",
@@ -470,89 +1326,478 @@ ALLOWED_PACKAGES = {
     "mangohud":    "org.freedesktop.Platform.VulkanLayer.MangoHud",
 }
 
+# Cheap until probe_controllers() runs their probes in parallel
 fan_ctrl   = FanController()
 rgb_ctrl   = RGBController()
 power_ctrl = PowerProfileController()
 mux_ctrl   = MUXController()
+CONTROLLERS = (fan_ctrl, rgb_ctrl, power_ctrl, mux_ctrl)
 engine     = AnimationEngine(rgb_ctrl)
+curve_ctrl = FanCurveController(temp_reader=lambda: 0.0)
+
+
+class StateWriter(threading.Thread):
+    """
+    Arka plan kalıcılık yazıcısı. Setter'lar sadece kirli işareti koyar;
+    ardışık değişiklikler birleştirilir ve state.json en fazla `interval`
+    saniyede bir (ve kapanışta) yazılır. Diske yazılmış sürüm tekrar yazılmaz.
+    """
+    MIN_INTERVAL = 0.1
+    MAX_INTERVAL = 60.0
+
+    def __init__(self, path, interval=2.0):
+        super().__init__(daemon=True)
+        self.path = path
+        self.interval = interval
+        self.running = True
+        self.saved_version = None
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._lock = InstrumentedLock("state_persist")
+        self._last_write = 0.0
+        self.stats = {"requests": 0, "writes": 0, "errors": 0, "last_write_ms": 0.0}
+
+    def mark_dirty(self):
+        self.stats["requests"] += 1
+        self._dirty.set()
+
+    def run(self):
+        logger.info(f"State writer started ({self.interval:.1f}s coalescing window)")
+        while self.running:
+            self._dirty.wait()
+            # Let further changes pile up until the window since the last write is over
+            delay = self._last_write + self.interval - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            self._dirty.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            snapshot = state.snapshot()
+            if snapshot.version == self.saved_version:
+                return
+            t0 = time.perf_counter()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_file = f"{self.path}.tmp"
+                with open(temp_file, "w") as f:
+                    f.write(snapshot.json)
+                os.replace(temp_file, self.path)
+                self.saved_version = snapshot.version
+                self.stats["writes"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"State save error: {e}")
+            self._last_write = time.monotonic()
+            self.stats["last_write_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+
+    def stop(self):
+        """Kapanış: bekleyen değişiklikleri hemen yaz."""
+        self.running = False
+        self._stop.set()
+        self._dirty.set()
+        self.flush()
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            "coalesced":     max(0, self.stats["requests"] - self.stats["writes"]),
+            "interval":      self.interval,
+            "saved_version": self.saved_version,
+            "pending":       self._dirty.is_set(),
+        }
+
+
+state_writer = StateWriter(CONFIG_FILE)
 
 
 def save_state():
-    with lock:
+    """Değişikliği hemen yayınla; disk yazımı StateWriter'da birleştirilir."""
+    notify_state_changed()
+    state_writer.mark_dirty()
+
+
+def notify_state_changed():
+    state_changed.set()
+    for cb in state_listeners:
         try:
-            snapshot = copy.deepcopy(state)
+            cb()
         except Exception as e:
-            logger.error(f"State snapshot error: {e}")
-            return
+            logger.error(f"State listener error: {e}")
+
+
+def load_state():
     try:
-        os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-        temp_file = f"{CONFIG_FILE}.tmp"
-        with open(temp_file, "w") as f:
-            json.dump(snapshot, f)
-        os.replace(temp_file, CONFIG_FILE)
+        if not os.path.exists(CONFIG_FILE):
+            return
+        with open(CONFIG_FILE) as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            return
+        state.update(lambda st: _merge_loaded_state(st, loaded))
     except Exception as e:
-        logger.error(f"State save error: {e}")
-    finally:
-        state_changed.set()
+        logger.error(f"State load error: {e}")
 
 
-def load_state():
-    with lock:
+def parse_lighting(opts, current):
+    """
+    SetLighting sözlüğünü doğrular ve state değişikliklerine çevirir.
+    Anahtarlar: mode, speed, brightness, direction, power, colors (1-8 hex,
+    eksikler mevcut renklerle dolar), color (+ isteğe bağlı zone; zone
+    yoksa ya da 8 ise tüm bölgeler). Geçersiz girdide None döner.
+    """
+    allowed = {"mode", "speed", "brightness", "direction", "power", "colors", "color", "zone"}
+    if not isinstance(opts, dict) or not set(opts) <= allowed:
+        return None
+    changes = {}
+    try:
+        if "mode" in opts:
+            if opts["mode"] not in VALID_LIGHT_MODES:
+                return None
+            changes["mode"] = opts["mode"]
+        if "direction" in opts:
+            if opts["direction"] not in VALID_DIRECTIONS:
+                return None
+            changes["direction"] = opts["direction"]
+        if "speed" in opts:
+            changes["speed"] = max(1, min(int(opts["speed"]), 100))
+        if "brightness" in opts:
+            changes["brightness"] = max(0, min(int(opts["brightness"]), 100))
+        if "power" in opts:
+            changes["power"] = bool(opts["power"])
+
+        colors = list(current["colors"])
+        if "colors" in opts:
+            given = [str(c).lstrip("#").upper() for c in opts["colors"]]
+            if not 1 <= len(given) <= 8 or not all(HEX_COLOR_RE.match(c) for c in given):
+                return None
+            colors[:len(given)] = given
+            changes["colors"] = colors
+        if "color" in opts:
+            c = str(opts["color"]).lstrip("#").upper()
+            z = int(opts.get("zone", 8))
+            if not HEX_COLOR_RE.match(c) or not 0 <= z <= 8:
+                return None
+            if z == 8:
+                colors = [c] * 8
+            else:
+                colors[z] = c
+            changes["colors"] = colors
+        elif "zone" in opts:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return changes
+
+
+def _merge_loaded_state(st, loaded):
+    """Validate each key of a loaded state.json into the (mutable) state copy."""
+    if loaded.get("mode") in VALID_LIGHT_MODES:
+        st["mode"] = loaded["mode"]
+
+    colors = loaded.get("colors")
+    if isinstance(colors, list):
+        cleaned: typing.List[str] = []
+        for i, c in enumerate(colors):
+            if i >= 8:
+                break
+            c_str = str(c).lstrip("#").upper()
+            if HEX_COLOR_RE.match(c_str):
+                cleaned.append(c_str)
+        if cleaned:
+            c0 = cleaned[0]
+            st["colors"] = (cleaned + [c0] * 8)[:8]
+
+    speed = loaded.get("speed")
+    if isinstance(speed, int):
+        st["speed"] = max(1, min(speed, 100))
+
+    brightness = loaded.get("brightness")
+    if isinstance(brightness, int):
+        st["brightness"] = max(0, min(brightness, 100))
+
+    if loaded.get("direction") in VALID_DIRECTIONS:
+        st["direction"] = loaded["direction"]
+
+    if isinstance(loaded.get("power"), bool):
+        st["power"] = loaded["power"]
+
+    fm = loaded.get("fan_mode")
+    if fm in ("auto", "max", "custom"):
+        st["fan_mode"] = fm
+
+    pp = loaded.get("power_profile")
+    if isinstance(pp, str) and pp in ("power-saver", "balanced", "performance"):
+        st["power_profile"] = pp
+
+    if isinstance(loaded.get("prtsc_fix"), bool):
+        st["prtsc_fix"] = loaded["prtsc_fix"]
+    if isinstance(loaded.get("f1_fix"), bool):
+        st["f1_fix"] = loaded["f1_fix"]
+    if isinstance(loaded.get("win_lock"), bool):
+        st["win_lock"] = loaded["win_lock"]
+
+    fc = loaded.get("fan_curve")
+    if isinstance(fc, dict):
+        pts = validate_fan_curve(fc.get("points", []))
+        if pts:
+            st["fan_curve"]["points"] = [list(p) for p in pts]
+        for key, lo, hi in (("period", 0.25, 10.0), ("smoothing", 0.05, 1.0), ("hysteresis", 0, 2000)):
+            v = fc.get(key)
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                st["fan_curve"][key] = type(st["fan_curve"][key])(max(lo, min(v, hi)))
+
+    pi = loaded.get("persist_interval")
+    if isinstance(pi, (int, float)) and not isinstance(pi, bool):
+        st["persist_interval"] = max(StateWriter.MIN_INTERVAL,
+                                     min(float(pi), StateWriter.MAX_INTERVAL))
+
+    ti = loaded.get("telemetry_interval")
+    if isinstance(ti, (int, float)) and not isinstance(ti, bool):
+        st["telemetry_interval"] = max(TelemetrySampler.MIN_INTERVAL,
+                                          min(float(ti), TelemetrySampler.MAX_INTERVAL))
+
+    if isinstance(loaded.get("telemetry_log"), bool):
+        st["telemetry_log"] = loaded["telemetry_log"]
+    lm = loaded.get("telemetry_log_mb")
+    if isinstance(lm, int) and not isinstance(lm, bool):
+        st["telemetry_log_mb"] = max(4, min(lm, 4096))
+
+    us = loaded.get("usage_smoothing")
+    if isinstance(us, (int, float)) and not isinstance(us, bool):
+        st["usage_smoothing"] = max(0.05, min(float(us), 1.0))
+
+
+# ============================================================
+# LIGHTING PROFILES
+# ============================================================
+LIGHTING_KEYS = ("mode", "colors", "speed", "brightness", "direction", "power")
+PROFILE_NAME_RE = re.compile(r"^[\w .+-]{1,32}$")
+MAX_PROFILES = 32
+
+
+class LightingProfile:
+    """Doğrulanmış ve derlenmiş profil: ayarlar + hazır kare tablosu."""
+    __slots__ = ("name", "settings", "table")
+
+    def __init__(self, name, settings):
+        self.name = name
+        self.settings = settings
+        self.table = None
+        if settings["power"]:
+            mode = settings["mode"] if settings["mode"] in MAX_FPS else "static"
+            self.table = FrameTable.compile(mode, lighting_params(settings))
+
+
+class ProfileLibrary:
+    """
+    İsimli aydınlatma profilleri. Kaydederken doğrulanır ve FrameTable'a
+    derlenir; etkinleştirme bir state sürümü yayınlamak (referans
+    değişimi) ve motorun hazır tablodan ilk kareyi yazmasından ibarettir.
+    Disk üzerinde state.json yanında tek, sıkıştırılmış bir JSON indeks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._profiles: typing.Dict[str, LightingProfile] = {}
+        self._lock = InstrumentedLock("profiles")
+
+    def load(self):
         try:
-            if not os.path.exists(CONFIG_FILE):
-                return
-            with open(CONFIG_FILE) as f:
-                loaded = json.load(f)
-            if not isinstance(loaded, dict):
+            if not os.path.exists(self.path):
                 return
+            with open(self.path) as f:
+                index = json.load(f)
+            defaults = {k: thaw(state[k]) for k in LIGHTING_KEYS}
+            for name, opts in list(index.items())[:MAX_PROFILES]:
+                changes = parse_lighting(opts, defaults) if isinstance(opts, dict) else None
+                if not PROFILE_NAME_RE.match(str(name)) or changes is None:
+                    logger.warning(f"Skipping invalid lighting profile '{name}'")
+                    continue
+                self._add(LightingProfile(name, {**defaults, **changes}))
+            logger.info(f"Loaded {len(self._profiles)} lighting profiles")
+        except Exception as e:
+            logger.error(f"Profile load error: {e}")
+
+    def _add(self, profile):
+        old = self._profiles.get(profile.name)
+        old_key = old.table.key if old and old.table else None
+        profile_map = dict(self._profiles)
+        profile_map[profile.name] = profile
+        self._profiles = profile_map
+        if old_key is not None and not any(
+                p.table and p.table.key == old_key for p in profile_map.values()):
+            engine.pin(None, old_key)
+        if profile.table is not None:
+            engine.pin(profile.table)
+
+    def _write(self):
+        index = {name: p.settings for name, p in self._profiles.items()}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_file = f"{self.path}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_file, self.path)
+
+    def names(self):
+        return sorted(self._profiles)
+
+    def describe(self):
+        return [{"name": n, **self._profiles[n].settings} for n in self.names()]
+
+    def save(self, name, opts):
+        """Current lighting state, overridden by opts. Returns an error string or None."""
+        if not PROFILE_NAME_RE.match(name):
+            return "Error: invalid_name"
+        snap = state.snapshot()
+        changes = parse_lighting(opts, snap)
+        if changes is None:
+            return "Error: invalid_settings"
+        settings = {k: thaw(snap[k]) for k in LIGHTING_KEYS}
+        settings.update(changes)
+        with self._lock:
+            if name not in self._profiles and len(self._profiles) >= MAX_PROFILES:
+                return "Error: too_many_profiles"
+            self._add(LightingProfile(name, settings))
+            try:
+                self._write()
+            except Exception as e:
+                logger.error(f"Profile save error: {e}")
+                return "Error: write_failed"
+        return None
 
-            if loaded.get("mode") in VALID_LIGHT_MODES:
-                state["mode"] = loaded["mode"]
-
-            colors = loaded.get("colors")
-            if isinstance(colors, list):
-                cleaned: typing.List[str] = []
-                for i, c in enumerate(colors):
-                    if i >= 8:
-                        break
-                    c_str = str(c).lstrip("#").upper()
-                    if HEX_COLOR_RE.match(c_str):
-                        cleaned.append(c_str)
-                if cleaned:
-                    c0 = cleaned[0]
-                    state["colors"] = (cleaned + [c0] * 8)[:8]
-
-            speed = loaded.get("speed")
-            if isinstance(speed, int):
-                state["speed"] = max(1, min(speed, 100))
-
-            brightness = loaded.get("brightness")
-            if isinstance(brightness, int):
-                state["brightness"] = max(0, min(brightness, 100))
-
-            if loaded.get("direction") in VALID_DIRECTIONS:
-                state["direction"] = loaded["direction"]
-
-            if isinstance(loaded.get("power"), bool):
-                state["power"] = loaded["power"]
-
-            fm = loaded.get("fan_mode")
-            if fm in ("auto", "max", "custom"):
-                state["fan_mode"] = fm
-
-            pp = loaded.get("power_profile")
-            if isinstance(pp, str) and pp in ("power-saver", "balanced", "performance"):
-                state["power_profile"] = pp
-
-            if isinstance(loaded.get("prtsc_fix"), bool):
-                state["prtsc_fix"] = loaded["prtsc_fix"]
-            if isinstance(loaded.get("f1_fix"), bool):
-                state["f1_fix"] = loaded["f1_fix"]
-            if isinstance(loaded.get("win_lock"), bool):
-                state["win_lock"] = loaded["win_lock"]
+    def activate(self, name):
+        profile = self._profiles.get(name)
+        if profile is None:
+            return False
+        engine.mark_activation()
+        state.update(**profile.settings)
+        save_state()
+        return True
+
+
+profiles = ProfileLibrary(PROFILES_FILE)
+
+
+# ============================================================
+# HARDWARE HOTPLUG
+# ============================================================
+def restore_fan_mode():
+    """Kayıtlı fan modunu donanıma uygula (açılışta ve hp-wmi yeniden geldiğinde)."""
+    saved_fan = state.get("fan_mode", "auto")
+    if saved_fan == "custom":
+        ok = fan_ctrl.get_mode() == "custom" or fan_ctrl.set_mode("custom")
+        curve_ctrl.set_active(ok)
+        logger.info(f"Restored custom fan curve (success={ok})")
+        if not ok:
+            state.update(fan_mode="auto")
+            save_state()
+            saved_fan = "auto"
+
+    if saved_fan in ("auto", "max"):
+        if fan_ctrl.get_mode() != saved_fan:
+            ok = fan_ctrl.set_mode(saved_fan)
+            logger.info(f"Restored fan mode '{saved_fan}' (success={ok})")
+        else:
+            logger.info(f"Fan mode already '{saved_fan}', skipping write to prevent spin-up.")
 
-        except Exception as e:
-            logger.error(f"State load error: {e}")
+
+class HardwareWatcher:
+    """
+    Kernel uevent'lerini GLib döngüsünde dinler (polling yok). Bir hwmon
+    ya da platform cihazı değişince yalnızca etkilenen controller yeniden
+    çözülür; yetenekler değiştiyse servis sinyal yayar.
+    """
+    # power_supply is not watched: no controller depends on it (power profiles
+    # come from tuned/ppd over D-Bus) and battery uevents arrive every minute
+    SUBSYSTEMS = ("hwmon", "platform")
+    SETTLE_MS = 250   # module load/unload arrives as a burst; resolve once per burst
+    HP_WMI = ("/hp-wmi", "/hp_wmi")
+    HP_RGB = ("/hp-rgb-lighting", "/hp_rgb_lighting")
+
+    def __init__(self, service):
+        self.service = service
+        self.monitor = None
+        self._pending = set()
+        self._timer = 0
+        self.stats = {"events": 0, "resolves": {"fan": 0, "temps": 0, "rgb": 0}}
+
+    def start(self):
+        try:
+            self.monitor = UeventMonitor(self.SUBSYSTEMS)
+        except OSError as e:
+            logger.warning(f"Hotplug: uevent socket unavailable ({e}), rediscovery disabled")
+            return False
+        GLib.io_add_watch(self.monitor.fileno(), GLib.PRIORITY_LOW, GLib.IO_IN, self._on_readable)
+        return True
+
+    def _on_readable(self, fd, cond):
+        for ev in self.monitor.read_events():
+            self.stats["events"] += 1
+            self._pending |= self._affected(ev)
+        if self._pending and not self._timer:
+            self._timer = GLib.timeout_add(self.SETTLE_MS, self._resolve)
+        return True
+
+    def _affected(self, ev):
+        sub = ev.get("SUBSYSTEM")
+        devpath = ev.get("DEVPATH", "")
+        if sub == "platform":
+            if any(n in devpath for n in self.HP_RGB):
+                return {"rgb"}
+            if any(n in devpath for n in self.HP_WMI):
+                return {"fan"}
+            return set()
+        # hwmon: temperature sources may have been renumbered; fans only if it is ours
+        if (any(n in devpath for n in self.HP_WMI)
+                or fan_ctrl.hwmon_path == SYSFS_ROOT + devpath
+                or self._hwmon_name(devpath) == "hp"):
+            return {"fan", "temps"}
+        return {"temps"}
+
+    @staticmethod
+    def _hwmon_name(devpath):
+        try:
+            with open(f"{SYSFS_ROOT}{devpath}/name") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _resolve(self):
+        pending, self._pending = self._pending, set()
+        self._timer = 0
+        # A controller still probing will see the new hardware on its own
+        if not fan_ctrl.ready.is_set():
+            pending.discard("fan")
+        if not rgb_ctrl.ready.is_set():
+            pending.discard("rgb")
+        for what in pending:
+            self.stats["resolves"][what] += 1
+
+        if "fan" in pending:
+            had_fans = fan_ctrl.is_available()
+            if fan_ctrl._rediscover() and fan_ctrl.is_available() and not had_fans:
+                restore_fan_mode()
+            elif not fan_ctrl.is_available():
+                curve_ctrl.set_active(False)
+        if "temps" in pending:
+            self.service.rescan_temp_paths()
+        if "rgb" in pending and rgb_ctrl.rediscover() and rgb_ctrl.is_available():
+            rgb_ctrl.write_win_lock(state.get("win_lock", False))
+            if engine.is_alive():
+                state_changed.set()   # repaint: the new module instance starts dark
+            else:
+                engine.start()
+                logger.info("RGB engine started")
+
+        self.service._resample()
+        self.service._emit_capabilities()
+        return False
+
+    def get_stats(self):
+        return {"active": self.monitor is not None, "events": self.stats["events"],
+                "resolves": dict(self.stats["resolves"])}
 
 
 # ============================================================
@@ -566,21 +1811,53 @@ class HPManagerService(object):
         <method name="SetMode"><arg type="s" name="m" direction="in"/><arg type="i" name="s" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="SetGlobal"><arg type="b" name="p" direction="in"/><arg type="i" name="b" direction="in"/><arg type="s" name="d" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="GetState"><arg type="s" name="j" direction="out"/></method>
+        <method name="SetLighting"><arg type="a{sv}" name="opts" direction="in"/><arg type="s" name="resp" direction="out"/></method>
+        <method name="SetColors"><arg type="as" name="colors" direction="in"/><arg type="s" name="resp" direction="out"/></method>
+        <method name="ListProfiles"><arg type="s" name="j" direction="out"/></method>
+        <method name="SaveProfile"><arg type="s" name="name" direction="in"/><arg type="a{sv}" name="opts" direction="in"/><arg type="s" name="resp" direction="out"/></method>
+        <method name="ActivateProfile"><arg type="s" name="name" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="SetFanMode"><arg type="s" name="mode" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="SetFanTarget"><arg type="i" name="fan" direction="in"/><arg type="i" name="rpm" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="GetFanInfo"><arg type="s" name="j" direction="out"/></method>
+        <method name="SetFanCurve"><arg type="a(dd)" name="points" direction="in"/><arg type="s" name="resp" direction="out"/></method>
+        <method name="GetFanCurve"><arg type="s" name="j" direction="out"/></method>
         <method name="SetPowerProfile"><arg type="s" name="profile" direction="in"/><arg type="s" name="resp" direction="out"/></method>
         <method name="GetPowerProfile"><arg type="s" name="j" direction="out"/></method>
         <method name="SetGpuMode"><arg type="s" name="mode" direction="in"/><arg type="s" name="result" direction="out"/></method>
         <method name="GetGpuInfo"><arg type="s" name="j" direction="out"/></method>
         <method name="GetSystemInfo"><arg type="s" name="j" direction="out"/></method>
+        <method name="GetTelemetry"><arg type="s" name="j" direction="out"/></method>
+        <method name="GetTelemetryDelta">
+            <arg type="t" name="since" direction="in"/>
+            <arg type="u" name="version" direction="out"/>
+            <arg type="t" name="seq" direction="out"/>
+            <arg type="d" name="timestamp" direction="out"/>
+            <arg type="a{sv}" name="changed" direction="out"/>
+            <arg type="as" name="removed" direction="out"/>
+        </method>
+        <method name="GetHistory">
+            <arg type="s" name="metric" direction="in"/>
+            <arg type="d" name="since" direction="in"/>
+            <arg type="d" name="resolution" direction="in"/>
+            <arg type="s" name="j" direction="out"/>
+        </method>
         <method name="CleanMemory"><arg type="s" name="result" direction="out"/></method>
         <method name="InstallPackage"><arg type="s" name="pkg" direction="in"/><arg type="s" name="result" direction="out"/></method>
         <method name="SetWinLock"><arg type="b" name="locked" direction="in"/><arg type="s" name="result" direction="out"/></method>
         <method name="SetKeyboardFixes"><arg type="b" name="prtsc" direction="in"/><arg type="b" name="f1" direction="in"/><arg type="s" name="result" direction="out"/></method>
+        <method name="GetThermalEvents"><arg type="d" name="since" direction="in"/><arg type="s" name="j" direction="out"/></method>
+        <method name="GetDebugStats"><arg type="s" name="j" direction="out"/></method>
+        <method name="GetAnimationStats"><arg type="s" name="j" direction="out"/></method>
+        <method name="GetCapabilities"><arg type="s" name="j" direction="out"/></method>
+        <signal name="TelemetryUpdated"><arg type="s" name="j"/></signal>
+        <signal name="StateChanged"><arg type="s" name="j"/></signal>
+        <signal name="CapabilitiesChanged"><arg type="s" name="j"/></signal>
       </interface>
     </node>
     """
+    TelemetryUpdated = signal()
+    StateChanged = signal()
+    CapabilitiesChanged = signal()
 
     def __init__(self):
         # 1. Statik sistem bilgileri RAM'e kaydediliyor
@@ -590,7 +1867,7 @@ class HPManagerService(object):
             "os_name": "Linux",
             "product_name": "HP Laptop"
         }
-        for dmi_file in ("/sys/devices/virtual/dmi/id/product_name", "/sys/devices/virtual/dmi/id/product_family"):
+        for dmi_file in (f"{SYSFS_ROOT}/devices/virtual/dmi/id/product_name", f"{SYSFS_ROOT}/devices/virtual/dmi/id/product_family"):
             if os.path.exists(dmi_file):
                 try:
                     with open(dmi_file) as f:
@@ -598,21 +1875,71 @@ class HPManagerService(object):
                     break
                 except Exception: pass
 
-        # 2. nvidia-smi sistemde var mı kontrolü 1 kez yapılıyor
-        self._has_nvidia_smi = shutil.which("nvidia-smi") is not None
-        
+        # 2. dGPU: PCI cihazı ilk sorguda bir kez çözülür; her GPU sorgusu
+        #    runtime_status kapısından geçer. NVIDIA ise NVML ile örneklenir.
+        self.dgpu = DGpuPowerTracker(SYSFS_ROOT, reader=sysfs.read)
+        self.gpu_telemetry = GpuTelemetry(self.dgpu)
+
         # 3. Sensör yolları 1 kez taranıyor
         self._cpu_temp_path = None
         self._gpu_temp_path = None
         self._find_temp_paths()
 
+        self.sampler: typing.Optional[TelemetrySampler] = None
+
+        # Sinyaller yalnızca GLib ana döngüsünden yayınlanır
+        self._last_state_version = -1
+        state_listeners.append(lambda: GLib.idle_add(self._emit_state_changed))
+        self._last_capabilities = self.capabilities()
+        self.hw_watcher = HardwareWatcher(self)
+
+    def _emit_telemetry(self, j):
+        self.TelemetryUpdated(j)
+        return False
+
+    def _emit_state_changed(self):
+        snap = state.snapshot()
+        if snap.version != self._last_state_version:
+            self._last_state_version = snap.version
+            self.StateChanged(snap.json)
+        return False
+
+    def capabilities(self):
+        return {
+            "fan":            fan_ctrl.is_available(),
+            "fan_count":      fan_ctrl.get_fan_count(),
+            "rgb":            rgb_ctrl.is_available(),
+            "rgb_frame":      rgb_ctrl.has_frame,
+            "power_profiles": power_ctrl.available,
+            "mux":            mux_ctrl.is_available(),
+            "cpu_temp":       self._cpu_temp_path is not None,
+            "gpu_temp":       self._gpu_temp_path is not None or self.gpu_telemetry.present(),
+            "initializing":   [c.name for c in CONTROLLERS if not c.ready.is_set()],
+        }
+
+    def _emit_capabilities(self):
+        caps = self.capabilities()
+        if caps != self._last_capabilities:
+            logger.info(f"Capabilities changed: {caps}")
+            self._last_capabilities = caps
+            self.CapabilitiesChanged(json.dumps(caps))
+        return False
+
+    def rescan_temp_paths(self):
+        # Rescanned in place: the fan curve thread keeps reading the old path until then
+        old = (self._cpu_temp_path, self._gpu_temp_path)
+        self._find_temp_paths()
+        for path in old:
+            if path and path not in (self._cpu_temp_path, self._gpu_temp_path):
+                sysfs.invalidate(path)
+
     def _find_temp_paths(self):
         best_score = -1000
         RANK_DRV = {"zenpower": 100, "coretemp": 90, "k10temp": 90, "cpu_thermal": 80, "hp_wmi": 60, "acpitz": 30}
         RANK_LBL = {"tdie": 100, "package id 0": 95, "tctl": 90, "core": 80, "composite": 50}
         try:
-            for d in os.listdir("/sys/class/hwmon"):
-                path = os.path.join("/sys/class/hwmon", d)
+            for d in os.listdir(f"{SYSFS_ROOT}/class/hwmon"):
+                path = os.path.join(f"{SYSFS_ROOT}/class/hwmon", d)
                 try:
                     with open(os.path.join(path, "name")) as f:
                         drv = f.read().strip().lower()
@@ -634,8 +1961,8 @@ class HPManagerService(object):
         except Exception: pass
 
         try:
-            for d in os.listdir("/sys/class/hwmon"):
-                path = os.path.join("/sys/class/hwmon", d)
+            for d in os.listdir(f"{SYSFS_ROOT}/class/hwmon"):
+                path = os.path.join(f"{SYSFS_ROOT}/class/hwmon", d)
                 try:
                     with open(os.path.join(path, "name")) as f:
                         name = f.read().strip().lower()
@@ -648,56 +1975,102 @@ class HPManagerService(object):
         c = str(h).lstrip("#").upper()
         if not HEX_COLOR_RE.match(c):
             return "FAIL"
-        with lock:
-            state["mode"]  = "static"
-            state["power"] = True
+        if not 0 <= z <= 8:
+            return "FAIL"
+
+        def apply(st):
+            st["mode"]  = "static"
+            st["power"] = True
             if z == 8:
-                state["colors"] = [c] * 8
-            elif 0 <= z < 8:
-                state["colors"][z] = c
+                st["colors"] = [c] * 8
             else:
-                return "FAIL"
+                st["colors"][z] = c
+        state.update(apply)
         save_state()
         return "OK"
 
     def SetMode(self, m, s):
         if m not in VALID_LIGHT_MODES:
             return "FAIL"
-        with lock:
-            state["mode"]  = m
-            state["speed"] = max(1, min(int(s), 100))
-            state["power"] = True
+        state.update(mode=m, speed=max(1, min(int(s), 100)), power=True)
         save_state()
         return "OK"
 
     def SetGlobal(self, p, b, d):
         if d not in VALID_DIRECTIONS:
             return "FAIL"
-        with lock:
-            state["power"]      = bool(p)
-            state["brightness"] = max(0, min(int(b), 100))
-            state["direction"]  = d
+        state.update(power=bool(p), brightness=max(0, min(int(b), 100)), direction=d)
+        save_state()
+        return "OK"
+
+    def SetLighting(self, opts):
+        """Tüm aydınlatma ayarları tek çağrıda: bir doğrulama, bir sürüm, bir kayıt."""
+        changes = parse_lighting(opts, state.snapshot())
+        if changes is None:
+            return "FAIL"
+        if changes:
+            state.update(**changes)
+            save_state()
+        return "OK"
+
+    def SetColors(self, colors):
+        changes = parse_lighting({"colors": colors}, state.snapshot())
+        if changes is None:
+            return "FAIL"
+        state.update(mode="static", power=True, **changes)
         save_state()
         return "OK"
 
+    def ListProfiles(self):
+        return json.dumps(profiles.describe())
+
+    def SaveProfile(self, name, opts):
+        logger.info(f"SaveProfile: {name}")
+        err = profiles.save(str(name), opts)
+        return err or "OK"
+
+    def ActivateProfile(self, name):
+        logger.info(f"ActivateProfile: {name}")
+        return "OK" if profiles.activate(str(name)) else "FAIL"
+
     def GetState(self):
-        with lock:
-            return json.dumps(state)
+        return state.snapshot().json
 
     def SetFanMode(self, mode):
         logger.info(f"SetFanMode: {mode}")
+        if not fan_ctrl.ready.is_set():
+            return INITIALIZING
         ok = fan_ctrl.set_mode(mode)
         if ok:
-            with lock:
-                state["fan_mode"] = mode
+            curve_ctrl.set_active(mode == "custom")
+            state.update(fan_mode=mode)
             save_state()
+            self._resample()
         return "OK" if ok else "FAIL"
 
+    def SetFanCurve(self, points):
+        pts = validate_fan_curve(points)
+        if not pts:
+            return "FAIL"
+        logger.info(f"SetFanCurve: {pts}")
+        curve_ctrl.configure(points=pts)
+        state.update(lambda st: st["fan_curve"].update(points=[list(p) for p in pts]))
+        save_state()
+        return "OK"
+
+    def GetFanCurve(self):
+        return json.dumps(curve_ctrl.describe())
+
     def SetFanTarget(self, fan, rpm):
         logger.info(f"SetFanTarget: fan={fan}, rpm={rpm}")
+        if not fan_ctrl.ready.is_set():
+            return INITIALIZING
         return "OK" if fan_ctrl.set_fan_target(fan, rpm) else "FAIL"
 
     def GetFanInfo(self):
+        return json.dumps(self._read_fan_info())
+
+    def _read_fan_info(self):
         fans_data = {
             str(i): {
                 "current": fan_ctrl.get_current_speed(i),
@@ -706,90 +2079,142 @@ class HPManagerService(object):
             }
             for i in fan_ctrl.found_fans
         }
-        return json.dumps({
+        return {
             "available":  fan_ctrl.is_available(),
             "fan_count":  fan_ctrl.get_fan_count(),
             "mode":       fan_ctrl.get_mode(),
             "fans":       fans_data,
-        })
+            "initializing": not fan_ctrl.ready.is_set(),
+        }
 
     def SetPowerProfile(self, profile):
+        if not power_ctrl.ready.is_set():
+            return INITIALIZING
         if profile not in power_ctrl.get_profiles():
             return "FAIL"
         ok = power_ctrl.set_profile(profile)
         if ok:
-            with lock:
-                state["power_profile"] = profile
+            state.update(power_profile=profile)
             save_state()
+            self._resample()
         return "OK" if ok else "FAIL"
 
     def GetPowerProfile(self):
-        return json.dumps({
+        return json.dumps(self._read_power_profile())
+
+    def _read_power_profile(self):
+        return {
             "available": power_ctrl.available,
             "active":    power_ctrl.get_active(),
             "profiles":  power_ctrl.get_profiles(),
-        })
+            "initializing": not power_ctrl.ready.is_set(),
+        }
 
     def SetGpuMode(self, mode):
+        if not mux_ctrl.ready.is_set():
+            return INITIALIZING
         if mode not in VALID_GPU_MODES:
             return "FAIL"
-        return mux_ctrl.set_mode(mode)
+        result = mux_ctrl.set_mode(mode)
+        self._resample()
+        return result
 
     def GetGpuInfo(self):
-        return json.dumps({
+        return json.dumps(self._read_gpu_info())
+
+    def _read_gpu_info(self):
+        return {
             "available": mux_ctrl.is_available(),
             "backend":   mux_ctrl.get_backend(),
             "mode":      mux_ctrl.get_mode(),
-        })
+            "initializing": not mux_ctrl.ready.is_set(),
+        }
 
     def GetSystemInfo(self):
-        now = time.time()
-        si  = state.get("_system_info_cache")
-        
-        if si and (now - state.get("_system_info_last", 0) < 2.0):
-            return json.dumps(si)
+        if self.sampler and self.sampler.has_data():
+            return json.dumps(self.sampler.snapshot()["sys"])
 
         info = self._static_info.copy()
         info["cpu_temp"] = self._get_cached_cpu_temp()
         info["gpu_temp"] = self._get_cached_gpu_temp()
-
-        state["_system_info_cache"] = info
-        state["_system_info_last"]  = now
         return json.dumps(info)
 
+    def GetTelemetry(self):
+        if self.sampler and self.sampler.has_data():
+            return self.sampler.snapshot_json()
+        return json.dumps({
+            "seq": 0,
+            "sys": json.loads(self.GetSystemInfo()),
+            "fan": self._read_fan_info(),
+            "pp":  self._read_power_profile(),
+            "gpu": self._read_gpu_info(),
+        })
+
+    def GetTelemetryDelta(self, since):
+        """JSON'suz telemetri: since'ten sonra değişen alanlar, native D-Bus tipleriyle."""
+        if not (self.sampler and self.sampler.has_data()):
+            return (TELEMETRY_VERSION, 0, 0.0, {}, [])
+        seq, ts, changed, removed = self.sampler.delta_since(since)
+        return (TELEMETRY_VERSION, seq, ts, changed, removed)
+
+    def GetHistory(self, metric, since, resolution):
+        """
+        Geçmiş: {"metric", "resolution", "t": [...], "v": [...]}. metric
+        telemetri anahtarıdır ("sys.cpu_temp", "fan.fans.1.current"); boş
+        metric kayıtlı metrikleri listeler. since < 0: son -since saniye.
+        """
+        if not self.sampler:
+            return json.dumps({"metrics": []} if not metric else
+                              {"metric": metric, "resolution": 0, "t": [], "v": []})
+        history = self.sampler.history
+        if not metric:
+            return json.dumps({"metrics": history.metrics(),
+                               "resolutions": [t.step for t in history.tiers]})
+        return json.dumps(history.query(str(metric), float(since), float(resolution)))
+
+    def GetThermalEvents(self, since):
+        """
+        Throttling / sınır olayları: {"events": [...], "summary": {...}}.
+        Süren olayların "end" alanı null'dır. since < 0: son -since saniye.
+        """
+        if not self.sampler:
+            return json.dumps({"events": [], "summary": {}})
+        since = float(since)
+        if since < 0:
+            since += time.time()
+        thermal = self.sampler.thermal
+        return json.dumps({"events": thermal.events(since),
+                           "summary": self.sampler.snapshot().get("thermal", {}),
+                           "sources": thermal.get_stats()})
+
+    def _resample(self):
+        if self.sampler:
+            self.sampler.request_sample()
+
     def _get_cached_cpu_temp(self):
-        if self._cpu_temp_path and os.path.exists(self._cpu_temp_path):
+        # Fan eğrisi döngüsü bunu her saniye çağırır: önbellekli pread kullan
+        if self._cpu_temp_path:
             try:
-                with open(self._cpu_temp_path) as f:
-                    return int(f.read().strip()) / 1000.0
+                return int(sysfs.read(self._cpu_temp_path)) / 1000.0
             except Exception: pass
         return 0.0
 
     def _get_cached_gpu_temp(self):
-        if self._gpu_temp_path and os.path.exists(self._gpu_temp_path):
+        path = self._gpu_temp_path
+        if path:
+            # A dGPU hwmon read would resume a runtime-suspended card
+            if self.dgpu.owns(path) and not self.dgpu.gate("hwmon"):
+                return "SUSPENDED"
             try:
-                with open(self._gpu_temp_path) as f:
-                    return int(f.read().strip()) / 1000.0
+                return int(sysfs.read(path)) / 1000.0
             except Exception: pass
 
-        now = time.time()
-        nv_cache = state.get("_nvidia_smi_cache", {"time": 0, "val": "NOT_REACHABLE"})
-        if now - nv_cache["time"] < 15.0:
-            return nv_cache["val"]
-
-        if self._has_nvidia_smi:
-            try:
-                out = subprocess.check_output(
-                    ["nvidia-smi", "--query-gpu=temperature.gpu", "--format=csv,noheader,nounits"],
-                    stderr=subprocess.DEVNULL, timeout=2
-                ).decode().strip()
-                val = float(out)
-                state["_nvidia_smi_cache"] = {"time": now, "val": val}
-                return val
-            except Exception:
-                pass
-                
-        state["_nvidia_smi_cache"] = {"time": now, "val": "NOT_REACHABLE"}
+        # Last NVML sample (the sampler thread owns the session)
+        temp = self.gpu_telemetry.last.get("temp")
+        if temp is not None:
+            return temp
+        if self.dgpu.present() and not self.dgpu.awake():
+            return "SUSPENDED"
         return "NOT_REACHABLE"
 
     def CleanMemory(self):
@@ -818,21 +2243,42 @@ class HPManagerService(object):
 
     def SetWinLock(self, locked):
         logger.info(f"SetWinLock: {'LOCKED' if locked else 'UNLOCKED'}")
-        with lock:
-            state["win_lock"] = bool(locked)
+        state.update(win_lock=bool(locked))
+        # Still probing: the saved value is written once the module is found
         rgb_ctrl.write_win_lock(bool(locked))
         save_state()
         return "OK"
 
     def SetKeyboardFixes(self, prtsc, f1):
         logger.info(f"SetKeyboardFixes: prtsc={prtsc}, f1={f1}")
-        with lock:
-            state["prtsc_fix"] = bool(prtsc)
-            state["f1_fix"]    = bool(f1)
+        state.update(prtsc_fix=bool(prtsc), f1_fix=bool(f1))
         self._write_hwdb_rules(prtsc, f1)
         save_state()
         return "OK"
 
+    def GetDebugStats(self):
+        return json.dumps({
+            "sysfs":     sysfs.get_stats(),
+            "animation": engine.get_stats(),
+            "locks":     InstrumentedLock.all_stats(),
+            "persist":   state_writer.get_stats(),
+            "mux":       mux_ctrl.get_stats(),
+            "dgpu":      dict(self.gpu_telemetry.get_stats(), power=self.dgpu.get_stats()),
+            "hotplug":   self.hw_watcher.get_stats(),
+            "telemetry": dict(self.sampler.stats, seq=self.sampler.seq) if self.sampler else None,
+            "procstat":  self.sampler.proc.get_stats() if self.sampler else None,
+            "history":   self.sampler.history.get_stats() if self.sampler else None,
+            "telemetry_log": self.sampler.log.get_stats() if self.sampler and self.sampler.log else None,
+            "thermal":   self.sampler.thermal.get_stats() if self.sampler else None,
+            "state_version": state.snapshot().version,
+        })
+
+    def GetAnimationStats(self):
+        return json.dumps(engine.get_stats())
+
+    def GetCapabilities(self):
+        return json.dumps(self.capabilities())
+
     def _write_hwdb_rules(self, prtsc, f1):
         hwdb_path = "/etc/udev/hwdb.d/90-hp-keyboard-fixes.hwdb"
 
@@ -886,59 +2332,123 @@ class HPManagerService(object):
 # ============================================================
 # MAIN
 # ============================================================
-def main():
-    if os.geteuid() != 0:
-        print("Root yetkisi gerekli (sudo).")
-        sys.exit(1)
-
-    load_state()
+def restore_power_profile():
+    saved_pp = state.get("power_profile", "balanced")
+    if saved_pp in power_ctrl.get_profiles():
+        if power_ctrl.get_active() != saved_pp:
+            ok = power_ctrl.set_profile(saved_pp)
+            logger.info(f"Restored power profile '{saved_pp}' (success={ok})")
+        else:
+            logger.info(f"Power profile already '{saved_pp}', skipping.")
+
+
+def _on_probed(ctrl):
+    """Runs in the probe thread after ctrl._probe(), before ctrl.ready is set: apply saved settings."""
+    if ctrl is fan_ctrl and fan_ctrl.is_available():
+        logger.info(f"Fan control active: {fan_ctrl.get_fan_count()} fans")
+        restore_fan_mode()
+    elif ctrl is rgb_ctrl and rgb_ctrl.is_available():
+        rgb_ctrl.write_win_lock(state.get("win_lock", False))
+        engine.start()
+        logger.info("RGB engine started")
+    elif ctrl is power_ctrl and power_ctrl.available:
+        logger.info(f"Power profiles: {power_ctrl.get_profiles()}")
+        restore_power_profile()
+    elif ctrl is mux_ctrl and mux_ctrl.is_available():
+        logger.info(f"MUX backend: {mux_ctrl.get_backend()}")
 
-    if fan_ctrl.is_available():
-        saved_fan = state.get("fan_mode", "auto")
-        if saved_fan == "custom":
-            saved_fan = "auto"
-            state["fan_mode"] = "auto"
-            logger.warning("Custom fan mode not restorable (no saved targets), falling back to auto")
-            
-        if saved_fan in ("auto", "max"):
-            if fan_ctrl.get_mode() != saved_fan:
-                ok = fan_ctrl.set_mode(saved_fan)
-                logger.info(f"Restored fan mode '{saved_fan}' (success={ok})")
-            else:
-                logger.info(f"Fan mode already '{saved_fan}', skipping write to prevent spin-up.")
-
-    if power_ctrl.available:
-        saved_pp = state.get("power_profile", "balanced")
-        if saved_pp in power_ctrl.get_profiles():
-            if power_ctrl.get_active() != saved_pp:
-                ok = power_ctrl.set_profile(saved_pp)
-                logger.info(f"Restored power profile '{saved_pp}' (success={ok})")
-            else:
-                logger.info(f"Power profile already '{saved_pp}', skipping.")
 
-    service = HPManagerService()
+def probe_controllers(service):
+    """
+    Controller'ları bir thread havuzunda paralel yoklar; en yavaşı (lsmod,
+    tuned D-Bus yoklaması) diğerlerini ve D-Bus adını bekletmez. Her biri
+    hazır olunca telemetri yenilenir ve CapabilitiesChanged yayınlanır.
+    """
+    remaining = [len(CONTROLLERS)]
+    done_lock = threading.Lock()
+
+    def run(ctrl):
+        with startup_trace.phase(f"probe:{ctrl.name}"):
+            ctrl.probe(_on_probed)
+        service._resample()
+        GLib.idle_add(service._emit_capabilities)
+        with done_lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            startup_trace.mark("controllers ready")
+            startup_trace.report("daemon")
+
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(CONTROLLERS),
+                                                 thread_name_prefix="probe")
+    for ctrl in CONTROLLERS:
+        pool.submit(run, ctrl)
+    pool.shutdown(wait=False)
+
+
+def startup():
+    """Load state and start the worker threads; hardware is probed later by serve()."""
+    with startup_trace.phase("load_state"):
+        load_state()
+        state_writer.interval = state.get("persist_interval", 2.0)
+        state_writer.saved_version = state.snapshot().version  # just loaded from disk
+        state_writer.start()
+        profiles.load()
+
+    with startup_trace.phase("service"):
+        service = HPManagerService()
+
+    fc = state["fan_curve"]
+    curve_ctrl.temp_reader = service._get_cached_cpu_temp
+    curve_ctrl.configure(points=[tuple(p) for p in fc["points"]], period=fc["period"],
+                         smoothing=fc["smoothing"], hysteresis=fc["hysteresis"])
+    curve_ctrl.start()
 
     if state.get("prtsc_fix") or state.get("f1_fix"):
         service.SetKeyboardFixes(state.get("prtsc_fix"), state.get("f1_fix"))
 
-    if rgb_ctrl.is_available():
-        rgb_ctrl.write_win_lock(state.get("win_lock", False))
-        engine.start()
-        logger.info("RGB engine started")
+    service.sampler = TelemetrySampler(
+        service, state.get("telemetry_interval", 2.0),
+        on_update=lambda j: GLib.idle_add(service._emit_telemetry, j),
+        usage_smoothing=state.get("usage_smoothing", 0.3))
+    if state.get("telemetry_log", True):
+        try:
+            service.sampler.log = TelemetryLogWriter(
+                TELEMETRY_LOG_DIR, max_bytes=state.get("telemetry_log_mb", 64) * 1024 * 1024)
+        except OSError as e:
+            logger.warning(f"Telemetry log disabled: {e}")
+    service.sampler.start()
+    return service
+
 
+def serve(service):
+    """Start probing, publish on the system bus at once and run the GLib loop until SIGTERM/SIGINT."""
     try:
+        probe_controllers(service)
         bus = SystemBus()
-        bus.publish("com.yyl.hpmanager", service)
-        logger.info("HP Manager Daemon ready on D-Bus")
-        if fan_ctrl.is_available():
-            logger.info(f"Fan control active: {fan_ctrl.get_fan_count()} fans")
-        if power_ctrl.available:
-            logger.info(f"Power profiles: {power_ctrl.get_profiles()}")
-        if mux_ctrl.is_available():
-            logger.info(f"MUX backend: {mux_ctrl.get_backend()}")
-        GLib.MainLoop().run()
+        with startup_trace.phase("publish"):
+            bus.publish("com.yyl.hpmanager", service)
+        logger.info("HP Manager Daemon ready on D-Bus (controllers probing)")
+        startup_trace.mark("published")
+        service.hw_watcher.start()
+        loop = GLib.MainLoop()
+        for sig in (SIGTERM, SIGINT):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, sig, lambda: loop.quit() or GLib.SOURCE_REMOVE)
+        loop.run()
     except Exception as e:
         logger.critical(f"Service error: {e}")
+    finally:
+        if service.sampler and service.sampler.log:
+            service.sampler.log.close()
+        state_writer.stop()
+
+
+def main():
+    if os.geteuid() != 0:
+        print("Root yetkisi gerekli (sudo).")
+        sys.exit(1)
+
+    serve(startup())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+HP Laptop Manager - RGB animasyon kareleri.
+Periyodik modlar (breathing/cycle/wave) bir periyotluk döngüsel tabloya
+derlenir: her girdi 8 bölgenin hex listesi + sysfs "frame" için hazır byte
+dizisi. Motorun kare başına işi bir indeks hesabı ve bir yazmadan ibarettir.
+"""
+import colorsys, logging, math
+
+logger = logging.getLogger("hp-manager")
+
+MAX_FPS = {"breathing": 20, "cycle": 20, "wave": 20}  # never above the old 50 ms tick
+MAX_TABLE_FRAMES = 6000   # longer periods get coarser slots instead of more memory
+
+
+def hex_to_rgb(h):
+    h = str(h).lstrip("#")
+    if not h or len(h) < 6:
+        logger.warning(f"Invalid hex color: '{h}', falling back to red")
+        return (255, 0, 0)
+    try:
+        return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError as e:
+        logger.error(f"Hex conversion error for '{h}': {e}")
+        return (255, 0, 0)
+
+
+def render(mode, t, params):
+    """8 bölgenin hex renkleri, t anında (referans yol, tablo derlemede de kullanılır)."""
+    bri, spd, cols, d = params
+    if mode == "static":
+        targets = [hex_to_rgb(c) for c in cols]
+    elif mode == "breathing":
+        period = 8.0 - (spd * 0.06)
+        phase  = 0.1 + 0.9 * ((math.sin(2 * math.pi * t / period) + 1) / 2)
+        base   = hex_to_rgb(cols[0])
+        targets = [(int(base[0] * phase), int(base[1] * phase), int(base[2] * phase))] * 8
+    elif mode == "cycle":
+        hue = (t * (spd * 0.003)) % 1.0
+        r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
+        targets = [(int(r * 255), int(g * 255), int(b * 255))] * 8
+    else:  # wave
+        targets = []
+        for i in range(8):
+            offset = (i * 0.15) if d == "ltr" else ((7 - i) * 0.15)
+            r, g, b = colorsys.hsv_to_rgb((t * spd * 0.007 + offset) % 1.0, 1.0, 1.0)
+            targets.append((int(r * 255), int(g * 255), int(b * 255)))
+    return [
+        f"{int(r * bri):02X}{int(g * bri):02X}{int(b * bri):02X}"
+        for r, g, b in targets
+    ]
+
+
+def lighting_params(st):
+    """State (ya da profil) sözlüğünden render parametreleri: (bri, spd, cols, d)."""
+    return (
+        float(st.get("brightness", 100)) / 100.0,
+        float(st.get("speed", 50)),
+        [str(c) for c in st.get("colors", ["FF0000"] * 8)],
+        str(st.get("direction", "ltr")),
+    )
+
+
+def table_key(mode, params):
+    bri, spd, cols, d = params
+    return (mode, bri, spd, tuple(cols), d)
+
+
+def period_of(mode, spd):
+    """Seconds after which the animation repeats exactly; None if it never moves."""
+    if mode == "breathing":
+        return 8.0 - (spd * 0.06)
+    if mode == "cycle" and spd > 0:
+        return 1.0 / (spd * 0.003)
+    if mode == "wave" and spd > 0:
+        return 1.0 / (spd * 0.007)
+    return None
+
+
+class FrameTable:
+    """
+    Bir periyodun karelerini slot başına bir girdi olarak tutar.
+    frames[i] = (hex listesi, sysfs payload); aynı kareler tek nesne.
+    next_change[i] = bir sonraki farklı kareye kadar slot sayısı (0: hiç değişmez).
+    """
+    __slots__ = ("key", "period", "slot", "frames", "next_change")
+
+    def __init__(self, key, period, slot, frames, next_change):
+        self.key = key
+        self.period = period
+        self.slot = slot
+        self.frames = frames
+        self.next_change = next_change
+
+    @classmethod
+    def compile(cls, mode, params):
+        bri, spd, cols, d = params
+        key = table_key(mode, params)
+        period = period_of(mode, spd)
+        if period is None:
+            hexes = render(mode, 0.0, params)
+            return cls(key, None, 0.0, [(hexes, " ".join(hexes).encode())], [0])
+
+        n = max(1, min(int(round(period * MAX_FPS[mode])), MAX_TABLE_FRAMES))
+        slot = period / n
+        interned = {}
+        frames = []
+        for i in range(n):
+            hexes = render(mode, i * slot, params)
+            k = tuple(hexes)
+            entry = interned.get(k)
+            if entry is None:
+                entry = interned[k] = (hexes, " ".join(hexes).encode())
+            frames.append(entry)
+
+        # Slots until the next different frame, walking the ring backwards twice
+        next_change = [0] * n
+        if len(interned) > 1:
+            run = 0
+            for j in range(2 * n - 1, -1, -1):
+                i = j % n
+                run = 1 if frames[(i + 1) % n] is not frames[i] else run + 1
+                next_change[i] = run
+        return cls(key, period, slot, frames, next_change)
+
+    def index(self, t):
+        if self.period is None:
+            return 0
+        return int((t % self.period) / self.slot) % len(self.frames)
+
+    def next_time(self, t, i):
+        """Wall time of the next visible change after slot i (None: never)."""
+        n = self.next_change[i]
+        if not n:
+            return None
+        return t - (t % self.period) + (i + n) * self.slot
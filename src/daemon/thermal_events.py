@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+HP Laptop Manager - termal olay dedektörü.
+Her telemetri örneğinde sabit sayıda kaynak okunur (thermal_throttle
+sayaçları, pasif trip noktalı thermal zone'lar, RAPL paket enerjisi) ve
+örneklenmiş sıcaklıklarla birlikte bir durum makinesine verilir. Açık
+olaylar ve son bir saatteki olay sayısı artımlı tutulur: örnek başına iş
+geçmişin uzunluğundan bağımsızdır.
+"""
+import collections, glob, logging, os, threading
+
+from gpu_telemetry import (THROTTLE_HW_POWER_BRAKE, THROTTLE_HW_SLOWDOWN, THROTTLE_HW_THERMAL,
+                           THROTTLE_SW_POWER_CAP, THROTTLE_SW_THERMAL)
+
+logger = logging.getLogger("hp-manager")
+
+GPU_THERMAL_REASONS = (THROTTLE_HW_SLOWDOWN | THROTTLE_SW_THERMAL
+                       | THROTTLE_HW_THERMAL | THROTTLE_HW_POWER_BRAKE)
+
+# kind -> seconds a condition must hold before it counts as an event
+MIN_DURATION = {
+    "cpu_throttle":    0.0,   # thermal_throttle counter went up
+    "trip":            0.0,   # zone at or above a passive trip point
+    "cpu_hot":         0.0,
+    "gpu_hot":         0.0,
+    "gpu_throttle":    0.0,   # NVML thermal / HW slowdown reasons
+    "power_limit":    10.0,   # package power held at PL1
+    "gpu_power_limit": 10.0,  # NVML software power cap
+}
+
+
+def _read_file(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+class _Episode:
+    __slots__ = ("kind", "source", "start", "last", "peak", "count", "reported")
+
+    def __init__(self, kind, source, start, peak, count):
+        self.kind, self.source = kind, source
+        self.start = self.last = start
+        self.peak, self.count = peak, count
+        self.reported = False
+
+    def as_dict(self, ongoing=False):
+        return {"kind": self.kind, "source": self.source, "start": round(self.start, 1),
+                "end": None if ongoing else round(self.last, 1),
+                "duration": round(self.last - self.start, 1),
+                "peak": self.peak, "count": self.count}
+
+
+class ThermalEventDetector:
+    """
+    update(now, snap) her örnekte çağrılır ve telemetriye giden özet
+    sözlüğü döndürür; events() kapanmış ve süren olayları verir.
+    """
+    MAX_EVENTS = 512
+    WINDOW = 3600.0          # "last hour" counter
+    CPU_HOT_C = 95.0
+    GPU_HOT_C = 87.0
+    PL1_FRACTION = 0.95
+
+    def __init__(self, sysfs_root="/sys", reader=None, lock=None):
+        self.sysfs_root = sysfs_root
+        self.read = reader or _read_file
+        self._lock = lock or threading.Lock()   # update() on the sampler, events() on D-Bus
+        self._resolved = False
+        self._counters = []      # ("package" | "core", path)
+        self._counter_prev = {}
+        self._zones = []         # (zone type, temp path, passive trip in m°C)
+        self._rapl = None        # (name, energy path, wrap range uJ, PL1 W)
+        self._energy_prev = None
+        self._prev_t = None
+        self._open = {}          # (kind, source) -> _Episode
+        self._events = collections.deque(maxlen=self.MAX_EVENTS)
+        self._recent = collections.deque()   # start times of reported events within WINDOW
+        self.cpu_power_w = None
+        self.stats = {"updates": 0, "events": 0, "read_errors": 0}
+
+    # ── source discovery (once) ───────────────────────────────────────────
+    def _resolve(self):
+        self._resolved = True
+        root = self.sysfs_root
+        packages = set()
+        for cpu_dir in sorted(glob.glob(f"{root}/devices/system/cpu/cpu[0-9]*"),
+                              key=lambda p: int(p.rsplit("cpu", 1)[1])):
+            tt = f"{cpu_dir}/thermal_throttle"
+            if not os.path.isdir(tt):
+                continue
+            try:
+                pkg = _read_file(f"{cpu_dir}/topology/physical_package_id")
+            except OSError:
+                pkg = "0"
+            if pkg not in packages:   # package counter is shared by all its CPUs
+                packages.add(pkg)
+                self._counters.append(("package", f"{tt}/package_throttle_count"))
+            self._counters.append(("core", f"{tt}/core_throttle_count"))
+
+        for zone in sorted(glob.glob(f"{root}/class/thermal/thermal_zone*")):
+            try:
+                ztype = _read_file(f"{zone}/type")
+            except OSError:
+                continue
+            passive = []
+            for tp in glob.glob(f"{zone}/trip_point_*_type"):
+                try:
+                    if _read_file(tp) != "passive":
+                        continue
+                    t = int(_read_file(tp[:-len("type")] + "temp"))
+                except (OSError, ValueError):
+                    continue
+                if t > 0:
+                    passive.append(t)
+            if passive:
+                self._zones.append((ztype, f"{zone}/temp", min(passive)))
+
+        for dom in sorted(glob.glob(f"{root}/class/powercap/intel-rapl:[0-9]")):
+            try:
+                name = _read_file(f"{dom}/name")
+                if not name.startswith("package"):
+                    continue
+                wrap = int(_read_file(f"{dom}/max_energy_range_uj"))
+                pl1 = None
+                for c in range(2):
+                    if _read_file(f"{dom}/constraint_{c}_name") == "long_term":
+                        pl1 = int(_read_file(f"{dom}/constraint_{c}_power_limit_uw")) / 1e6
+                self._rapl = (name, f"{dom}/energy_uj", wrap, pl1)
+                break
+            except (OSError, ValueError):
+                continue
+        logger.info(f"Thermal events: {len(self._counters)} throttle counters, "
+                    f"{len(self._zones)} passive zones, RAPL {'yes' if self._rapl else 'no'}")
+
+    def _read_int(self, path):
+        try:
+            return int(self.read(path))
+        except (OSError, ValueError):
+            self.stats["read_errors"] += 1
+            return None
+
+    # ── per sample ────────────────────────────────────────────────────────
+    def update(self, now, snap):
+        if not self._resolved:
+            self._resolve()
+        self.stats["updates"] += 1
+        dt = now - self._prev_t if self._prev_t is not None else None
+        seen = {}   # (kind, source) -> (peak, count)
+
+        for source, path in self._counters:
+            v = self._read_int(path)
+            if v is None:
+                continue
+            prev = self._counter_prev.get(path)
+            self._counter_prev[path] = v
+            if prev is not None and v > prev:
+                key = ("cpu_throttle", source)
+                seen[key] = (None, seen.get(key, (None, 0))[1] + v - prev)
+
+        for ztype, path, trip in self._zones:
+            t = self._read_int(path)
+            if t is not None and t >= trip:
+                seen[("trip", ztype)] = (round(t / 1000.0, 1), 1)
+
+        self.cpu_power_w = None
+        if self._rapl:
+            name, path, wrap, pl1 = self._rapl
+            e = self._read_int(path)
+            if e is not None:
+                if self._energy_prev is not None and dt:
+                    de = e - self._energy_prev
+                    if de < 0:
+                        de += wrap
+                    self.cpu_power_w = round(de / 1e6 / dt, 1)
+                    if pl1 and self.cpu_power_w >= pl1 * self.PL1_FRACTION:
+                        seen[("power_limit", name)] = (self.cpu_power_w, 1)
+                self._energy_prev = e
+
+        si = snap.get("sys", {})
+        cpu_t, gpu_t = si.get("cpu_temp"), si.get("gpu_temp")
+        if isinstance(cpu_t, (int, float)) and cpu_t >= self.CPU_HOT_C:
+            seen[("cpu_hot", "cpu")] = (cpu_t, 1)
+        if isinstance(gpu_t, (int, float)) and gpu_t >= self.GPU_HOT_C:
+            seen[("gpu_hot", "gpu")] = (gpu_t, 1)
+        dgpu = snap.get("dgpu", {})
+        reasons = dgpu.get("throttle", 0)
+        if reasons & GPU_THERMAL_REASONS:
+            seen[("gpu_throttle", "dgpu")] = (dgpu.get("temp"), 1)
+        if reasons & THROTTLE_SW_POWER_CAP:
+            seen[("gpu_power_limit", "dgpu")] = (dgpu.get("power_w"), 1)
+
+        with self._lock:
+            self._advance(now, seen)
+            self._prev_t = now
+            return self.summary()
+
+    def _advance(self, now, seen):
+        # Counter deltas happened somewhere in the last interval
+        since = self._prev_t if self._prev_t is not None else now
+        for key, (peak, count) in seen.items():
+            ep = self._open.get(key)
+            if ep is None:
+                ep = self._open[key] = _Episode(key[0], key[1], since if key[0] == "cpu_throttle" else now,
+                                                peak, count)
+            else:
+                ep.last = now
+                ep.count += count
+                if peak is not None and (ep.peak is None or peak > ep.peak):
+                    ep.peak = peak
+            if not ep.reported and ep.last - ep.start >= MIN_DURATION[ep.kind]:
+                ep.reported = True
+                self._recent.append(ep.start)
+                self.stats["events"] += 1
+        for key in [k for k in self._open if k not in seen]:
+            ep = self._open.pop(key)
+            if ep.reported:
+                self._events.append(ep.as_dict())
+        while self._recent and self._recent[0] < now - self.WINDOW:
+            self._recent.popleft()
+
+    def summary(self):
+        active = sorted({ep.kind for ep in self._open.values() if ep.reported})
+        return {
+            "throttling": bool(active),
+            "active": active,
+            "events_last_hour": len(self._recent),
+            "cpu_power_w": self.cpu_power_w,
+        }
+
+    def events(self, since=0.0):
+        """
+        Events overlapping [since, now]: closed ones with end >= since (oldest
+        first), then every ongoing one, however long ago it started.
+        """
+        with self._lock:
+            closed = [e for e in self._events if e["end"] >= since]
+            ongoing = [ep.as_dict(ongoing=True) for ep in self._open.values() if ep.reported]
+        return closed + sorted(ongoing, key=lambda e: e["start"])
+
+    def get_stats(self):
+        return dict(self.stats, counters=len(self._counters), zones=[z[0] for z in self._zones],
+                    rapl=self._rapl[0] if self._rapl else None,
+                    pl1_w=self._rapl[3] if self._rapl else None)
@@ -17,6 +17,7 @@ TRANSLATIONS = {
         "fan_control": "Fan Kontrolü", "system_status": "SİSTEM DURUMU",
         "power_profile": "GÜÇ PROFİLİ", "fan_mode": "FAN MODU",
         "fan_curve": "FAN EĞRİSİ", "all_sensors": "Tüm Sensörler",
+        "history": "GEÇMİŞ", "range_10m": "10 dk", "range_24h": "24 sa", "range_7d": "7 gün",
         "fan_disabled": "Fan kontrolü devre dışı",
         "checking": "Kontrol ediliyor...", "no_ppd": "PPD yok",
         "active_profile": "Aktif profil", "mode": "Mod",
@@ -30,6 +31,7 @@ TRANSLATIONS = {
         "effect": "EFEKT", "direction": "YÖN", "speed": "HIZ", "brightness": "PARLAKLIK",
         "static_eff": "Sabit", "breathing": "Nefes Alma", "wave": "Dalga", "cycle": "Renk Döngüsü",
         "ltr": "Sol → Sağ", "rtl": "Sağ → Sol",
+        "lighting_profile": "PROFİL", "profile_name": "Profil adı", "save_profile": "Kaydet",
         "win_lock": "Oyun Tuş Kilidi",
         # Keyboard page
         "keyboard_shortcuts": "Klavye Kısayolları", "special_keys": "ÖZEL TUŞLAR",
@@ -65,7 +67,8 @@ TRANSLATIONS = {
         "power_profile_label": "Güç Profili", "fan_mode_label": "Fan Modu",
         "gpu_mux_label": "GPU / MUX",
         "battery": "Batarya", "ac_power": "Güç Kablosu",
-        "health": "Sağlık",
+        "health": "Sağlık", "gpu_suspended": "Uykuda",
+        "throttled_last_hour": "Son 1 saatte {n}× kısıldı", "throttling_now": "Şu an kısılıyor",
         "power_saver_lbl": "Enerji Tasarrufu",
         "balanced_lbl": "Dengeli", "performance_lbl": "Performans",
         "check_update": "Güncelleme Kontrol Et", "download": "İndir",
@@ -127,6 +130,7 @@ TRANSLATIONS = {
         "fan_control": "Fan Control", "system_status": "SYSTEM STATUS",
         "power_profile": "POWER PROFILE", "fan_mode": "FAN MODE",
         "fan_curve": "FAN CURVE", "all_sensors": "All Sensors",
+        "history": "HISTORY", "range_10m": "10 min", "range_24h": "24 h", "range_7d": "7 days",
         "fan_disabled": "Fan control unavailable",
         "checking": "Checking...", "no_ppd": "No PPD",
         "active_profile": "Active profile", "mode": "Mode",
@@ -140,6 +144,7 @@ TRANSLATIONS = {
         "effect": "EFFECT", "direction": "DIRECTION", "speed": "SPEED", "brightness": "BRIGHTNESS",
         "static_eff": "Static", "breathing": "Breathing", "wave": "Wave", "cycle": "Cycle",
         "ltr": "Left → Right", "rtl": "Right → Left",
+        "lighting_profile": "PROFILE", "profile_name": "Profile name", "save_profile": "Save",
         "win_lock": "Gaming Key Lock",
         # Keyboard page
         "keyboard_shortcuts": "Keyboard Shortcuts", "special_keys": "SPECIAL KEYS",
@@ -175,7 +180,8 @@ TRANSLATIONS = {
         "power_profile_label": "Power Profile", "fan_mode_label": "Fan Mode",
         "gpu_mux_label": "GPU / MUX",
         "battery": "Battery", "ac_power": "Power Cable",
-        "health": "Health",
+        "health": "Health", "gpu_suspended": "Asleep",
+        "throttled_last_hour": "Throttled {n}× in last hour", "throttling_now": "Throttling now",
         "power_saver_lbl": "Power Saver",
         "balanced_lbl": "Balanced", "performance_lbl": "Performance",
         "check_update": "Check for Updates", "download": "Download",
@@ -3,7 +3,7 @@
 HP Laptop Manager - Main Window
 Sidebar navigation ile 5 sekme + ayarlar.
 """
-import sys, os, json, fcntl
+import sys, os, json, fcntl, importlib
 
 # Single-instance handling is managed by Adw.Application below via DBus.
 
@@ -41,15 +41,22 @@ else:
 
 sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, os.path.dirname(BASE_DIR))
-
-from pages.games_page import GamesPage
-from pages.tools_page import ToolsPage
-from pages.fan_page import FanPage
-from pages.lighting_page import LightingPage
-from pages.mux_page import MUXPage
-from pages.settings_page import SettingsPage
-from pages.dashboard_page import DashboardPage
-from pages.keyboard_page import KeyboardPage
+sys.path.insert(0, os.path.join(os.path.dirname(BASE_DIR), "common"))  # checkout layout
+import startup_trace  # HP_MANAGER_TRACE=1 prints startup phase timings
+
+# Page modules are imported the first time the page is shown (_ensure_page)
+PAGES = {
+    "dashboard": ("pages.dashboard_page", "DashboardPage"),
+    "games":     ("pages.games_page", "GamesPage"),
+    "tools":     ("pages.tools_page", "ToolsPage"),
+    "fan":       ("pages.fan_page", "FanPage"),
+    "lighting":  ("pages.lighting_page", "LightingPage"),
+    "keyboard":  ("pages.keyboard_page", "KeyboardPage"),
+    "mux":       ("pages.mux_page", "MUXPage"),
+    "settings":  ("pages.settings_page", "SettingsPage"),
+}
+# Never torn down: the landing page and the page that changes app settings
+PINNED_PAGES = ("dashboard", "settings")
 
 APP_VERSION = "1.1.4"
 CONFIG_FILE = os.path.expanduser("~/.config/hp-manager.toml")
@@ -57,6 +64,7 @@ CONFIG_FILE_JSON = os.path.expanduser("~/.config/hp-manager.json")
 
 # ── TRANSLATIONS (centralized in i18n.py to avoid __main__ double-import) ──
 from i18n import T, set_lang, get_lang
+startup_trace.mark("imports")
 
 def get_model_branding():
     try:
@@ -91,9 +99,12 @@ class HPManagerWindow(Gtk.ApplicationWindow):
 
         self.app_theme = "dark"
         self.temp_unit = "C"
+        self.page_unload_after = 0  # seconds hidden before a page is destroyed; 0 = keep
         self.service = None
         self.ready = False
         self._rebuilding = False
+        self.pages = {}
+        self._unload_timers = {}
 
         self._load_config()
         
@@ -105,7 +116,8 @@ class HPManagerWindow(Gtk.ApplicationWindow):
         else:
             sm.set_color_scheme(Adw.ColorScheme.DEFAULT)
             
-        self._apply_css()
+        with startup_trace.phase("css"):
+            self._apply_css()
         self._build_ui()
         self._connect_daemon()
 
@@ -116,12 +128,14 @@ class HPManagerWindow(Gtk.ApplicationWindow):
                     data = tomllib.load(f)
                 self.app_theme = data.get("theme", "dark")
                 self.temp_unit = data.get("temp_unit", "C")
+                self.page_unload_after = max(0, int(data.get("page_unload_after", 0)))
                 set_lang(data.get("lang", "tr"))
             elif os.path.exists(CONFIG_FILE_JSON):
                 with open(CONFIG_FILE_JSON) as f:
                     data = json.load(f)
                 self.app_theme = data.get("theme", "dark")
                 self.temp_unit = data.get("temp_unit", "C")
+                self.page_unload_after = max(0, int(data.get("page_unload_after", 0)))
                 set_lang(data.get("lang", "tr"))
                 self._save_config()
             elif os.path.exists(CONFIG_FILE) and tomllib is None:
@@ -147,9 +161,11 @@ class HPManagerWindow(Gtk.ApplicationWindow):
                 f.write(f'theme = "{theme}"\n')
                 f.write(f'lang = "{lang}"\n')
                 f.write(f'temp_unit = "{temp_unit}"\n')
+                f.write(f'page_unload_after = {int(self.page_unload_after)}\n')
             # Also save JSON fallback for systems without tomllib
             with open(CONFIG_FILE_JSON, "w") as f:
-                json.dump({"theme": self.app_theme, "lang": get_lang(), "temp_unit": self.temp_unit}, f)
+                json.dump({"theme": self.app_theme, "lang": get_lang(), "temp_unit": self.temp_unit,
+                           "page_unload_after": int(self.page_unload_after)}, f)
         except Exception:
             pass
 
@@ -858,42 +874,9 @@ class HPManagerWindow(Gtk.ApplicationWindow):
         content.append(self.stack)
         main_box.append(content)
 
-        # ── Create pages ──
-        self.dashboard_page = DashboardPage(service=self.service, on_navigate=self._navigate)
-        self.games_page = GamesPage()
-        self.tools_page = ToolsPage(service=self.service)
-        self.fan_page = FanPage(service=self.service)
-        self.lighting_page = LightingPage(service=self.service)
-        self.keyboard_page = KeyboardPage(service=self.service)
-        self.mux_page = MUXPage(service=self.service)
-        self.settings_page = SettingsPage(
-            on_theme_change=self._on_theme_change,
-            on_lang_change=self._on_lang_change,
-            on_temp_unit_change=self._on_temp_unit_change
-        )
-
-        self.stack.add_named(self.dashboard_page, "dashboard")
-        self.stack.add_named(self.games_page, "games")
-        self.stack.add_named(self.tools_page, "tools")
-        self.stack.add_named(self.fan_page, "fan")
-        self.stack.add_named(self.lighting_page, "lighting")
-        self.stack.add_named(self.keyboard_page, "keyboard")
-        self.stack.add_named(self.mux_page, "mux")
-        self.stack.add_named(self.settings_page, "settings")
-
-        # Sync initial theme to gauges
-        self.fan_page.set_dark(self.app_theme == "dark")
-        self.fan_page.set_temp_unit(self.temp_unit)
-        self.dashboard_page.set_temp_unit(self.temp_unit)
-
-        # Sync settings dropdowns to saved config
-        self._rebuilding = True
-        self.settings_page.set_theme_index(0 if self.app_theme == "dark" else 1 if self.app_theme == "light" else 2)
-        self.settings_page.set_lang_index(0 if get_lang() == "tr" else 1)
-        self.settings_page.set_temp_unit_index(0 if self.temp_unit == "C" else 1)
-        self._rebuilding = False
-
-        # Select first page
+        # Pages are created on first navigation
+        if startup_trace.enabled:
+            self.connect("realize", self._on_realize)
         self._navigate("dashboard")
 
     def _make_nav_button(self, page_id, label, icon_name):
@@ -918,8 +901,73 @@ class HPManagerWindow(Gtk.ApplicationWindow):
         self.nav_buttons[page_id] = btn
         return btn
 
+    # ── Lazy pages ──
+    def _create_page(self, page_id):
+        module, cls_name = PAGES[page_id]
+        cls = getattr(importlib.import_module(module), cls_name)
+        if page_id == "dashboard":
+            return cls(service=self.service, on_navigate=self._navigate,
+                       on_first_data=self._on_first_dashboard_data)
+        if page_id == "games":
+            return cls()
+        if page_id == "settings":
+            return cls(
+                on_theme_change=self._on_theme_change,
+                on_lang_change=self._on_lang_change,
+                on_temp_unit_change=self._on_temp_unit_change
+            )
+        return cls(service=self.service)
+
+    def _ensure_page(self, page_id):
+        page = self.pages.get(page_id)
+        if page is not None:
+            return page
+        with startup_trace.phase(f"page:{page_id}"):
+            page = self.pages[page_id] = self._create_page(page_id)
+        self.stack.add_named(page, page_id)
+
+        # Sync theme, units and saved config into the new page
+        if hasattr(page, "set_dark"):
+            page.set_dark(self.app_theme == "dark")
+        if hasattr(page, "set_temp_unit"):
+            page.set_temp_unit(self.temp_unit)
+        if page_id == "settings":
+            was_rebuilding, self._rebuilding = self._rebuilding, True
+            page.set_theme_index(0 if self.app_theme == "dark" else 1 if self.app_theme == "light" else 2)
+            page.set_lang_index(0 if get_lang() == "tr" else 1)
+            page.set_temp_unit_index(0 if self.temp_unit == "C" else 1)
+            self._rebuilding = was_rebuilding
+        return page
+
+    def _destroy_page(self, page_id):
+        page = self.pages.pop(page_id, None)
+        if page is None:
+            return
+        if hasattr(page, "cleanup"):
+            page.cleanup()
+        self.stack.remove(page)
+
+    def _schedule_unload(self, page_id):
+        if self.page_unload_after <= 0 or page_id in PINNED_PAGES or page_id in self._unload_timers:
+            return
+        self._unload_timers[page_id] = GLib.timeout_add_seconds(
+            self.page_unload_after, self._unload_hidden_page, page_id)
+
+    def _unload_hidden_page(self, page_id):
+        self._unload_timers.pop(page_id, None)
+        if self.stack.get_visible_child_name() != page_id:
+            self._destroy_page(page_id)
+        return False
+
     def _navigate(self, page_id):
+        timer = self._unload_timers.pop(page_id, None)
+        if timer:
+            GLib.source_remove(timer)
+        previous = self.stack.get_visible_child_name()
+        self._ensure_page(page_id)
         self.stack.set_visible_child_name(page_id)
+        if previous and previous != page_id and previous in self.pages:
+            self._schedule_unload(previous)
 
         # Update active states
         for pid, btn in self.nav_buttons.items():
@@ -929,6 +977,20 @@ class HPManagerWindow(Gtk.ApplicationWindow):
                 if "active" in btn.get_css_classes():
                     btn.remove_css_class("active")
 
+    # ── Startup trace ──
+    def _on_realize(self, *_):
+        clock = self.get_frame_clock()
+        if clock:
+            handler = []
+            def after_paint(c):
+                c.disconnect(handler[0])
+                startup_trace.once("first frame")
+            handler.append(clock.connect("after-paint", after_paint))
+
+    def _on_first_dashboard_data(self):
+        startup_trace.once("dashboard data")
+        startup_trace.report("gui")
+
     def _update_logo(self):
         from gi.repository import Adw, GdkPixbuf
         import os
@@ -950,16 +1012,16 @@ class HPManagerWindow(Gtk.ApplicationWindow):
         try:
             from pydbus import SystemBus
             bus = SystemBus()
-            self.service = bus.get("com.yyl.hpmanager")
+            self.service = bus.get("com.yyl.hpmanager")  # introspection round trip
+            startup_trace.once("first D-Bus reply")
             self.ready = True
 
-            # Pass service to pages
-            self.dashboard_page.set_service(self.service)
-            self.fan_page.set_service(self.service)
-            self.lighting_page.set_service(self.service)
-            if hasattr(self, 'keyboard_page'):
-                self.keyboard_page.service = self.service
-            self.mux_page.set_service(self.service)
+            # Pass service to pages built so far; later ones get it at construction
+            for page in self.pages.values():
+                if hasattr(page, "set_service"):
+                    page.set_service(self.service)
+                elif hasattr(page, "service"):
+                    page.service = self.service
 
             print("✓ Daemon bağlantısı kuruldu")
         except Exception as e:
@@ -974,8 +1036,9 @@ class HPManagerWindow(Gtk.ApplicationWindow):
         self._apply_css()
         # Update fan gauges theme
         is_dark = theme == "dark"
-        if hasattr(self, 'fan_page'):
-            self.fan_page.set_dark(is_dark)
+        for page in self.pages.values():
+            if hasattr(page, "set_dark"):
+                page.set_dark(is_dark)
         # Update logo dynamically
         self._update_logo()
 
@@ -1005,67 +1068,27 @@ class HPManagerWindow(Gtk.ApplicationWindow):
             return
         self.temp_unit = unit
         self._save_config()
-        if hasattr(self, 'fan_page'):
-            self.fan_page.set_temp_unit(unit)
-        if hasattr(self, 'dashboard_page'):
-            self.dashboard_page.set_temp_unit(unit)
+        for page in self.pages.values():
+            if hasattr(page, "set_temp_unit"):
+                page.set_temp_unit(unit)
 
     def _rebuild_pages(self):
-        """Destroy and recreate all pages so T() picks up the new language."""
+        """Destroy all pages so T() picks up the new language; only the visible one is rebuilt now."""
         self._rebuilding = True
         try:
             current_page = self.stack.get_visible_child_name()
 
-            # Cleanup old pages
-            if hasattr(self, 'dashboard_page'):
-                self.dashboard_page.cleanup()
-            if hasattr(self, 'fan_page'):
-                self.fan_page.cleanup()
-            if hasattr(self, 'lighting_page'):
-                self.lighting_page.cleanup()
-
-            # Remove old pages from stack
-            for name in ("dashboard", "games", "tools", "fan", "lighting", "mux", "settings"):
-                child = self.stack.get_child_by_name(name)
-                if child:
-                    self.stack.remove(child)
+            for timer in self._unload_timers.values():
+                GLib.source_remove(timer)
+            self._unload_timers.clear()
+            for page_id in list(self.pages):
+                self._destroy_page(page_id)
 
             # Update sidebar nav labels
             for page_id, lbl_widget in self.nav_labels.items():
                 key = page_id  # matches i18n key
                 lbl_widget.set_label(T(key) if key != "mux" else "MUX")
 
-            # Recreate pages
-            self.dashboard_page = DashboardPage(service=self.service)
-            self.games_page = GamesPage()
-            self.tools_page = ToolsPage(service=self.service)
-            self.fan_page = FanPage(service=self.service)
-            self.lighting_page = LightingPage(service=self.service)
-            self.mux_page = MUXPage(service=self.service)
-            self.settings_page = SettingsPage(
-                on_theme_change=self._on_theme_change,
-                on_lang_change=self._on_lang_change,
-                on_temp_unit_change=self._on_temp_unit_change
-            )
-
-            self.stack.add_named(self.dashboard_page, "dashboard")
-            self.stack.add_named(self.games_page, "games")
-            self.stack.add_named(self.tools_page, "tools")
-            self.stack.add_named(self.fan_page, "fan")
-            self.stack.add_named(self.lighting_page, "lighting")
-            self.stack.add_named(self.mux_page, "mux")
-            self.stack.add_named(self.settings_page, "settings")
-
-            # Restore theme + temp_unit state
-            self.fan_page.set_dark(self.app_theme == "dark")
-            self.fan_page.set_temp_unit(self.temp_unit)
-            self.dashboard_page.set_temp_unit(self.temp_unit)
-
-            # Restore settings dropdowns
-            self.settings_page.set_theme_index(0 if self.app_theme == "dark" else 1 if self.app_theme == "light" else 2)
-            self.settings_page.set_lang_index(0 if get_lang() == "tr" else 1)
-            self.settings_page.set_temp_unit_index(0 if self.temp_unit == "C" else 1)
-
             # Restore page
             self._navigate(current_page or "dashboard")
         finally:
@@ -1074,12 +1097,9 @@ class HPManagerWindow(Gtk.ApplicationWindow):
 
     def do_close_request(self):
         """Cleanup on close."""
-        if hasattr(self, 'dashboard_page'):
-            self.dashboard_page.cleanup()
-        if hasattr(self, 'lighting_page'):
-            self.lighting_page.cleanup()
-        if hasattr(self, 'fan_page'):
-            self.fan_page.cleanup()
+        for page in self.pages.values():
+            if hasattr(page, "cleanup"):
+                page.cleanup()
         try:
             self.get_application().quit()
         except:
@@ -5,11 +5,13 @@ Provides system overview: temps, battery, hardware profile, resource usage,
 and quick actions.  All heavy I/O runs in a background thread.
 """
 
-import gi, math, json, subprocess, os, shutil, threading
+import gi, math, json, subprocess, os, threading
 
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk, GLib, Gdk
 from widgets.smooth_scroll import SmoothScrolledWindow
+from telemetry_codec import TelemetryMirror
+from procstat import ProcSampler
 import cairo
 
 # ── Lazy i18n import ─────────────────────────────────────────────────────────
@@ -108,6 +110,45 @@ class DonutChart(Gtk.DrawingArea):
         cr.move_to(cx - ext2.width / 2, cy + 18)
         cr.show_text(self.label)
 
+# ═════════════════════════════════════════════════════════════════════════════
+#  CORE BARS  –  per-core load strip
+# ═════════════════════════════════════════════════════════════════════════════
+class CoreBars(Gtk.DrawingArea):
+    """One thin vertical bar per logical CPU, height = load %."""
+
+    def __init__(self, color_hex: str, height: int = 36):
+        super().__init__()
+        self.set_content_height(height)
+        self.set_hexpand(True)
+        self.values = []
+        self._rgb = DonutChart._parse_hex(color_hex)
+        self.set_draw_func(self._draw)
+
+    def set_values(self, values):
+        vals = [max(0.0, min(100.0, v)) for v in values]
+        if len(vals) == len(self.values) and all(
+                abs(a - b) < 1.0 for a, b in zip(vals, self.values)):
+            return
+        self.values = vals
+        self.set_visible(bool(vals))
+        self.queue_draw()
+
+    def _draw(self, _area, cr, w, h):
+        n = len(self.values)
+        if not n:
+            return
+        gap = 2.0 if w / n > 6 else 1.0
+        bw = max(1.0, (w - gap * (n - 1)) / n)
+        for i, v in enumerate(self.values):
+            x = i * (bw + gap)
+            cr.set_source_rgba(0.4, 0.4, 0.4, 0.2)
+            cr.rectangle(x, 0, bw, h)
+            cr.fill()
+            bh = h * v / 100.0
+            cr.set_source_rgba(*self._rgb, 0.9)
+            cr.rectangle(x, h - bh, bw, bh)
+            cr.fill()
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  PERF SLIDER  –  Animated segmented control
 # ═════════════════════════════════════════════════════════════════════════════
@@ -118,51 +159,104 @@ class DonutChart(Gtk.DrawingArea):
 #  DASHBOARD PAGE
 # ═════════════════════════════════════════════════════════════════════════════
 _REFRESH_MS = 5000          # background fetch period
-_NVIDIA_SMI = None          # cached shutil.which result
+_SUBSCRIBED_REFRESH_MS = 15000  # daemon data is pushed; battery/conflict only
 
 class DashboardPage(Gtk.Box):
     """Main dashboard: 4-pane grid with info bar."""
 
-    def __init__(self, service=None, on_navigate=None):
+    def __init__(self, service=None, on_navigate=None, on_first_data=None):
         super().__init__()
         self.set_orientation(Gtk.Orientation.VERTICAL)
         self.set_spacing(0)
         self.service = service
         self.on_navigate = on_navigate
+        self.on_first_data = on_first_data  # startup trace hook, called once
         self._timer_id = None
-        self._cpu_prev = None       # (total, idle) for delta calc
-        self._cpu_smooth = 0.0      # EMA-smoothed CPU %
+        self._proc = None           # local /proc sampler, older daemons only
         self._data = {}             # latest bg-fetched snapshot
         self._busy = False          # guard against overlapping bg threads
         self._temp_unit = "C"       # temperature unit preference
         self._conflict_cache = None  # cached TLP/auto-cpufreq result
         self._conflict_counter = 0   # check conflict every 10 cycles
-
-        global _NVIDIA_SMI
-        if _NVIDIA_SMI is None:
-            _NVIDIA_SMI = shutil.which("nvidia-smi") or ""
+        self._tel_sub = None         # TelemetryUpdated subscription
+        self._mirror = TelemetryMirror()  # GetTelemetryDelta client state
+        self._has_delta = True
 
         self._build()
-        self._timer_id = GLib.timeout_add(_REFRESH_MS, self._tick)
-        GLib.idle_add(self._tick)
+        self._subscribe()
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
 
     # ── public ────────────────────────────────────────────────────────────
     def set_service(self, svc):
         self.service = svc
+        self._subscribe()
 
     def set_temp_unit(self, unit):
         self._temp_unit = unit
 
     def _format_temp(self, celsius):
         """Format temperature value for display in the user's preferred unit."""
+        if isinstance(celsius, str):
+            # Daemon markers: "SUSPENDED" (dGPU runtime-suspended), "NOT_REACHABLE"
+            return T("gpu_suspended") if celsius == "SUSPENDED" else "--"
         if self._temp_unit == "F":
             return f"{int(celsius * 9 / 5 + 32)}°F"
         return f"{int(celsius)}°C"
 
     def cleanup(self):
+        self._on_unmap()
+        self._unsubscribe()
+        if self._proc:
+            self._proc.close()
+            self._proc = None
+
+    # ── daemon signals ────────────────────────────────────────────────────
+    def _subscribe(self):
+        """Daemon pushes telemetry (temps, CPU/RAM load, dGPU); the local
+        timer then only covers battery. Older daemons keep the polling path."""
+        self._unsubscribe()
+        if self.service:
+            try:
+                self._tel_sub = self.service.TelemetryUpdated.connect(self._on_telemetry)
+            except Exception:
+                self._tel_sub = None
         if self._timer_id:
-            GLib.source_remove(self._timer_id)
-            self._timer_id = None
+            self._start_timer()  # period depends on the subscription
+
+    def _unsubscribe(self):
+        if self._tel_sub:
+            try:
+                self._tel_sub.disconnect()
+            except Exception:
+                pass
+            self._tel_sub = None
+
+    def _on_telemetry(self, j):
+        try:
+            tel = json.loads(j)
+        except Exception:
+            return
+        d = dict(self._data)
+        self._merge_telemetry(d, tel)
+        self._data = d
+        if self.get_mapped():
+            self._apply()
+
+    @staticmethod
+    def _merge_telemetry(d, tel):
+        for key in ("sys", "fan", "pp", "gpu", "dgpu", "cpu", "mem", "psi", "thermal"):
+            if key in tel:
+                d[key] = tel[key]
+        si = d.get("sys", {})
+        if si.get("cpu_temp"):
+            d["cpu_temp"] = si["cpu_temp"]
+        if si.get("gpu_temp"):
+            d["gpu_temp"] = si["gpu_temp"]
+        # GPU % — sampled by the daemon through NVML, gated on runtime PM
+        dgpu = d.get("dgpu")
+        if dgpu and dgpu.get("present"):
+            d["gpu_pct"] = float(dgpu.get("util", 0))
 
     # ═════════════════════════════════════════════════════════════════════════
     #  UI CONSTRUCTION
@@ -229,6 +323,11 @@ class DashboardPage(Gtk.Box):
         self._cpu_temp = self._mk_sensor(temps, "CPU")
         self._gpu_temp = self._mk_sensor(temps, "GPU")
 
+        # Throttling summary from the daemon's thermal event detector
+        self._throttle_lbl = Gtk.Label(label="", css_classes=["dim-label"])
+        self._throttle_lbl.set_visible(False)
+        card.append(self._throttle_lbl)
+
         card.append(Gtk.Separator())
 
         # Battery — large donut + textual details
@@ -320,6 +419,10 @@ class DashboardPage(Gtk.Box):
         row.append(self._ram_chart)
         row.append(self._gpu_chart)
         card.append(row)
+
+        self._core_bars = CoreBars("#3584e4")
+        self._core_bars.set_visible(False)
+        card.append(self._core_bars)
         return card
 
     # ── Quick Actions ─────────────────────────────────────────────────────
@@ -438,30 +541,63 @@ class DashboardPage(Gtk.Box):
     # ═════════════════════════════════════════════════════════════════════════
     #  BACKGROUND DATA FETCH  –  keeps UI thread free
     # ═════════════════════════════════════════════════════════════════════════
+    def _on_map(self, *_):
+        """The background fetch runs only while the page is shown."""
+        self._tick()
+        self._start_timer()
+
+    def _on_unmap(self, *_):
+        if self._timer_id:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def _start_timer(self):
+        if self._timer_id:
+            GLib.source_remove(self._timer_id)
+        period = _SUBSCRIBED_REFRESH_MS if self._tel_sub else _REFRESH_MS
+        self._timer_id = GLib.timeout_add(period, self._tick)
+
     def _tick(self):
         if self._busy:
             return True
-        if not self.get_mapped():
-            return True
         self._busy = True
         threading.Thread(target=self._fetch, daemon=True).start()
         return True
 
+    def _fetch_telemetry(self, svc):
+        """Fields changed since the last poll as native D-Bus values;
+        the JSON snapshot on daemons without GetTelemetryDelta."""
+        if self._has_delta:
+            try:
+                return self._mirror.update(svc)
+            except Exception:
+                self._has_delta = False
+        return json.loads(svc.GetTelemetry())
+
     def _fetch(self):
-        """Run ALL blocking I/O here (daemon D-Bus, /proc, nvidia-smi)."""
+        """Run ALL blocking I/O here (daemon D-Bus, /proc, sysfs)."""
         d = {}
         svc = self.service
 
         # ── Daemon calls ──────────────────────────────────────────────────
-        if svc:
-            for key, method in (("sys", "GetSystemInfo"),
-                                ("fan", "GetFanInfo"),
-                                ("pp",  "GetPowerProfile"),
-                                ("gpu", "GetGpuInfo")):
-                try:
-                    d[key] = json.loads(getattr(svc, method)())
-                except Exception:
-                    pass
+        # With a TelemetryUpdated subscription the daemon data arrives by
+        # signal; only the first tick fetches it to seed the page.
+        # Otherwise one GetTelemetry call returns the daemon's shared
+        # snapshot (sys/fan/pp/gpu), or per-method calls on older daemons.
+        if self._tel_sub and "sys" in self._data:
+            self._merge_telemetry(d, self._data)
+        elif svc:
+            try:
+                self._merge_telemetry(d, self._fetch_telemetry(svc))
+            except Exception:
+                for key, method in (("sys", "GetSystemInfo"),
+                                    ("fan", "GetFanInfo"),
+                                    ("pp",  "GetPowerProfile"),
+                                    ("gpu", "GetGpuInfo")):
+                    try:
+                        d[key] = json.loads(getattr(svc, method)())
+                    except Exception:
+                        pass
 
         # ── CPU/GPU temp — prefer daemon values for consistency with fan page ─
         si = d.get("sys", {})
@@ -470,78 +606,22 @@ class DashboardPage(Gtk.Box):
         # Fallback to direct hwmon only if daemon didn't provide temps
         if not d["cpu_temp"]:
             d["cpu_temp"] = self._get_cpu_temp()
-        if not d["gpu_temp"]:
+        if not d["gpu_temp"] and "dgpu" not in d:
+            # Older daemon: the current one gates dGPU reads on runtime PM itself
             d["gpu_temp"] = self._get_gpu_temp()
 
-        # ── CPU % from /proc/stat ─────────────────────────────────────────
-        try:
-            with open("/proc/stat") as f:
-                parts = f.readline().split()
-            times = list(map(int, parts[1:]))
-            total = sum(times)
-            idle = times[3] + (times[4] if len(times) > 4 else 0)
-            if self._cpu_prev:
-                dt = total - self._cpu_prev[0]
-                di = idle  - self._cpu_prev[1]
-                raw = (1 - di / dt) * 100 if dt else 0
-                # EMA smoothing (α=0.3) to reduce jitter
-                alpha = 0.3
-                self._cpu_smooth = alpha * raw + (1 - alpha) * self._cpu_smooth
-                d["cpu_pct"] = self._cpu_smooth
-            self._cpu_prev = (total, idle)
-        except Exception:
-            pass
-
-        # ── RAM % from /proc/meminfo ──────────────────────────────────────
-        try:
-            mem = {}
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    k, v = line.split(":", 1)
-                    mem[k.strip()] = int(v.split()[0])
-            mt = mem.get("MemTotal", 1)
-            ma = mem.get("MemAvailable", mt)
-            d["ram_pct"] = (1 - ma / mt) * 100
-        except Exception:
-            pass
-
-        # ── GPU % from nvidia-smi ─────────────────────────────────────────
-        if _NVIDIA_SMI:
-            # Check if dGPU is suspended to avoid waking it
-            is_awake = True
-            pci_path = None
+        # ── CPU / RAM % — sampled by the daemon; parsed here only for older daemons ─
+        if "cpu" not in d:
             try:
-                for dev in os.listdir("/sys/bus/pci/devices"):
-                    vendor_file = f"/sys/bus/pci/devices/{dev}/vendor"
-                    if os.path.exists(vendor_file):
-                        with open(vendor_file) as f:
-                            if f.read().strip() == "0x10de":
-                                pci_path = f"/sys/bus/pci/devices/{dev}/power/runtime_status"
-                                break
+                if self._proc is None:
+                    self._proc = ProcSampler()
+                local = self._proc.sample()
+                d["cpu_pct"] = local["cpu"]["usage"]
+                d["cores"] = local["cpu"]["cores"]
+                d["ram_pct"] = local["mem"]["used_pct"]
             except Exception:
                 pass
 
-            if pci_path and os.path.exists(pci_path):
-                try:
-                    with open(pci_path) as f:
-                        if f.read().strip() == "suspended":
-                            is_awake = False
-                except Exception:
-                    pass
-
-            if is_awake:
-                try:
-                    out = subprocess.check_output(
-                        [_NVIDIA_SMI, "--query-gpu=utilization.gpu",
-                         "--format=csv,noheader,nounits"],
-                        stderr=subprocess.DEVNULL, timeout=3
-                    ).decode().strip()
-                    d["gpu_pct"] = float(out)
-                except Exception:
-                    pass
-            else:
-                d["gpu_pct"] = 0.0
-
         # ── Battery from sysfs ────────────────────────────────────────────
         for name in ("BAT0", "BAT1", "BATT"):
             bp = f"/sys/class/power_supply/{name}"
@@ -575,13 +655,23 @@ class DashboardPage(Gtk.Box):
                     pass
         d["power_conflict"] = self._conflict_cache
 
+        GLib.idle_add(self._on_fetched, d)
+
+    def _on_fetched(self, d):
+        self._busy = False
+        # A signal may have delivered fresher daemon data while we fetched
+        if self._tel_sub:
+            self._merge_telemetry(d, self._data)
         self._data = d
-        GLib.idle_add(self._apply)
+        self._apply()
+        return False
 
     # ── Apply data to widgets (main thread) ───────────────────────────────
     def _apply(self):
         d = self._data
-        self._busy = False
+        if self.on_first_data:
+            cb, self.on_first_data = self.on_first_data, None
+            cb()
 
         # Info bar
         si = d.get("sys", {})
@@ -593,6 +683,17 @@ class DashboardPage(Gtk.Box):
         self._cpu_temp.set_label(self._format_temp(d.get('cpu_temp', 0)))
         self._gpu_temp.set_label(self._format_temp(d.get('gpu_temp', 0)))
 
+        th = d.get("thermal")
+        if th:
+            n, active = th.get("events_last_hour", 0), th.get("throttling")
+            if active:
+                self._throttle_lbl.set_label(T("throttling_now"))
+                self._throttle_lbl.add_css_class("warning-text")
+            else:
+                self._throttle_lbl.set_label(T("throttled_last_hour").format(n=n))
+                self._throttle_lbl.remove_css_class("warning-text")
+            self._throttle_lbl.set_visible(bool(n or active))
+
         # Battery
         cap = d.get("bat_cap")
         if cap is not None:
@@ -611,8 +712,10 @@ class DashboardPage(Gtk.Box):
             self._bat_health_lbl.set_label("")
 
         # Resources
-        self._cpu_chart.set_value(d.get("cpu_pct", 0))
-        self._ram_chart.set_value(d.get("ram_pct", 0))
+        cpu, mem = d.get("cpu"), d.get("mem")
+        self._cpu_chart.set_value(cpu["usage"] if cpu else d.get("cpu_pct", 0))
+        self._core_bars.set_values(cpu["cores"] if cpu else d.get("cores", []))
+        self._ram_chart.set_value(mem["used_pct"] if mem else d.get("ram_pct", 0))
         self._gpu_chart.set_value(d.get("gpu_pct", 0))
 
         # Hardware profile pills
@@ -707,15 +810,6 @@ class DashboardPage(Gtk.Box):
 
     @classmethod
     def _get_gpu_temp(cls):
-        if _NVIDIA_SMI:
-            try:
-                return float(subprocess.check_output(
-                    [_NVIDIA_SMI, "--query-gpu=temperature.gpu",
-                     "--format=csv,noheader,nounits"],
-                    stderr=subprocess.DEVNULL, timeout=3
-                ).decode().strip())
-            except Exception:
-                pass
         hp = cls._find_hwmon("amdgpu")
         if hp:
             try:
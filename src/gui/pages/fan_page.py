@@ -2,7 +2,7 @@
 """
 Fan & Power Control Page — v1.0.1 with i18n.
 """
-import os, json, subprocess, shutil, glob, threading, time
+import os, json, subprocess, shutil, threading, time
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk, GLib, Gdk, GObject
@@ -13,16 +13,31 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 # CircularGauge integration removed as per instruction
 from widgets.fan_curve import FanCurveWidget
+from widgets.history_chart import HistoryChart
+from telemetry_codec import TelemetryMirror
+from uevent import UeventMonitor
 import cairo
 import math
 
+SPARK_SECONDS = 120          # sparkline window seeded from the daemon
+HISTORY_REFRESH_S = 30
+MONITOR_POLL_S = 2.5         # daemon polling (no signals) and the expanded sensor list
+CONFLICT_CHECK_S = 25        # TLP / auto-cpufreq check
+HISTORY_RANGES = ((600, "range_10m"), (86400, "range_24h"), (7 * 86400, "range_7d"))
+HISTORY_SERIES = (("CPU", "sys.cpu_temp", (0.3, 0.6, 1.0)),
+                  ("GPU", "sys.gpu_temp", (0.9, 0.4, 0.1)))
+
+
 class FanSparkline(Gtk.DrawingArea):
-    def __init__(self, color, history_len=60):
+    """RPM over the last `span` seconds, plotted against the daemon's sample
+    time; the newest value is held up to the right edge (now)."""
+
+    def __init__(self, color, span=SPARK_SECONDS):
         super().__init__()
         self.set_size_request(-1, 30)
         self.color = color
-        self.history_len = history_len
-        self.history = [0] * history_len
+        self.span = span
+        self.points = []  # (t, value), oldest first
         self._dark = True
         self.set_draw_func(self._draw)
 
@@ -30,18 +45,43 @@ class FanSparkline(Gtk.DrawingArea):
         self._dark = is_dark
         self.queue_draw()
 
-    def add_value(self, val):
-        self.history.pop(0)
-        self.history.append(val)
+    def add_sample(self, t, val):
+        """Append a telemetry sample; a t not newer than the last point
+        (the same snapshot seen again) only redraws."""
+        if t and (not self.points or t > self.points[-1][0]):
+            self.points.append((t, val))
+            self._trim(t)
         self.queue_draw()
 
+    def set_values(self, ts, vals):
+        """Seed from the daemon's history (oldest first); live samples newer
+        than the seed are kept."""
+        seed = list(zip(ts, vals))
+        if seed:
+            self.points = seed + [p for p in self.points if p[0] > seed[-1][0]]
+        if self.points:
+            self._trim(self.points[-1][0])
+        self.queue_draw()
+
+    def _trim(self, now):
+        # keep one point left of the window so the line reaches the left edge
+        cut = now - self.span
+        while len(self.points) > 1 and self.points[1][0] <= cut:
+            self.points.pop(0)
+
     def _draw(self, _, cr, w, h):
+        if not self.points:
+            return
         cr.set_line_width(2)
         cr.set_line_cap(1)
         cr.set_line_join(1)
-        
-        max_val = max(max(self.history), 100) # prevent div by 0 and give baseline scale
-        
+
+        max_val = max(max(v for _, v in self.points), 100) # prevent div by 0 and give baseline scale
+        now = max(time.time(), self.points[-1][0])
+        xy = [(w - (now - t) / self.span * w, h - (val / max_val) * (h - 2))
+              for t, val in self.points]
+        xy.append((w, xy[-1][1]))  # hold the last sample up to now
+
         # Draw gradient under the line
         cr.save()
         pattern = cairo.LinearGradient(0, 0, 0, h)
@@ -54,14 +94,9 @@ class FanSparkline(Gtk.DrawingArea):
             
         cr.set_source(pattern)
 
-        dx = w / (self.history_len - 1)
-        cr.move_to(0, h)
-        
-        for i, val in enumerate(self.history):
-            x = i * dx
-            y = h - (val / max_val) * (h - 2)
+        cr.move_to(xy[0][0], h)
+        for x, y in xy:
             cr.line_to(x, y)
-            
         cr.line_to(w, h)
         cr.close_path()
         cr.fill()
@@ -69,17 +104,13 @@ class FanSparkline(Gtk.DrawingArea):
         
         # Draw line graph
         cr.set_source_rgb(*self.color)
-        for i, val in enumerate(self.history):
-            x = i * dx
-            y = h - (val / max_val) * (h - 2)
-            if i == 0:
-                cr.move_to(x, y)
-            else:
-                cr.line_to(x, y)
+        cr.move_to(*xy[0])
+        for x, y in xy[1:]:
+            cr.line_to(x, y)
         cr.stroke()
         
         # Draw dot on current value
-        current_y = h - (self.history[-1] / max_val) * (h - 2)
+        current_y = xy[-1][1]
         cr.arc(w - 2, current_y, 3, 0, 2 * math.pi)
         if self._dark:
             cr.set_source_rgb(1, 1, 1)
@@ -87,6 +118,7 @@ class FanSparkline(Gtk.DrawingArea):
             cr.set_source_rgb(*self.color)
         cr.fill()
 
+
 class RotatingFanWidget(Gtk.DrawingArea):
     def __init__(self, size=160):
         super().__init__()
@@ -203,10 +235,94 @@ def _find_hwmon_by_name(name):
     return None
 
 
+class HwmonSensorRegistry:
+    """
+    All hwmon temp*_input sensors, discovered once: chip names and labels
+    are read at scan time and every input stays open, so a sample is one
+    pread per sensor. A scan happens on first use and after invalidate()
+    (udev hwmon add/remove) or a failed read (device went away).
+    """
+    BASE = "/sys/class/hwmon"
+
+    def __init__(self):
+        self._sensors = []   # [(driver, label, fd)]
+        self._dirty = True
+        self.stats = {"scans": 0, "samples": 0, "syscalls": 0}
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _read(self, path):
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            return os.read(fd, 256).decode(errors="replace").strip()
+        finally:
+            os.close(fd)
+            self.stats["syscalls"] += 3
+
+    def _scan(self):
+        self.close()
+        sensors = []
+        try:
+            chips = sorted(os.listdir(self.BASE))
+            self.stats["syscalls"] += 4  # openat, getdents64 x2, close
+        except OSError:
+            chips = []
+        for d in chips:
+            path = os.path.join(self.BASE, d)
+            try:
+                name = self._read(os.path.join(path, "name"))
+                entries = os.listdir(path)
+                self.stats["syscalls"] += 4
+            except OSError:
+                continue
+            inputs = sorted(e for e in entries if e.startswith("temp") and e.endswith("_input"))
+            for inp in inputs:
+                base = inp[:-len("_input")]
+                label = base
+                if f"{base}_label" in entries:
+                    try:
+                        label = self._read(os.path.join(path, f"{base}_label"))
+                    except OSError:
+                        pass
+                try:
+                    fd = os.open(os.path.join(path, inp), os.O_RDONLY | os.O_CLOEXEC)
+                    self.stats["syscalls"] += 1
+                except OSError:
+                    continue
+                sensors.append((name, label, fd))
+        self._sensors = sensors
+        self._dirty = False
+        self.stats["scans"] += 1
+
+    def sample(self):
+        if self._dirty:
+            self._scan()
+        out = []
+        for driver, label, fd in self._sensors:
+            try:
+                temp = int(os.pread(fd, 32, 0)) / 1000
+            except (OSError, ValueError):
+                self._dirty = True  # chip removed or renumbered: rescan next time
+                continue
+            out.append({"driver": driver, "label": label, "temp": temp})
+        self.stats["samples"] += 1
+        self.stats["syscalls"] += len(self._sensors)
+        return out
+
+    def close(self):
+        for _, _, fd in self._sensors:
+            try: os.close(fd)
+            except OSError: pass
+        self._sensors = []
+
+
 class SystemMonitor(threading.Thread):
-    def __init__(self, service_provider):
+    def __init__(self, service_provider, on_local_update=None):
         super().__init__(daemon=True)
         self.service_provider = service_provider
+        self.on_local_update = on_local_update  # sensors/conflict changed
+        self.subscribed = False  # daemon data pushed via set_telemetry()
         self.running = True
         self.lock = threading.Lock()
         self.data = {
@@ -216,35 +332,84 @@ class SystemMonitor(threading.Thread):
             "power_profile": dict(),
             "all_sensors": [],
             "power_conflict": None,
+            "timestamp": 0.0,  # daemon sample time of fan_info
         }
         self._conflict_cache = None
-        self._conflict_counter = 0
+        self._conflict_due = 0.0
+        self._mirror = TelemetryMirror()
+        self._has_delta = True
+        self._wake = threading.Event()
+        self.visible = False  # nothing is sampled while the page is hidden
+        self.sensors_enabled = False  # sample hwmon only while the list is expanded
+        self._registry = HwmonSensorRegistry()
+        try:
+            self._uevents = UeventMonitor({"hwmon"})
+        except OSError:
+            self._uevents = None  # failed reads still trigger a rescan
+
+    def _fetch_telemetry(self, service):
+        """Polling path: only fields changed since the last poll, as native
+        D-Bus values. Falls back to the JSON snapshot on older daemons."""
+        if self._has_delta:
+            try:
+                return self._mirror.update(service)
+            except Exception:
+                self._has_delta = False
+        return json.loads(service.GetTelemetry())
+
+    def set_telemetry(self, tel):
+        """Store a TelemetryUpdated payload (called on the main loop)."""
+        si = tel.get("sys", {})
+        with self.lock:
+            self.data["cpu_temp"] = si.get("cpu_temp", 0.0)
+            self.data["gpu_temp"] = si.get("gpu_temp", 0.0)
+            self.data["fan_info"] = tel.get("fan", {})
+            self.data["power_profile"] = tel.get("pp", {})
+            self.data["timestamp"] = tel.get("timestamp", 0.0)
 
     def run(self):
         while self.running:
-            c, g = 0.0, 0.0
+            if not self.visible:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            c, g, ts = 0.0, 0.0, 0.0
             fi, pp, si = {}, {}, {}
             service = self.service_provider()
-            
-            if service:
-                try: 
-                    si = json.loads(service.GetSystemInfo())
-                    c = si.get("cpu_temp", 0.0)
-                    g = si.get("gpu_temp", 0.0)
-                except Exception: pass
-                
-                try: fi = json.loads(service.GetFanInfo())
-                except Exception: pass
-                
-                try: pp = json.loads(service.GetPowerProfile())
-                except Exception: pass
+            polled = service is not None and not self.subscribed
+
+            if polled:
+                try:
+                    tel = self._fetch_telemetry(service)
+                    si = tel.get("sys", {})
+                    fi = tel.get("fan", {})
+                    pp = tel.get("pp", {})
+                    ts = tel.get("timestamp", 0.0)
+                except Exception:
+                    # Older daemon without GetTelemetry
+                    try: si = json.loads(service.GetSystemInfo())
+                    except Exception: pass
 
-            sensors = self._get_all_sensors()
+                    try: fi = json.loads(service.GetFanInfo())
+                    except Exception: pass
+
+                    try: pp = json.loads(service.GetPowerProfile())
+                    except Exception: pass
+                c = si.get("cpu_temp", 0.0)
+                g = si.get("gpu_temp", 0.0)
+                ts = ts or time.time()  # older daemons: every poll is a fresh sample
+
+            if self._uevents and self._uevents.read_events():
+                self._registry.invalidate()
+            if self.sensors_enabled:
+                sensors = self._registry.sample()
+            else:
+                sensors = self.data["all_sensors"]
 
-            # Check for TLP / auto-cpufreq conflict (cached, every 10 cycles ~25s)
-            self._conflict_counter += 1
-            if self._conflict_counter >= 10:
-                self._conflict_counter = 0
+            # Check for TLP / auto-cpufreq conflict (cached, every CONFLICT_CHECK_S)
+            now = time.monotonic()
+            if now >= self._conflict_due:
+                self._conflict_due = now + CONFLICT_CHECK_S
                 self._conflict_cache = None
                 for tool in ("tlp", "auto-cpufreq"):
                     try:
@@ -257,40 +422,38 @@ class SystemMonitor(threading.Thread):
                         pass
 
             with self.lock:
-                self.data["cpu_temp"] = c
-                self.data["gpu_temp"] = g
-                self.data["fan_info"] = fi
-                self.data["power_profile"] = pp
+                if polled:
+                    self.data["cpu_temp"] = c
+                    self.data["gpu_temp"] = g
+                    self.data["fan_info"] = fi
+                    self.data["power_profile"] = pp
+                    self.data["timestamp"] = ts
+                local_changed = (sensors != self.data["all_sensors"] or
+                                 self._conflict_cache != self.data["power_conflict"])
                 self.data["all_sensors"] = sensors
                 self.data["power_conflict"] = self._conflict_cache
-                
-            time.sleep(2.5)
 
-    def _get_all_sensors(self):
-        sensors = []
-        try:
-            for d in sorted(os.listdir("/sys/class/hwmon")):
-                path = os.path.join("/sys/class/hwmon", d)
-                name = "unknown"
-                try:
-                    with open(os.path.join(path, "name")) as f:
-                        name = f.read().strip()
-                except Exception: continue
-
-                for tf in sorted(glob.glob(os.path.join(path, "temp*_input"))):
-                    try:
-                        with open(tf) as f:
-                            temp = int(f.read().strip()) / 1000
-                        label_file = tf.replace("_input", "_label")
-                        try:
-                            with open(label_file) as f:
-                                label = f.read().strip()
-                        except Exception:
-                            label = os.path.basename(tf).replace("_input", "")
-                        sensors.append({"driver": name, "label": label, "temp": temp})
-                    except Exception: pass
-        except Exception: pass
-        return sensors
+            if local_changed and self.subscribed and self.on_local_update:
+                GLib.idle_add(self.on_local_update)
+            # Subscribed with the sensor list collapsed, only the conflict check is left
+            if polled or self.sensors_enabled:
+                self._wake.wait(MONITOR_POLL_S)
+            else:
+                self._wake.wait(max(self._conflict_due - time.monotonic(), 0))
+            self._wake.clear()
+        self._registry.close()
+        if self._uevents:
+            self._uevents.close()
+
+    def set_visible(self, visible):
+        self.visible = visible
+        if visible:
+            self._wake.set()  # catch up right away
+
+    def set_sensors_enabled(self, enabled):
+        self.sensors_enabled = enabled
+        if enabled:
+            self._wake.set()  # fill the list right away
 
     def get_data(self):
         with self.lock:
@@ -298,6 +461,7 @@ class SystemMonitor(threading.Thread):
 
     def stop(self):
         self.running = False
+        self._wake.set()
 
 
 class FanPage(Gtk.Box):
@@ -311,18 +475,148 @@ class FanPage(Gtk.Box):
         self._sensors_expanded = False
         self.temp_unit = "C"  # "C" or "F"
         
-        # Stability vars
-        self.temp_history = []
-        self.last_applied_rpm = {} # {fan_idx: rpm}
-        
         self._block_sync = False  # Prevents UI reverting due to stale cached data
-
-        self.monitor = SystemMonitor(lambda: self.service)
+        self._tel_sub = None
+        self._timer = None
+        self._history_span = HISTORY_RANGES[0][0]
+        self._history_busy = False
+        self._history_timer = None
+        self._anim_timer = None
+
+        self.monitor = SystemMonitor(lambda: self.service, on_local_update=self._on_local_update)
         self.monitor.start()
 
         self._build_ui()
-        self._timer = GLib.timeout_add(1000, self._refresh)
-        self._anim_timer = GLib.timeout_add(33, self._anim_tick)
+        self._subscribe()
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
+
+    def _on_map(self, *_):
+        """Sampling, fan animation and history refresh run only while shown."""
+        self.monitor.set_visible(True)
+        if not self._anim_timer:
+            self._anim_timer = GLib.timeout_add(33, self._anim_tick)
+        if not self._history_timer:
+            self._history_timer = GLib.timeout_add_seconds(HISTORY_REFRESH_S, self._history_tick)
+        self._refresh()
+        self._load_history()
+
+    def _on_unmap(self, *_):
+        self.monitor.set_visible(False)
+        if self._anim_timer:
+            GLib.source_remove(self._anim_timer)
+            self._anim_timer = None
+        if self._history_timer:
+            GLib.source_remove(self._history_timer)
+            self._history_timer = None
+
+    def _subscribe(self):
+        """Refresh on the daemon's TelemetryUpdated signal; poll at 1 Hz
+        only when the daemon has no signals (older version)."""
+        if self._tel_sub:
+            try: self._tel_sub.disconnect()
+            except Exception: pass
+            self._tel_sub = None
+        if self.service:
+            try:
+                self._tel_sub = self.service.TelemetryUpdated.connect(self._on_telemetry)
+            except Exception:
+                pass
+        self.monitor.subscribed = self._tel_sub is not None
+        self._load_initial()
+        self._load_history()
+        if self._tel_sub and self._timer:
+            GLib.source_remove(self._timer)
+            self._timer = None
+        elif not self._tel_sub and not self._timer:
+            self._timer = GLib.timeout_add(1000, self._refresh)
+
+    def _load_initial(self):
+        """Seed the page (snapshot, fan curve, power limits) off the main loop."""
+        threading.Thread(target=self._fetch_initial, args=(self.service,), daemon=True).start()
+
+    def _fetch_initial(self, service):
+        tel, pts = None, []
+        if service:
+            try:
+                tel = json.loads(service.GetTelemetry())
+            except Exception:
+                pass
+            try:
+                # The curve lives in the daemon (it runs the control loop)
+                pts = [tuple(p) for p in json.loads(service.GetFanCurve()).get("points", [])]
+            except Exception:
+                pass
+        cpu_w, gpu_w = self._get_hw_power_limits(tel)
+        GLib.idle_add(self._on_initial, tel, pts, cpu_w, gpu_w)
+
+    def _on_initial(self, tel, pts, cpu_w, gpu_w):
+        # A TelemetryUpdated signal may have delivered a newer snapshot meanwhile
+        if tel and tel.get("timestamp", 0.0) >= self.monitor.get_data()["timestamp"]:
+            self.monitor.set_telemetry(tel)
+            self._refresh()
+        if len(pts) >= 2:
+            self.custom_points = pts
+            if self.fan_mode == "custom":
+                self.fan_curve.set_points(pts)
+        if cpu_w or gpu_w:
+            self.profile_buttons["performance"].set_tooltip_text(
+                f"{T('performance_tooltip')} (CPU: ~{cpu_w}W, GPU: ~{gpu_w}W limitine kadar)")
+        return False
+
+    def _set_history_span(self, span):
+        self._history_span = span
+        self._load_history()
+
+    def _history_tick(self):
+        self._load_history()
+        return True
+
+    def _load_history(self):
+        if not self.service or self._history_busy:
+            return
+        self._history_busy = True
+        threading.Thread(target=self._fetch_history, args=(self.service, self._history_span),
+                         daemon=True).start()
+
+    def _fetch_history(self, service, span):
+        series, sparks = [], []
+        try:
+            for label, metric, rgb in HISTORY_SERIES:
+                hist = json.loads(service.GetHistory(metric, -span, 0))
+                series.append((label, rgb, hist.get("t", []), hist.get("v", [])))
+        except Exception:
+            series = []
+        try:
+            # RPM sparklines: refilled from the 1 s tier, covering time spent hidden
+            metrics = json.loads(service.GetHistory("", 0, 0)).get("metrics", [])
+            fans = sorted((m for m in metrics if m.startswith("fan.fans.") and m.endswith(".current")),
+                          key=lambda m: int(m.split(".")[2]))
+            for metric in fans[:2]:
+                hist = json.loads(service.GetHistory(metric, -SPARK_SECONDS, 0))
+                sparks.append((hist.get("t", []), [int(v) for v in hist.get("v", [])]))
+        except Exception:
+            pass  # older daemon without GetHistory
+        GLib.idle_add(self._on_history, series, span, sparks)
+
+    def _on_history(self, series, span, sparks):
+        self._history_busy = False
+        if span == self._history_span:
+            self.history_chart.set_series(series, span, "°")
+        for spark, (ts, vs) in zip((self.fan1_spark, self.fan2_spark), sparks):
+            spark.set_values(ts, vs)
+        return False
+
+    def _on_telemetry(self, j):
+        try:
+            self.monitor.set_telemetry(json.loads(j))
+        except Exception:
+            return
+        self._refresh()
+
+    def _on_local_update(self):
+        self._refresh()
+        return False
 
     def _anim_tick(self):
         self.fan1_gauge.tick_rotation()
@@ -331,12 +625,16 @@ class FanPage(Gtk.Box):
 
     def set_service(self, service):
         self.service = service
+        self._subscribe()
 
     def set_temp_unit(self, unit):
         self.temp_unit = unit
 
     def _format_temp(self, celsius):
         """Format temperature value for display in the user's preferred unit."""
+        if isinstance(celsius, str):
+            # Daemon markers: "SUSPENDED" (dGPU runtime-suspended), "NOT_REACHABLE"
+            return T("gpu_suspended") if celsius == "SUSPENDED" else "--"
         if self.temp_unit == "F":
             return f"{int(celsius * 9 / 5 + 32)}°F"
         return f"{int(celsius)}°C"
@@ -346,17 +644,17 @@ class FanPage(Gtk.Box):
         self.fan2_gauge.set_dark(is_dark)
         self.fan1_spark.set_dark(is_dark)
         self.fan2_spark.set_dark(is_dark)
+        self.history_chart.set_dark(is_dark)
 
-    def _get_hw_power_limits(self):
+    def _get_hw_power_limits(self, tel):
         gpu_w, cpu_w = 0, 0
-        try:
-            out = subprocess.check_output(["nvidia-smi", "-q", "-d", "POWER"], timeout=2, text=True)
-            import re
-            m = re.search(r"Max Power Limit\s*:\s*([\d\.]+)\s*W", out)
-            if m:
-                gpu_w = int(float(m.group(1)))
-        except Exception:
-            pass
+        if tel:
+            try:
+                dgpu = tel.get("dgpu", {})
+                # Daemon's NVML sample; absent while the dGPU sleeps, never wakes it
+                gpu_w = int(dgpu.get("power_limit_w", 0))
+            except Exception:
+                pass
             
         try:
             rapl = "/sys/class/powercap/intel-rapl/intel-rapl:0/constraint_1_power_limit_uw" # PL2 is usually Max
@@ -500,13 +798,11 @@ class FanPage(Gtk.Box):
         self.profile_box = Gtk.Box(spacing=15, halign=Gtk.Align.CENTER, homogeneous=True)
         self.profile_group = None
         
-        cpu_w, gpu_w = self._get_hw_power_limits()
-        hw_limits_str = f" (CPU: ~{cpu_w}W, GPU: ~{gpu_w}W limitine kadar)" if (cpu_w or gpu_w) else ""
-
+        # Hardware limits are appended to the performance tooltip by _on_initial
         profiles = [
             ("power-saver", "🔋", T("saver"), T("saver_tooltip")),
             ("balanced", "⚖️", T("balanced"), T("balanced_tooltip")),
-            ("performance", "🚀", T("performance"), f"{T('performance_tooltip')}{hw_limits_str}"),
+            ("performance", "🚀", T("performance"), T("performance_tooltip")),
         ]
         self.profile_buttons = {}
         for pid, emoji, label, desc in profiles:
@@ -573,7 +869,30 @@ class FanPage(Gtk.Box):
         perf_card.append(self.fan_mode_status)
         content.append(perf_card)
 
-        # ═══ 3. FAN CURVE ═══
+        # ═══ 3. HISTORY ═══
+        hist_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        hist_card.add_css_class("card")
+        hist_header = Gtk.Box(spacing=10)
+        hist_header.append(Gtk.Image.new_from_icon_name("document-open-recent-symbolic"))
+        hist_header.append(Gtk.Label(label=T("history"), css_classes=["section-title"], hexpand=True, xalign=0))
+        range_box = Gtk.Box(spacing=0, css_classes=["linked"])
+        group = None
+        for span, key in HISTORY_RANGES:
+            btn = Gtk.ToggleButton(label=T(key))
+            if group:
+                btn.set_group(group)
+            else:
+                group = btn
+                btn.set_active(True)
+            btn.connect("toggled", lambda w, sp=span: self._set_history_span(sp) if w.get_active() else None)
+            range_box.append(btn)
+        hist_header.append(range_box)
+        hist_card.append(hist_header)
+        self.history_chart = HistoryChart()
+        hist_card.append(self.history_chart)
+        content.append(hist_card)
+
+        # ═══ 4. FAN CURVE ═══
         self.curve_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
         self.curve_card.add_css_class("card")
         self.curve_card.set_visible(False)
@@ -612,6 +931,7 @@ class FanPage(Gtk.Box):
 
     def _toggle_sensors(self, btn):
         self._sensors_expanded = not self._sensors_expanded
+        self.monitor.set_sensors_enabled(self._sensors_expanded)
         self.sensor_box.set_visible(self._sensors_expanded)
         self._expander_arrow.set_from_icon_name(
             "pan-up-symbolic" if self._sensors_expanded else "pan-down-symbolic")
@@ -728,9 +1048,6 @@ class FanPage(Gtk.Box):
         if mode == "custom":
             self.fan_curve.set_points(self.custom_points)
 
-        # Clear applied RPM cache when switching modes
-        self.last_applied_rpm = {}
-
         if self._block_sync:
             return # if programmatic UI update, do nothing
         self._block_sync = True
@@ -744,55 +1061,23 @@ class FanPage(Gtk.Box):
             except Exception as e:
                 self.fan_mode_status.set_label(f"{T('error')}: {e}")
 
-        # Only apply fan curve in custom mode (standard delegates to EC)
-        if mode == "custom":
-            self._apply_fan_curve()
-
     def _on_curve_changed(self, points):
         if self.fan_mode == "custom":
             self.custom_points = points
             if self._curve_timer:
                 GLib.source_remove(self._curve_timer)
-            self._curve_timer = GLib.timeout_add(200, self._apply_fan_curve_debounced)
+            self._curve_timer = GLib.timeout_add(200, self._send_fan_curve_debounced)
 
-    def _apply_fan_curve_debounced(self):
-        self._apply_fan_curve()
+    def _send_fan_curve_debounced(self):
+        """Hand the edited curve to the daemon, which runs the control loop
+        (so the curve keeps working with the GUI closed)."""
         self._curve_timer = None
-        return False
-
-    def _apply_fan_curve(self):
-        """Apply fan curve — only used in 'custom' mode."""
-        if self.fan_mode != "custom":
-            return
-
-        if not self.temp_history:
-            return
-
-        avg_temp = sum(self.temp_history) / len(self.temp_history)
-        fan_pct = self.fan_curve.get_fan_pct_for_temp(avg_temp)
-
         if self.service:
             try:
-                data = self.monitor.get_data()
-                info = data.get("fan_info", {})
-                fans = info.get("fans", {})
-
-                for fn, fd in fans.items():
-                    max_rpm = fd.get("max", 5800)
-                    if max_rpm <= 0:
-                        max_rpm = 5800
-
-                    target_rpm = int(max_rpm * fan_pct / 100)
-
-                    # Hysteresis: skip if RPM change < 300
-                    last = self.last_applied_rpm.get(str(fn), -1)
-                    if last >= 0 and abs(target_rpm - last) < 300:
-                        continue
-
-                    self.service.SetFanTarget(int(str(fn)), target_rpm)
-                    self.last_applied_rpm[str(fn)] = target_rpm
+                self.service.SetFanCurve([(float(t), float(f)) for t, f in self.custom_points])
             except Exception as e:
-                print(f"Fan control error: {e}")
+                print(f"Fan curve error: {e}")
+        return False
 
     def _refresh(self):
         if not self.get_mapped():
@@ -804,11 +1089,6 @@ class FanPage(Gtk.Box):
         fan_info = data.get("fan_info", {})
         power_profile = data.get("power_profile", {})
         
-        # Update history
-        self.temp_history.append(cpu_t)
-        if len(self.temp_history) > 5: # Keep last 5 seconds
-            self.temp_history.pop(0)
-            
         # Draw current temp marker on curve
         self.fan_curve.set_current_temp(cpu_t)
         
@@ -817,9 +1097,6 @@ class FanPage(Gtk.Box):
         self.cpu_label.set_label(self._format_temp(cpu_t))
         self.gpu_label.set_label(self._format_temp(gpu_t))
 
-        if self.fan_mode == "custom":
-            self._apply_fan_curve()
-            
         # Sync Power Profile UI
         active_profile = power_profile.get("active", "")
         if active_profile and active_profile in self.profile_buttons and not self._block_sync:
@@ -867,6 +1144,7 @@ class FanPage(Gtk.Box):
             gauges = [self.fan1_gauge, self.fan2_gauge]
             rpmlbls = [self.fan1_rpm_lbl, self.fan2_rpm_lbl]
             sparks  = [self.fan1_spark, self.fan2_spark]
+            sampled = data.get("timestamp", 0.0)
 
             for i, fk in enumerate(fan_keys[:2]):
                 rpm = fans[fk].get("current", 0)
@@ -874,7 +1152,7 @@ class FanPage(Gtk.Box):
                 pct = min(rpm / max_rpm * 100, 100) if max_rpm > 0 else 0
                 gauges[i].set_val(pct, f"{rpm}")
                 rpmlbls[i].set_label(f"{rpm} RPM")
-                sparks[i].add_value(rpm)
+                sparks[i].add_sample(sampled, rpm)
         else:
             self.fan_warning.set_visible(True)
 
@@ -884,8 +1162,11 @@ class FanPage(Gtk.Box):
         return True
 
     def cleanup(self):
+        if self._tel_sub:
+            try: self._tel_sub.disconnect()
+            except Exception: pass
+            self._tel_sub = None
         if hasattr(self, '_timer') and self._timer:
             GLib.source_remove(self._timer)
-        if hasattr(self, '_anim_timer') and self._anim_timer:
-            GLib.source_remove(self._anim_timer)
+        self._on_unmap()
         self.monitor.stop()
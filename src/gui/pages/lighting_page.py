@@ -58,9 +58,12 @@ class LightingPage(Gtk.Box):
 
         self._speed_timer = None
         self._bri_timer = None
+        self._state_sub = None
+        self._applying = False  # suppress D-Bus echo while applying daemon state
 
         self._build_ui()
         self._sync_state()
+        self._subscribe()
         self.connect("map", self._on_map)
         self.connect("unmap", self._on_unmap)
 
@@ -77,6 +80,30 @@ class LightingPage(Gtk.Box):
     def set_service(self, service):
         self.service = service
         self._sync_state()
+        self._subscribe()
+
+    def _subscribe(self):
+        """Follow lighting changes made by other clients or hotkeys."""
+        if self._state_sub:
+            try: self._state_sub.disconnect()
+            except Exception: pass
+            self._state_sub = None
+        if not self.service:
+            return
+        try:
+            self._state_sub = self.service.StateChanged.connect(self._on_state_changed)
+        except Exception:
+            pass
+
+    def _on_state_changed(self, j):
+        # Our own debounced slider updates are still in flight — don't
+        # snap the slider back to an older value.
+        if self._speed_timer or self._bri_timer:
+            return
+        try:
+            self._apply_state(json.loads(j))
+        except Exception:
+            pass
 
     def _sync_state(self):
         if not self.service:
@@ -91,8 +118,10 @@ class LightingPage(Gtk.Box):
                 pass
         
         threading.Thread(target=_fetch, daemon=True).start()
+        self._load_profiles()
 
     def _apply_state(self, st):
+        self._applying = True
         try:
             self.power = st.get("power", True)
             self.mode = st.get("mode", "static")
@@ -124,6 +153,8 @@ class LightingPage(Gtk.Box):
             self.kb_preview.direction = self.direction
             self.kb_preview.queue_draw()
         except Exception: pass
+        finally:
+            self._applying = False
         return False
 
     def _build_ui(self):
@@ -251,11 +282,67 @@ class LightingPage(Gtk.Box):
         grid.attach(self.brightness_scale, 3, 1, 1, 1)
 
         card.append(grid)
+
+        card.append(Gtk.Separator())
+
+        # Saved lighting profiles (validated and precompiled by the daemon)
+        prof_row = Gtk.Box(spacing=10, halign=Gtk.Align.CENTER)
+        prof_row.append(Gtk.Label(label=T("lighting_profile"), css_classes=["section-title"]))
+        self._profile_names = []
+        self.profile_dd = Gtk.DropDown(model=Gtk.StringList.new(["—"]))
+        self.profile_dd.connect("notify::selected", self._on_profile_selected)
+        prof_row.append(self.profile_dd)
+        self.profile_entry = Gtk.Entry(placeholder_text=T("profile_name"), max_length=32)
+        prof_row.append(self.profile_entry)
+        save_btn = Gtk.Button(label=T("save_profile"))
+        save_btn.connect("clicked", self._on_save_profile)
+        prof_row.append(save_btn)
+        card.append(prof_row)
+
         content.append(card)
 
         scroll.set_child(content)
         self.append(scroll)
 
+    def _load_profiles(self):
+        if not self.service:
+            return
+
+        def _fetch():
+            try:
+                names = [p["name"] for p in json.loads(self.service.ListProfiles())]
+                GLib.idle_add(self._set_profiles, names)
+            except Exception:
+                pass
+
+        threading.Thread(target=_fetch, daemon=True).start()
+
+    def _set_profiles(self, names):
+        self._applying = True
+        self._profile_names = names
+        self.profile_dd.set_model(Gtk.StringList.new(["—"] + names))
+        self.profile_dd.set_selected(0)
+        self._applying = False
+        return False
+
+    def _on_profile_selected(self, dd, _):
+        idx = dd.get_selected()
+        if self._applying or not self.service or idx == 0 or idx > len(self._profile_names):
+            return
+        try: self.service.ActivateProfile(self._profile_names[idx - 1])
+        except Exception: pass
+
+    def _on_save_profile(self, btn):
+        name = self.profile_entry.get_text().strip()
+        if not name or not self.service:
+            return
+        try:
+            # Empty options: the daemon stores its current lighting state
+            if self.service.SaveProfile(name, {}) == "OK":
+                self.profile_entry.set_text("")
+                self._load_profiles()
+        except Exception: pass
+
     def _on_zone_select(self, zone):
         self.selected_zone = zone
 
@@ -263,7 +350,7 @@ class LightingPage(Gtk.Box):
         self.power = state
         self.kb_preview.power = state
         self.kb_preview.queue_draw()
-        if self.service:
+        if self.service and not self._applying:
             try:
                 self.service.SetGlobal(state, int(self.brightness_scale.get_value()), self.direction)
             except Exception: pass
@@ -273,31 +360,43 @@ class LightingPage(Gtk.Box):
         c.parse(hex_color)
 
         # Auto-switch to static
-        if self.mode != "static":
+        switch_mode = self.mode != "static"
+        if switch_mode:
+            self._applying = True  # mode goes out with the color below
             self.mode = "static"
             self.mode_dd.set_selected(0)
             self.kb_preview.mode = "static"
-            if self.service:
-                try: self.service.SetMode("static", self.speed)
-                except Exception: pass
+            self._applying = False
 
         if self.num_zones == 1 or self.selected_zone == 4:
+            zone = 8
             for i in range(8):
                 self.zone_rgba[i] = c
                 if i < 4:
                     self.kb_preview.set_zone_color(i, c.red, c.green, c.blue)
-            if self.service:
-                try:
-                    self.service.SetColor(8, hex_color)
-                except Exception: pass
         else:
-            self.zone_rgba[self.selected_zone] = c
-            self.kb_preview.set_zone_color(self.selected_zone, c.red, c.green, c.blue)
-            if self.service:
-                try: self.service.SetColor(self.selected_zone, hex_color)
-                except Exception: pass
+            zone = self.selected_zone
+            self.zone_rgba[zone] = c
+            self.kb_preview.set_zone_color(zone, c.red, c.green, c.blue)
         self.kb_preview.queue_draw()
 
+        if self.service:
+            # One round trip: mode, power and color applied atomically
+            try:
+                self.service.SetLighting({
+                    "mode":  GLib.Variant("s", "static"),
+                    "power": GLib.Variant("b", True),
+                    "zone":  GLib.Variant("i", zone),
+                    "color": GLib.Variant("s", hex_color),
+                })
+            except Exception:
+                # Older daemon without SetLighting
+                try:
+                    if switch_mode:
+                        self.service.SetMode("static", self.speed)
+                    self.service.SetColor(zone, hex_color)
+                except Exception: pass
+
     def _open_picker(self, btn):
         dialog = Gtk.ColorDialog()
         dialog.choose_rgba(self.get_root(), None, None, self._on_color_picked)
@@ -319,20 +418,22 @@ class LightingPage(Gtk.Box):
         self.mode = modes[dd.get_selected()]
         self.kb_preview.mode = self.mode
         self.kb_preview.queue_draw()
-        if self.service:
+        if self.service and not self._applying:
             try: self.service.SetMode(self.mode, int(self.speed_scale.get_value()))
             except Exception: pass
 
     def _on_direction(self, dd, _):
         self.direction = "ltr" if dd.get_selected() == 0 else "rtl"
         self.kb_preview.direction = self.direction
-        if self.service:
+        if self.service and not self._applying:
             try: self.service.SetGlobal(self.power, int(self.brightness_scale.get_value()), self.direction)
             except Exception: pass
 
     def _on_speed(self, scale):
         self.speed = int(scale.get_value())
         self.kb_preview.speed = self.speed
+        if self._applying:
+            return
         if self._speed_timer:
             GLib.source_remove(self._speed_timer)
         self._speed_timer = GLib.timeout_add(200, self._send_mode_update)
@@ -347,6 +448,8 @@ class LightingPage(Gtk.Box):
     def _on_brightness(self, scale):
         self.brightness = int(scale.get_value())
         self.kb_preview.brightness = self.brightness
+        if self._applying:
+            return
         if self._bri_timer:
             GLib.source_remove(self._bri_timer)
         self._bri_timer = GLib.timeout_add(200, self._send_global_update)
@@ -359,6 +462,10 @@ class LightingPage(Gtk.Box):
         return False
 
     def cleanup(self):
+        if self._state_sub:
+            try: self._state_sub.disconnect()
+            except Exception: pass
+            self._state_sub = None
         self.kb_preview.cleanup()
         if self._speed_timer:
             GLib.source_remove(self._speed_timer)
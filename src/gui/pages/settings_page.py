@@ -660,4 +660,47 @@ class SettingsPage(Gtk.Box):
         except:
             out.append("Could not access dmesg/journal (insufficient permissions).")
 
+        # 9. Telemetry log: last 30 minutes, per minute
+        out.append("\nTelemetry Log (last 30 min, per minute):")
+        try:
+            out.extend(self._telemetry_log_summary(30))
+        except Exception as e:
+            out.append(f"  Error: {e}")
+
         return "\n".join(out)
+
+    @staticmethod
+    def _telemetry_log_summary(minutes):
+        """Per-minute rows from the daemon's on-disk log (mmap'ed, no text parsing)."""
+        import time
+        import telemetry_log
+        segs = telemetry_log.segments()
+        if not segs:
+            return ["  No telemetry log found."]
+        total = sum(os.path.getsize(p) for p in segs)
+        lines = [f"  Segments: {len(segs)} ({total / 1048576:.1f} MiB), "
+                 f"{os.path.basename(segs[0])} .. {os.path.basename(segs[-1])}"]
+        cols = ("cpu_temp", "gpu_temp", "dgpu_temp", "fan1", "fan2", "cpu_usage", "dgpu_power", "psi_cpu")
+        now = time.time()
+        data = telemetry_log.read_range(now - minutes * 60, now, columns=cols)
+        if not data["t"]:
+            return lines + ["  No records in range (flushed every 30 s)."]
+        lines.append("  time   cpu°max gpu°max dgpu°max  fan1  fan2  cpu%  dgpuW  psi")
+        start = 0
+        ts = data["t"]
+        while start < len(ts):
+            minute = int(ts[start] // 60)
+            end = start
+            while end < len(ts) and int(ts[end] // 60) == minute:
+                end += 1
+            row = {c: telemetry_log.summarize(data[c][start:end]) for c in cols}
+
+            def fmt(c, i, width):
+                v = row[c]
+                return f"{v[i]:{width}.0f}" if v else " " * (width - 1) + "-"
+            lines.append(f"  {time.strftime('%H:%M', time.localtime(minute * 60))}  "
+                         f"{fmt('cpu_temp', 2, 7)} {fmt('gpu_temp', 2, 7)} {fmt('dgpu_temp', 2, 8)} "
+                         f"{fmt('fan1', 1, 5)} {fmt('fan2', 1, 5)} {fmt('cpu_usage', 1, 5)} "
+                         f"{fmt('dgpu_power', 1, 6)} {fmt('psi_cpu', 1, 4)}")
+            start = end
+        return lines
@@ -14,6 +14,9 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+
+from fancurve import FanCurveLUT
 
 def T(k):
     from i18n import T as _T
@@ -52,6 +55,7 @@ class FanCurveWidget(Gtk.DrawingArea):
         self.set_content_height(260)
 
         self.points = [list(p) for p in DEFAULT_POINTS]
+        self.lut = FanCurveLUT(self.points)
         self.dragging = -1  # index of point being dragged
         self.hover = -1
         self.current_temp = 0.0  # live CPU temp marker
@@ -83,26 +87,15 @@ class FanCurveWidget(Gtk.DrawingArea):
 
     def set_points(self, pts):
         self.points = [list(p) for p in pts]
+        self.lut.rebuild(self.points)
         self.queue_draw()
 
     def get_points(self):
         return [tuple(p) for p in self.points]
 
     def get_fan_pct_for_temp(self, temp):
-        """Interpolate fan % for a given temperature."""
-        if not self.points:
-            return 0
-        if temp <= self.points[0][0]:
-            return self.points[0][1]
-        if temp >= self.points[-1][0]:
-            return self.points[-1][1]
-        for i in range(len(self.points) - 1):
-            t0, f0 = self.points[i]
-            t1, f1 = self.points[i + 1]
-            if t0 <= temp <= t1:
-                ratio = (temp - t0) / (t1 - t0) if t1 != t0 else 0
-                return f0 + (f1 - f0) * ratio
-        return 0
+        """Fan % for a given temperature (0.1 °C lookup table)."""
+        return self.lut.lookup(temp)
 
     def set_current_temp(self, temp):
         self.current_temp = temp
@@ -299,6 +292,7 @@ class FanCurveWidget(Gtk.DrawingArea):
             new_temp = min(new_temp, self.points[self.dragging + 1][0] - 1)
 
         self.points[self.dragging] = [new_temp, new_fan]
+        self.lut.rebuild(self.points)
         self.queue_draw()
 
     def _on_drag_end(self, gesture, offset_x, offset_y):
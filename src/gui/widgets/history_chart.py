@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+History Chart Widget - time-series lines from the daemon's GetHistory.
+X axis: time (the selected range, now at the right edge)
+Y axis: shared value scale of all series (e.g. °C)
+"""
+import time
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk
+
+PAD_L, PAD_R, PAD_T, PAD_B = 34, 10, 10, 18
+
+
+class HistoryChart(Gtk.DrawingArea):
+    """Draws series = [(label, (r, g, b), t_list, v_list), ...] over span seconds."""
+
+    def __init__(self, height=160):
+        super().__init__()
+        self.set_content_height(height)
+        self.set_hexpand(True)
+        self.series = []
+        self.span = 600
+        self.unit = ""
+        self._dark = True
+        self.set_draw_func(self._draw)
+
+    def set_dark(self, is_dark):
+        self._dark = is_dark
+        self.queue_draw()
+
+    def set_series(self, series, span, unit=""):
+        self.series = series
+        self.span = span
+        self.unit = unit
+        self.queue_draw()
+
+    def _draw(self, _area, cr, w, h):
+        fg = 0.85 if self._dark else 0.2
+        pw, ph = w - PAD_L - PAD_R, h - PAD_T - PAD_B
+        values = [v for _, _, _, vs in self.series for v in vs]
+        if pw <= 0 or ph <= 0:
+            return
+        lo, hi = (min(values), max(values)) if values else (0.0, 100.0)
+        lo, hi = (lo // 10) * 10, (hi // 10 + 1) * 10
+        now = time.time()
+        t0 = now - self.span
+
+        # grid + y labels
+        cr.set_line_width(1)
+        cr.set_font_size(9)
+        for i in range(5):
+            val = lo + (hi - lo) * i / 4
+            y = PAD_T + ph - ph * i / 4
+            cr.set_source_rgba(fg, fg, fg, 0.12)
+            cr.move_to(PAD_L, y)
+            cr.line_to(PAD_L + pw, y)
+            cr.stroke()
+            cr.set_source_rgba(fg, fg, fg, 0.6)
+            cr.move_to(2, y + 3)
+            cr.show_text(f"{val:.0f}{self.unit}")
+
+        # legend
+        x = PAD_L
+        for label, rgb, _, _ in self.series:
+            cr.set_source_rgb(*rgb)
+            cr.rectangle(x, h - 10, 8, 8)
+            cr.fill()
+            cr.set_source_rgba(fg, fg, fg, 0.8)
+            cr.move_to(x + 12, h - 2)
+            cr.show_text(label)
+            x += 20 + cr.text_extents(label).x_advance
+
+        # lines; a gap longer than 3 points' spacing breaks the line
+        cr.set_line_width(1.5)
+        for _, rgb, ts, vs in self.series:
+            if not ts:
+                continue
+            gap = 3 * max((ts[-1] - ts[0]) / max(len(ts) - 1, 1), 1.0)
+            cr.set_source_rgb(*rgb)
+            prev = None
+            for t, v in zip(ts, vs):
+                if t < t0:
+                    continue
+                px = PAD_L + pw * (t - t0) / self.span
+                py = PAD_T + ph - ph * (v - lo) / (hi - lo)
+                if prev is None or t - prev > gap:
+                    cr.move_to(px, py)
+                else:
+                    cr.line_to(px, py)
+                prev = t
+            cr.stroke()
@@ -0,0 +1,164 @@
+"""
+dGPU runtime-PM gate: while the dGPU's power/runtime_status is "suspended"
+neither GpuTelemetry.sample() nor HPManagerService._get_cached_gpu_temp()
+may call NVML or read the dGPU's hwmon, and both query again once the
+status is "active" and the tracker's STATE_TTL has passed.
+
+Runs against a fake sysfs tree with a counting NVML stub; needs PyGObject
+and pydbus (imported by the daemon module), no root and no GPU.
+"""
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("gi")
+pytest.importorskip("pydbus")
+
+DAEMON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "daemon")
+DGPU = "devices/pci0000:00/0000:00:01.0/0000:01:00.0"
+IGPU = "devices/pci0000:00/0000:00:02.0"
+
+
+def _write(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"{value}\n")
+
+
+def make_fake_sysfs(root):
+    """coretemp CPU sensor, an Intel boot VGA and an NVIDIA dGPU with runtime PM and its own hwmon."""
+    bus = os.path.join(root, "bus/pci/devices")
+    hwmon_cls = os.path.join(root, "class/hwmon")
+    os.makedirs(bus)
+    os.makedirs(hwmon_cls)
+    for rel, cls, vendor, boot_vga in ((IGPU, "0x030000", "0x8086", 1), (DGPU, "0x030200", "0x10de", 0)):
+        dev = os.path.join(root, rel)
+        _write(os.path.join(dev, "class"), cls)
+        _write(os.path.join(dev, "vendor"), vendor)
+        _write(os.path.join(dev, "boot_vga"), boot_vga)
+        os.symlink(os.path.relpath(dev, bus), os.path.join(bus, os.path.basename(rel)))
+    _write(os.path.join(root, DGPU, "power/runtime_status"), "suspended")
+
+    hwmons = {"hwmon0": ("devices/platform/coretemp.0/hwmon/hwmon0", "coretemp", 52000),
+              "hwmon1": (f"{DGPU}/hwmon/hwmon1", "nouveau", 61000)}
+    for name, (rel, driver, temp) in hwmons.items():
+        path = os.path.join(root, rel)
+        _write(os.path.join(path, "name"), driver)
+        _write(os.path.join(path, "temp1_input"), temp)
+        os.symlink(os.path.relpath(path, hwmon_cls), os.path.join(hwmon_cls, name))
+
+
+class StubNVML:
+    """Stands in for gpu_telemetry.NVML and counts every call that would reach the driver."""
+
+    def __init__(self):
+        self.initialized = False
+        self.calls = {"open": 0, "close": 0, "sample": 0, "power_limit_w": 0}
+
+    def open(self):
+        self.calls["open"] += 1
+        self.initialized = True
+
+    def close(self):
+        self.calls["close"] += 1
+        self.initialized = False
+
+    def sample(self):
+        self.calls["sample"] += 1
+        return {"temp": 58.0, "util": 40, "mem_util": 10, "clock_mhz": 1500, "mem_clock_mhz": 7000}
+
+    def power_limit_w(self):
+        self.calls["power_limit_w"] += 1
+        return 80
+
+    def queries(self):
+        return self.calls["open"] + self.calls["sample"] + self.calls["power_limit_w"]
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    root = str(tmp_path / "sys")
+    make_fake_sysfs(root)
+    monkeypatch.setenv("HP_MANAGER_SYSFS_ROOT", root)
+    monkeypatch.syspath_prepend(DAEMON_DIR)
+    d = importlib.import_module("hp_manager_service")
+    monkeypatch.setattr(d, "SYSFS_ROOT", root)
+
+    # Every dGPU attribute read except the runtime_status poll itself
+    dgpu_dir = os.path.realpath(os.path.join(root, DGPU))
+    reads = []
+    read = d.sysfs.read
+
+    def counting_read(path, *args, **kwargs):
+        real = os.path.realpath(path)
+        if real.startswith(dgpu_dir + "/") and not real.endswith("/power/runtime_status"):
+            reads.append(real)
+        return read(path, *args, **kwargs)
+    monkeypatch.setattr(d.sysfs, "read", counting_read)
+
+    svc = d.HPManagerService()
+    nvml = StubNVML()
+    svc.gpu_telemetry.nvml = nvml
+    yield svc, nvml, reads, os.path.join(root, DGPU, "power/runtime_status")
+    sys.modules.pop("hp_manager_service", None)
+
+
+def _settle(svc):
+    time.sleep(svc.dgpu.STATE_TTL + 0.05)
+
+
+def test_resolves_dgpu_and_its_hwmon(daemon):
+    svc, _, _, _ = daemon
+    assert svc.dgpu.is_nvidia()
+    assert svc.dgpu.pci_path.endswith("0000:01:00.0")
+    assert svc.dgpu.owns(svc._gpu_temp_path)
+
+
+def test_no_query_while_suspended(daemon):
+    svc, nvml, reads, _ = daemon
+    for _ in range(3):
+        out = svc.gpu_telemetry.sample()
+        temp = svc._get_cached_gpu_temp()
+        _settle(svc)
+    assert nvml.queries() == 0
+    assert reads == []
+    assert out == {"present": True, "state": "suspended"}
+    assert temp == "SUSPENDED"
+    assert svc.dgpu.get_stats()["blocked"] == {"nvml": 3, "hwmon": 3}
+
+
+def test_queries_resume_after_wakeup(daemon):
+    svc, nvml, reads, status = daemon
+    svc.gpu_telemetry.sample()
+    svc._get_cached_gpu_temp()
+
+    _write(status, "active")
+    _settle(svc)
+    out = svc.gpu_telemetry.sample()
+    assert nvml.calls["open"] == 1 and nvml.calls["sample"] == 1
+    assert out["temp"] == 58.0 and out["power_limit_w"] == 80
+    assert svc._get_cached_gpu_temp() == 61.0
+    assert len(reads) == 1
+
+
+def test_session_closed_when_suspended_again(daemon):
+    svc, nvml, reads, status = daemon
+    _write(status, "active")
+    _settle(svc)
+    svc.gpu_telemetry.sample()
+    svc._get_cached_gpu_temp()
+
+    _write(status, "suspended")
+    _settle(svc)
+    before, seen = nvml.queries(), len(reads)
+    for _ in range(3):
+        svc.gpu_telemetry.sample()
+        temp = svc._get_cached_gpu_temp()
+        _settle(svc)
+    assert nvml.calls["close"] == 1 and not nvml.initialized
+    assert nvml.queries() == before
+    assert len(reads) == seen
+    assert temp == "SUSPENDED"